@@ -0,0 +1,30 @@
+import os
+
+from portfolio import fetch, vintages
+
+# 1. Directory Setup
+base_dir = os.environ.get('DP_BASE_DIR', '/Users/pustak/Desktop/Dynamic Portfolio')
+raw_dir = os.path.join(base_dir, 'raw_data')
+
+os.makedirs(raw_dir, exist_ok=True)
+
+# 2. Refresh All Raw Series (WRDS + FRED)
+# Only observations after the last stored date are requested, and all series
+# are fetched concurrently. Set DATA_PROVIDER=local to run offline from a
+# folder laid out like raw_data/ (DATA_SOURCE_DIR).
+print("Refreshing raw series...")
+data = fetch.refresh(list(fetch.SERIES), raw_dir)
+
+# 3. Macro Release History (ALFRED)
+# Every print and revision of CPI / INDPRO, for the point-in-time regimes of 03
+print("\nRefreshing macro release history...")
+try:
+    vintages.refresh([sid for sid, spec in fetch.SERIES.items() if 'vintages' in spec], raw_dir)
+except FileNotFoundError as e:
+    print(f"  skipped ({e}); 03 falls back to a {vintages.RELEASE_LAG_DAYS}-day publication lag")
+
+# 4. Inspection
+print("\n--- Last Observation per Series ---")
+for series_id, series in data.items():
+    last = series.dropna()
+    print(f"{series_id:<9} {last.index[-1].date()}  {last.iloc[-1]:.4f}")
@@ -1,14 +1,10 @@
 import pandas as pd
-import numpy as np
-import wrds
-from fredapi import Fred
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.ticker import ScalarFormatter, NullLocator
 import os
 
+from portfolio import bonds, fetch, figures, render, store, universe
+
 # 1. Directory Setup
-base_dir = '/Users/pustak/Desktop/Dynamic Portfolio'
+base_dir = os.environ.get('DP_BASE_DIR', '/Users/pustak/Desktop/Dynamic Portfolio')
 raw_dir = os.path.join(base_dir, 'raw_data')
 mod_dir = os.path.join(base_dir, 'modified_data')
 fig_dir = os.path.join(base_dir, 'figures')
@@ -18,85 +14,62 @@ for path in [raw_dir, mod_dir, fig_dir]:
 
 print(f"Directories checked/created at: {base_dir}")
 
-# 2. Config & Connections
-FRED_API_KEY = '23dd8644a8456a82f3dc0e07c51e2a9b'
-START_DATE = '1970-01-01'
-
-db = wrds.Connection()
-fred = Fred(api_key=FRED_API_KEY)
+# 2. Load Raw Series (WRDS / FRED)
+# Served from the raw_data/ store kept current by 00_fetch_data.py. Stocks and
+# the 10-year yield are required; the other maturities (optional series) only
+# feed the maturity curve and are left out when there is no copy of them.
+print("\nLoading Stocks (CRSP) and Bonds (FRED)...")
+raw = fetch.load(['sprtrn'] + list(bonds.SERIES.values()), raw_dir)
+maturities = [m for m, sid in bonds.SERIES.items() if sid in raw]
+if len(maturities) < len(bonds.SERIES):
+    print(f"Maturity curve without {', '.join(m for m in bonds.SERIES if m not in maturities)} (no stored yields)")
 
-# 3. Stocks (CRSP)
-print("\nDownloading Stocks (CRSP)...")
-stock_query = f"SELECT date, sprtrn FROM crsp.dsi WHERE date >= '{START_DATE}'"
-stocks = db.raw_sql(stock_query)
-stocks['date'] = pd.to_datetime(stocks['date'])
-stocks.set_index('date', inplace=True)
-stocks.columns = ['Stock_Returns']
-stocks.index.name = 'date'
-
-stocks.to_csv(os.path.join(raw_dir, 'crsp_stocks_raw.csv'))
-print("Raw Stock Data saved.")
+# 3. Stocks (CRSP) and the 10-Year Yield, as the US universe's roles
+data = {role: raw[universe.US['series'][role]] for role in ['stocks', 'yields']}
 
 # 4. Bonds (FRED)
-print("\nDownloading Bonds (FRED)...")
-yield_series = fred.get_series('DGS10', observation_start=START_DATE)
-
-# Convert Series to DataFrame for clean CSV saving
-yield_df = yield_series.to_frame(name='DGS10')
-yield_df.index.name = 'date'
-yield_df.to_csv(os.path.join(raw_dir, 'fred_bonds_raw.csv'))
-print("Raw Bond Data saved.")
-
-# Duration Math
-duration = 7.0
-daily_yield_decimal = yield_series / 100
-daily_income = daily_yield_decimal / 252
-yield_change = daily_yield_decimal.diff()
-
-bond_returns = daily_income - (duration * yield_change)
-bond_returns.name = 'Bond_Returns'
+# Constant-maturity par bonds repriced every day at every maturity, on the
+# 10-year series' dates (shorter / longer histories are missing before they start)
+yields = pd.DataFrame({m: raw[bonds.SERIES[m]] for m in maturities}).reindex(raw['DGS10'].index)
+curve = bonds.par_returns(yields)
+
+bond_returns = curve[bonds.BENCHMARK].rename('Bond_Returns')
+
+# Full repricing vs the old constant 7.0 duration, per decade (annualised)
+linear = bonds.linear_returns(yields[bonds.BENCHMARK])
+decade = (yields.index.year // 10) * 10
+compare = pd.DataFrame({'Full Pricing': bond_returns, 'Linear (D=7)': linear}).groupby(decade).mean() * 252
+print("\n--- 10Y Bond Return by Decade ---")
+print(compare.map('{:.2%}'.format))
+
+# Returns plus the duration / convexity each bond was bought at (they move with the yield level)
+duration, convexity = bonds.sensitivities(yields.to_numpy() / 100, [bonds.MATURITIES[m] for m in maturities])
+by_maturity = pd.concat([pd.DataFrame(values, index=yields.index, columns=maturities).add_prefix('Bond_').add_suffix(f'_{kind}')
+                         for kind, values in [('Returns', curve), ('Duration', duration), ('Convexity', convexity)]], axis=1)
+store.save(by_maturity, mod_dir, 'bond_returns_by_maturity')
 
 # 5. Merge & Calculate Benchmark
+# Stocks + 10Y par bond, the 60/40 and every equity curve (portfolio/universe.py, shared with 20)
 print("\nMerging and Calculating...")
-df = pd.merge(stocks, bond_returns, left_index=True, right_index=True, how='inner')
-
-# Calculate Portfolio Returns
-df['60_40_Returns'] = (0.60 * df['Stock_Returns']) + (0.40 * df['Bond_Returns'])
-
-# Calculate Equity Curves (Growth of $1) for ALL components
-df['Stock_Equity'] = (1 + df['Stock_Returns']).cumprod()
-df['Bond_Equity']  = (1 + df['Bond_Returns']).cumprod()
-df['60_40_Equity'] = (1 + df['60_40_Returns']).cumprod()
-
-df.index.name = 'date'
+df = universe.benchmark(data)
 
 print(df.head(10))
 
-df.to_csv(os.path.join(mod_dir, 'benchmark_portfolio_1970_2025.csv'))
+store.save(df, mod_dir, 'benchmark_portfolio_1970_2025')
 print("Modified Benchmark Data saved.")
 
 # 6. Plotting
-fig, ax = plt.subplots(figsize=(15, 8))
-
-ax.plot(df.index, df['60_40_Equity'], label='60/40 Portfolio', linewidth=1.5, color='#1f77b4')
-ax.set_yscale('log')
-
-y_ticks = [1, 2, 5, 10, 20, 50, 100]
-ax.set_yticks(y_ticks)
-ax.get_yaxis().set_major_formatter(ScalarFormatter())
-ax.yaxis.set_minor_locator(NullLocator())
-
-ax.set_ylabel('Portfolio Value (Growth of $1)', fontsize=12)
-ax.xaxis.set_major_locator(mdates.YearLocator(2))
-ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-plt.xticks(rotation=45)
-
-ax.grid(True, which="major", ls="-", alpha=0.5)
-ax.set_title('60/40 Portfolio Performance (1970-Present)', fontsize=14)
-ax.legend(loc='upper left')
-
-plt.tight_layout()
-plt.savefig(os.path.join(fig_dir, 'benchmark_performance.png'), dpi=300, bbox_inches='tight')
-print("Figure saved.")
-
-plt.show()
\ No newline at end of file
+fig_path = os.path.join(fig_dir, 'benchmark_performance.png')
+for path in render.run([
+    render.job(figures.equity_figure, fig_path,
+               dates=df.index.values,
+               lines=[{'values': df['60_40_Equity'].to_numpy(), 'label': '60/40 Portfolio',
+                       'linewidth': 1.5, 'color': '#1f77b4'}],
+               y_ticks=[1, 2, 5, 10, 20, 50, 100],
+               year_step=2,
+               title='60/40 Portfolio Performance (1970-Present)',
+               title_kw={'fontsize': 14}, ylabel_kw={'fontsize': 12})
+]):
+    print(f"Figure saved to: {path}")
+
+render.show()
@@ -1,17 +1,15 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.ticker import ScalarFormatter, NullLocator
 import os
 
+from portfolio import downsample, figures, render, store
+
 # 1. Setup
-base_dir = '/Users/pustak/Desktop/Dynamic Portfolio'
-mod_path = os.path.join(base_dir, 'modified_data', 'benchmark_portfolio_1970_2025.csv')
+base_dir = os.environ.get('DP_BASE_DIR', '/Users/pustak/Desktop/Dynamic Portfolio')
+mod_dir = os.path.join(base_dir, 'modified_data')
 fig_path = os.path.join(base_dir, 'figures', 'asset_class_comparison.png')
 
 # 2. Load Data
 print("Loading processed benchmark data...")
-df = pd.read_csv(mod_path, index_col='date', parse_dates=True)
+df = store.load(mod_dir, 'benchmark_portfolio_1970_2025', ['Stock_Returns', 'Bond_Returns', '60_40_Returns'])
 
 # Calculate Component Equity Curves
 df['Stock_Equity'] = (1 + df['Stock_Returns']).cumprod()
@@ -19,37 +17,24 @@ df['Bond_Equity'] = (1 + df['Bond_Returns']).cumprod()
 df['60_40_Equity'] = (1 + df['60_40_Returns']).cumprod()
 
 # 3. Plotting
-fig, ax = plt.subplots(figsize=(15, 8))
-
-# Plot Lines
-ax.plot(df.index, df['Stock_Equity'], label='Stocks (S&P 500)', linewidth=1.2, color='#2ca02c', alpha=0.8)
-ax.plot(df.index, df['Bond_Equity'], label='Bonds (10Y Treasury)', linewidth=1.2, color='#d62728', alpha=0.8)
-ax.plot(df.index, df['60_40_Equity'], label='60/40 Portfolio', linewidth=2.0, color='#1f77b4')
-
-# Log Scale Formatting
-ax.set_yscale('log')
-
-# Manual Ticks (Extended range to cover Stocks high performance)
-y_ticks = [1, 2, 5, 10, 20, 50, 100, 200, 500] 
-ax.set_yticks(y_ticks)
-ax.get_yaxis().set_major_formatter(ScalarFormatter())
-ax.yaxis.set_minor_locator(NullLocator())
-
-# Labels & Ticks
-ax.set_ylabel('Portfolio Value (Growth of $1)', fontsize=12)
-ax.set_title('Asset Class Performance Comparison (1970-Present)', fontsize=14)
-
-ax.xaxis.set_major_locator(mdates.YearLocator(2))
-ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-plt.xticks(rotation=45)
-
-ax.grid(True, which="major", ls="-", alpha=0.5)
-ax.legend(loc='upper left', fontsize=11)
-
-plt.tight_layout()
-
-# Save & Show
-plt.savefig(fig_path, dpi=300, bbox_inches='tight')
-print(f"Figure saved to: {fig_path}")
-
-plt.show()
\ No newline at end of file
+# Optional min/max reduction to the figure's pixel width (--downsample)
+plot_df = downsample.frame(df[['Stock_Equity', 'Bond_Equity', '60_40_Equity']], 15)
+
+for path in render.run([
+    render.job(figures.equity_figure, fig_path,
+               dates=plot_df.index.values,
+               lines=[{'values': plot_df['Stock_Equity'].to_numpy(), 'label': 'Stocks (S&P 500)',
+                       'linewidth': 1.2, 'color': '#2ca02c', 'alpha': 0.8},
+                      {'values': plot_df['Bond_Equity'].to_numpy(), 'label': 'Bonds (10Y Treasury)',
+                       'linewidth': 1.2, 'color': '#d62728', 'alpha': 0.8},
+                      {'values': plot_df['60_40_Equity'].to_numpy(), 'label': '60/40 Portfolio',
+                       'linewidth': 2.0, 'color': '#1f77b4'}],
+               # Manual Ticks (Extended range to cover Stocks high performance)
+               y_ticks=[1, 2, 5, 10, 20, 50, 100, 200, 500],
+               year_step=2,
+               title='Asset Class Performance Comparison (1970-Present)',
+               title_kw={'fontsize': 14}, ylabel_kw={'fontsize': 12}, legend_kw={'fontsize': 11})
+]):
+    print(f"Figure saved to: {path}")
+
+render.show()
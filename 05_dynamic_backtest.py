@@ -1,12 +1,11 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.ticker import ScalarFormatter, NullLocator
 import os
 
+from portfolio import backtest, downsample, figures, render, store, universe
+
 # 1. Directory Setup
-base_dir = '/Users/pustak/Desktop/Dynamic Portfolio'
+base_dir = os.environ.get('DP_BASE_DIR', '/Users/pustak/Desktop/Dynamic Portfolio')
 mod_dir = os.path.join(base_dir, 'modified_data')
 fig_dir = os.path.join(base_dir, 'figures')
 
@@ -15,84 +14,91 @@ for path in [mod_dir, fig_dir]:
 
 # 2. Load Data
 print("Loading Processed Data...")
-bench = pd.read_csv(os.path.join(mod_dir, 'benchmark_portfolio_1970_2025.csv'), index_col='date', parse_dates=True)
-alts  = pd.read_csv(os.path.join(mod_dir, 'alternative_assets_1970_2025.csv'), index_col='date', parse_dates=True)
-macro = pd.read_csv(os.path.join(mod_dir, 'macro_regimes.csv'), index_col='date', parse_dates=True)
-
-# 3. Data Alignment & Processing
-# Calculate Commodity Returns from Price
-alts['Commodity_Returns'] = alts['Commodities_Price'].pct_change()
-
-# Merge into Master DF (Daily)
-df = pd.DataFrame(index=bench.index)
-df = df.join(bench[['Stock_Returns', 'Bond_Returns', '60_40_Returns']])
-df = df.join(alts[['Commodity_Returns']])
-
-# Align Regime Signal (Monthly -> Daily)
-regime_daily = macro[['Regime']].reindex(df.index, method='ffill')
-
-# Shift Signal by 1 Day (Avoid Lookahead Bias)
-df['Regime'] = regime_daily.shift(1)
-
-# 4. Strategy Implementation
-conditions = [
-    df['Regime'] == 'Goldilocks',
-    df['Regime'] == 'Reflation',
-    df['Regime'] == 'Stagflation',
-    df['Regime'] == 'Deflation'
-]
-
-choices = [
-    df['Stock_Returns'],      # Goldilocks
-    df['Commodity_Returns'],  # Reflation
-    df['Commodity_Returns'],  # Stagflation
-    df['Bond_Returns']        # Deflation
-]
-
-df['Dynamic_Returns'] = np.select(conditions, choices, default=0.0)
-
-# Calculate Equity Curves
-df['Dynamic_Equity'] = (1 + df['Dynamic_Returns']).cumprod()
-df['60_40_Equity']   = (1 + df['60_40_Returns']).cumprod()
+bench = store.load(mod_dir, 'benchmark_portfolio_1970_2025', ['Stock_Returns', 'Bond_Returns', '60_40_Returns'])
+alts  = store.load(mod_dir, 'alternative_assets_1970_2025', ['Commodities_Price', 'Oil_Price'])
+macro = store.load(mod_dir, 'macro_regimes', ['Regime'])
+
+# Signal timing: 'observation' applies a month's regime from the first of that
+# month (the published results); 'release' only once CPI / INDPRO were out (03's
+# point-in-time regimes)
+signal_timing = 'observation'
+released = store.load(mod_dir, 'macro_regimes_pit', ['Regime']) if signal_timing == 'release' else None
+
+# 3. Strategy Settings
+# Regime -> allocation over the sleeves: a sleeve name means 100% in it, a dict
+# blends them, e.g. 'Stagflation': {'Commodities': 0.7, 'Bonds': 0.3}
+allocation = backtest.MAPPING
+drift = False   # True: set weights on regime changes and let them drift until the next one
+
+# 4. Data Alignment & Strategy Implementation
+# Commodity/Oil returns from price, joined to the daily benchmark with the
+# monthly regime forward-filled and shifted by 1 day (avoid lookahead bias);
+# unknown regime -> cash. Shared with 20 (portfolio/universe.py).
+df = universe.strategy(bench, alts, macro, allocation, drift, released)
 
 # 5. Save Results
-output_columns = ['Regime', 'Dynamic_Returns', 'Dynamic_Equity', '60_40_Returns', '60_40_Equity']
-final_df = df[output_columns].dropna()
+final_df = universe.backtest_results(df)
 
 print("\n--- Final Data Tail ---")
 print(final_df.tail(50))
 
 save_path = os.path.join(mod_dir, 'final_backtest_results.csv')
-final_df.to_csv(save_path)
+store.save(final_df, mod_dir, 'final_backtest_results')
 print(f"Backtest Data saved to: {save_path}")
 
-# 6. Visualization
-fig, ax = plt.subplots(figsize=(15, 8))
-
-ax.plot(final_df.index, final_df['Dynamic_Equity'], label='Dynamic Regime Strategy', color='purple', linewidth=2)
-ax.plot(final_df.index, final_df['60_40_Equity'], label='60/40 Benchmark', color='gray', linewidth=1, linestyle='--')
-
-ax.set_yscale('log')
-y_ticks = [1, 5, 10, 50, 100, 500, 1000]
-ax.set_yticks(y_ticks)
-ax.get_yaxis().set_major_formatter(ScalarFormatter())
-ax.yaxis.set_minor_locator(NullLocator())
-
+# 6. Transaction Costs on the Switch Days
+# Turnover from the change in the holdings vector between consecutive backtest days,
+# charged at the open of each switch day, for every cost level in one broadcasted pass
+cost_bps = np.arange(0, 101)   # per unit of one-way turnover (a full switch = 1)
+results_dir = os.path.join(base_dir, 'results')
+os.makedirs(results_dir, exist_ok=True)
+
+# Over every backtest day (like Dynamic_Equity), then cut to the saved rows
+sleeve_returns = df[list(backtest.SLEEVES.values())].to_numpy()
+exposure = backtest.exposure(df['Regime'], allocation)
+traded = backtest.turnover(exposure, sleeve_returns if drift else None)
+
+net_returns = backtest.net_of_costs(df['Dynamic_Returns'].fillna(0), traded, cost_bps / 10000)
+kept = df.index.get_indexer(final_df.index)
+net_equity = np.cumprod(1 + net_returns, axis=0)[kept]
+
+years = len(final_df) / 252
+gross_cagr = net_equity[-1, 0] ** (1 / years) - 1
+cost_surface = pd.DataFrame({
+    'Cost (bps)': cost_bps,
+    'Final Equity': net_equity[-1],
+    'Net CAGR': net_equity[-1] ** (1 / years) - 1,
+    'Cost Drag (CAGR)': gross_cagr - (net_equity[-1] ** (1 / years) - 1),
+    'Switches': int((traded[kept[0]:] > 0).sum()),
+    'Turnover Per Year': traded[kept[0]:].sum() / years
+})
+
+print("\n--- Net-of-Cost Performance ---")
+print(cost_surface.set_index("Cost (bps)").loc[[0, 5, 10, 25, 50, 100]].to_string())
+
+cost_surface.to_csv(os.path.join(results_dir, 'cost_surface.csv'), index=False)
+# Full (days x cost levels) net-equity surface, binary only
+store.write_columns(pd.DataFrame(net_equity, index=final_df.index, columns=[f'{b}bps' for b in cost_bps]),
+                    mod_dir, 'net_equity_surface')
+print(f"Cost surface saved to: {os.path.join(results_dir, 'cost_surface.csv')}")
+
+# 7. Visualization
 end_year = final_df.index[-1].year
-ax.set_title(f'Dynamic Regime Strategy vs 60/40 (1970-{end_year})', fontsize=14)
-ax.set_ylabel('Portfolio Value (Growth of $1)')
-
-# X-Axis: Every 3 Years
-ax.xaxis.set_major_locator(mdates.YearLocator(3))
-ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-plt.xticks(rotation=45)
-
-ax.legend(loc='upper left')
-ax.grid(True, which="major", ls="-", alpha=0.5)
-
-plt.tight_layout()
 fig_save_path = os.path.join(fig_dir, 'dynamic_backtest_result.png')
-plt.savefig(fig_save_path, dpi=300, bbox_inches='tight')
-print(f"Figure saved to: {fig_save_path}")
-
-plt.show()
\ No newline at end of file
+plot_df = downsample.frame(final_df[['Dynamic_Equity', '60_40_Equity']], 15)
+
+for path in render.run([
+    render.job(figures.equity_figure, fig_save_path,
+               dates=plot_df.index.values,
+               lines=[{'values': plot_df['Dynamic_Equity'].to_numpy(), 'label': 'Dynamic Regime Strategy',
+                       'color': 'purple', 'linewidth': 2},
+                      {'values': plot_df['60_40_Equity'].to_numpy(), 'label': '60/40 Benchmark',
+                       'color': 'gray', 'linewidth': 1, 'linestyle': '--'}],
+               y_ticks=[1, 5, 10, 50, 100, 500, 1000],
+               year_step=3,
+               title=f'Dynamic Regime Strategy vs 60/40 (1970-{end_year})',
+               title_kw={'fontsize': 14})
+]):
+    print(f"Figure saved to: {path}")
+
+render.show()
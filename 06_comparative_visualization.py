@@ -1,11 +1,9 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.ticker import ScalarFormatter, NullLocator
 import os
 
+from portfolio import downsample, figures, render, rolling, store, universe
+
 # 1. Setup
-base_dir = '/Users/pustak/Desktop/Dynamic Portfolio'
+base_dir = os.environ.get('DP_BASE_DIR', '/Users/pustak/Desktop/Dynamic Portfolio')
 mod_dir = os.path.join(base_dir, 'modified_data')
 fig_dir = os.path.join(base_dir, 'figures')
 
@@ -13,28 +11,12 @@ os.makedirs(fig_dir, exist_ok=True)
 
 # 2. Load Data
 print("Loading Data...")
-dyn_df = pd.read_csv(os.path.join(mod_dir, 'final_backtest_results.csv'), 
-                     index_col='date', parse_dates=True)
-comp_df = pd.read_csv(os.path.join(mod_dir, 'benchmark_portfolio_1970_2025.csv'), 
-                      index_col='date', parse_dates=True)
-
-# Merge into one view (Equity Curves)
-df = dyn_df[['Dynamic_Equity', '60_40_Equity']].join(comp_df[['Stock_Equity', 'Bond_Equity']], how='inner')
-
-# 3. Re-Base all Equity Curves to start at $1
-df['Stock_Equity']   = df['Stock_Equity'] / df['Stock_Equity'].iloc[0]
-df['Bond_Equity']    = df['Bond_Equity'] / df['Bond_Equity'].iloc[0]
-df['60_40_Equity']   = df['60_40_Equity'] / df['60_40_Equity'].iloc[0]
-df['Dynamic_Equity'] = df['Dynamic_Equity'] / df['Dynamic_Equity'].iloc[0]
-
-# 4. Calculate Returns Columns (Derived from the Rebased Equity)
-df['Stock_Returns']   = df['Stock_Equity'].pct_change()
-df['Bond_Returns']    = df['Bond_Equity'].pct_change()
-df['60_40_Returns']   = df['60_40_Equity'].pct_change()
-df['Dynamic_Returns'] = df['Dynamic_Equity'].pct_change()
+dyn_df = store.load(mod_dir, 'final_backtest_results', ['Dynamic_Equity', '60_40_Equity', 'Regime'])
+comp_df = store.load(mod_dir, 'benchmark_portfolio_1970_2025', ['Stock_Equity', 'Bond_Equity'])
 
-# Add Regime column for future analysis
-df = df.join(dyn_df[['Regime']], how='left')
+# 3. Merge, Re-Base all Equity Curves to start at $1 and 4. Derive the Returns from them
+# (with the Regime column for future analysis; portfolio/universe.py, shared with 20)
+df = universe.consolidate(dyn_df, comp_df)
 
 # 5. Inspection
 print("\n--- Final Dataframe (Head) ---")
@@ -46,57 +28,44 @@ print(final_vals[['Stock_Equity', 'Bond_Equity', '60_40_Equity', 'Dynamic_Equity
 
 # Save the master dataset
 master_save_path = os.path.join(mod_dir, 'consolidated_portfolio_rebased.csv')
-df.to_csv(master_save_path)
+store.save(df, mod_dir, 'consolidated_portfolio_rebased')
 print(f"\n--> Master Rebased Dataset saved to: {master_save_path}")
 
-# 6. Visualization
-fig, ax = plt.subplots(figsize=(15, 9))
-
-# Plot with beginning → ending in legend
-ax.plot(df.index, df['Stock_Equity'], 
-        label=f'Stocks (S&P 500): $1.00 → ${final_vals["Stock_Equity"]:.2f}', 
-        color='green', linewidth=1, alpha=0.6)
-
-ax.plot(df.index, df['Bond_Equity'], 
-        label=f'Bonds (10Y Treas): $1.00 → ${final_vals["Bond_Equity"]:.2f}', 
-        color='red', linewidth=1, alpha=0.6)
-
-ax.plot(df.index, df['60_40_Equity'], 
-        label=f'60/40 Benchmark: $1.00 → ${final_vals["60_40_Equity"]:.2f}', 
-        color='gray', linewidth=1.5, linestyle='--')
+# Rolling stock-bond correlation (read by 11 and 14, extended daily by 17)
+corr_df = rolling.correlation_frame(df)
+store.save(corr_df, mod_dir, rolling.DATASET)
+print(f"--> Rolling Stock-Bond Correlation saved to: {os.path.join(mod_dir, rolling.DATASET + '.csv')}")
 
-ax.plot(df.index, df['Dynamic_Equity'], 
-        label=f'Dynamic Strategy: $1.00 → ${final_vals["Dynamic_Equity"]:.2f}', 
-        color='purple', linewidth=2.5)
-
-# Formatting
-ax.set_yscale('log')
-y_ticks = [1, 2, 5, 10, 20, 50, 100, 200, 500]
-ax.set_yticks(y_ticks)
-ax.get_yaxis().set_major_formatter(ScalarFormatter())
-ax.yaxis.set_minor_locator(NullLocator())
-
-# Title & Labels
+# 6. Visualization
 start_year = df.index[0].year
 end_year = df.index[-1].year
-ax.set_title(f'Comprehensive Asset Comparison ({start_year}-{end_year})', 
-             fontsize=16, fontweight='bold')
-ax.set_ylabel('Portfolio Value (Growth of $1)', 
-              fontsize=13, fontweight='bold')
-
-# X-Axis formatting
-ax.xaxis.set_major_locator(mdates.YearLocator(3))
-ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-plt.xticks(rotation=45)
-
-ax.grid(True, which="major", ls="-", alpha=0.5)
-ax.legend(loc='upper left', fontsize=11, frameon=True)
-
-plt.tight_layout()
-
-# Save & Show
 save_path = os.path.join(fig_dir, 'comprehensive_comparison_rebased.png')
-plt.savefig(save_path, dpi=300, bbox_inches='tight')
-print(f"Comparison Figure saved to: {save_path}")
-
-plt.show()
\ No newline at end of file
+plot_df = downsample.frame(df[['Stock_Equity', 'Bond_Equity', '60_40_Equity', 'Dynamic_Equity']], 15)
+
+# Legend shows beginning → ending value
+for path in render.run([
+    render.job(figures.equity_figure, save_path,
+               dates=plot_df.index.values,
+               lines=[{'values': plot_df['Stock_Equity'].to_numpy(),
+                       'label': f'Stocks (S&P 500): $1.00 → ${final_vals["Stock_Equity"]:.2f}',
+                       'color': 'green', 'linewidth': 1, 'alpha': 0.6},
+                      {'values': plot_df['Bond_Equity'].to_numpy(),
+                       'label': f'Bonds (10Y Treas): $1.00 → ${final_vals["Bond_Equity"]:.2f}',
+                       'color': 'red', 'linewidth': 1, 'alpha': 0.6},
+                      {'values': plot_df['60_40_Equity'].to_numpy(),
+                       'label': f'60/40 Benchmark: $1.00 → ${final_vals["60_40_Equity"]:.2f}',
+                       'color': 'gray', 'linewidth': 1.5, 'linestyle': '--'},
+                      {'values': plot_df['Dynamic_Equity'].to_numpy(),
+                       'label': f'Dynamic Strategy: $1.00 → ${final_vals["Dynamic_Equity"]:.2f}',
+                       'color': 'purple', 'linewidth': 2.5}],
+               y_ticks=[1, 2, 5, 10, 20, 50, 100, 200, 500],
+               year_step=3,
+               figsize=(15, 9),
+               title=f'Comprehensive Asset Comparison ({start_year}-{end_year})',
+               title_kw=dict(fontsize=16, fontweight='bold'),
+               ylabel_kw=dict(fontsize=13, fontweight='bold'),
+               legend_kw=dict(fontsize=11, frameon=True))
+]):
+    print(f"Comparison Figure saved to: {path}")
+
+render.show()
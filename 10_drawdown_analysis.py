@@ -1,199 +1,83 @@
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.offsetbox import AnchoredText
 import os
 
+from portfolio import downsample, drawdown, figures, render, store
+
 # 1. Setup
-base_dir = '/Users/pustak/Desktop/Dynamic Portfolio'
+base_dir = os.environ.get('DP_BASE_DIR', '/Users/pustak/Desktop/Dynamic Portfolio')
 mod_dir = os.path.join(base_dir, 'modified_data')
 fig_dir = os.path.join(base_dir, 'figures')
 
-os.makedirs(fig_dir, exist_ok=True)
-
-# 2. Load Data
-print("Loading Data...")
-master_df = pd.read_csv(os.path.join(mod_dir, 'consolidated_portfolio_rebased.csv'), 
-                        index_col='date', parse_dates=True)
-
-# Prepare DataFrame for Drawdown Analysis
-df = pd.DataFrame(index=master_df.index)
-df['Dynamic'] = master_df['Dynamic_Equity']
-df['60/40']   = master_df['60_40_Equity']
-df['Stocks']  = master_df['Stock_Equity']
-df['Bonds']   = master_df['Bond_Equity']
-df.dropna(inplace=True)
-
-# 3. Calculate Drawdowns
-dd = (df / df.cummax()) - 1
-
-# 4. Helper: Calculate Advanced Drawdown Statistics
-def get_dd_stats(series):
-    is_dd = series < 0
-    # FIX: Use fill_value=False inside shift() to maintain boolean dtype
-    starts = (~is_dd).shift(1, fill_value=False) & is_dd
-    ends = is_dd.shift(1, fill_value=False) & (~is_dd)
-    
-    start_dates = series.index[starts]
-    end_dates = series.index[ends]
-    
-    if len(start_dates) > len(end_dates):
-        end_dates = end_dates.append(pd.Index([series.index[-1]]))
-        
-    stats = []
-    for s, e in zip(start_dates, end_dates):
-        window = series.loc[s:e]
-        trough_val = window.min()
-        duration = (e - s).days
-        trough_date = window.idxmin()
-        recovery = (e - trough_date).days
-        
-        stats.append({
-            'depth': trough_val,
-            'duration': duration,
-            'recovery': recovery
-        })
-        
-    if not stats:
-        return None
-        
-    df_stats = pd.DataFrame(stats)
-    
-    return {
-        'avg_dd': df_stats['depth'].mean(),
-        'med_dd': df_stats['depth'].median(),
-        'max_dd': df_stats['depth'].min(),
-        'avg_rec': df_stats['recovery'].mean(),
-        'med_rec': df_stats['recovery'].median(),
-        'avg_dur': df_stats['duration'].mean(),
-        'med_dur': df_stats['duration'].median(),
-        'count': len(df_stats)
-    }
-
-# 5. Helper: Plotting with Stats Box
-def plot_drawdown(ax, series, name, color, stats_loc='lower left'):
-    ax.plot(series.index, series, label=name, color=color, linewidth=1.5, alpha=0.9)
-    ax.fill_between(series.index, series, 0, color=color, alpha=0.1)
-    
-    stats = get_dd_stats(series)
-    
-    if stats:
-        text_str = (
-            f"Statistics ({name}):\n"
-            f"---------------------------\n"
-            f"Avg DD: {stats['avg_dd']:.2%}\n"
-            f"Median DD: {stats['med_dd']:.2%}\n"
-            f"Max DD: {stats['max_dd']:.2%}\n"
-            f"---------------------------\n"
-            f"Avg Recovery: {stats['avg_rec']:.0f} days\n"
-            f"Med Recovery: {stats['med_rec']:.0f} days\n"
-            f"---------------------------\n"
-            f"Avg Duration: {stats['avg_dur']:.0f} days\n"
-            f"Med Duration: {stats['med_dur']:.0f} days\n"
-            f"---------------------------\n"
-            f"Total Drawdowns: {stats['count']}"
-        )
-        
-        at = AnchoredText(text_str, loc=stats_loc, prop=dict(size=8), frameon=True)
-        at.patch.set_boxstyle("round,pad=0.,rounding_size=0.2")
-        at.patch.set_facecolor(color)
-        at.patch.set_alpha(0.1)
-        ax.add_artist(at)
-
-# ==========================================
-# FIGURE 1: Dynamic vs 60/40
-# ==========================================
-fig1, ax1 = plt.subplots(figsize=(15, 8)) 
-
-plot_drawdown(ax1, dd['Dynamic'], 'Dynamic Strategy', 'purple', 'lower right')
-plot_drawdown(ax1, dd['60/40'], '60/40 Benchmark', 'gray', 'lower left')
-
-ax1.set_title('Drawdown Analysis: Strategy vs Benchmark', fontsize=16, fontweight='bold')
-ax1.set_ylabel('Drawdown (%)', fontsize=13, fontweight='bold')
-
-ax1.yaxis.set_major_formatter(plt.FuncFormatter(lambda y, _: '{:.0%}'.format(y)))
-ax1.xaxis.set_major_locator(mdates.YearLocator(3))
-ax1.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-plt.xticks(rotation=45)
-ax1.grid(True, alpha=0.3)
-ax1.legend(loc='upper right') 
-
-plt.tight_layout()
-fig1.savefig(os.path.join(fig_dir, 'drawdown_strategy.png'), dpi=300, bbox_inches='tight')
-print("Figure 1 saved.")
-
-# ==========================================
-# FIGURE 2: Asset Classes (3 Panels - Original)
-# ==========================================
-fig2, (ax2a, ax2b, ax2c) = plt.subplots(3, 1, figsize=(15, 12), sharex=True)
-
-plot_drawdown(ax2a, dd['Stocks'], 'Stocks (S&P 500)', 'green', 'lower left')
-plot_drawdown(ax2b, dd['Bonds'], 'Bonds (10Y Treas)', 'red', 'lower left')
-plot_drawdown(ax2c, dd['60/40'], '60/40 Benchmark', 'gray', 'lower left')
-
-ax2a.set_title('Drawdown Analysis: Asset Classes', fontsize=16, fontweight='bold')
-
-for ax in [ax2a, ax2b, ax2c]:
-    ax.set_ylabel('Drawdown (%)', fontsize=13, fontweight='bold')
-    ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda y, _: '{:.0%}'.format(y)))
-    ax.grid(True, alpha=0.3)
-    ax.legend(loc='upper right')
-
-ax2c.xaxis.set_major_locator(mdates.YearLocator(3))
-ax2c.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-plt.xticks(rotation=45)
-
-plt.tight_layout()
-fig2.savefig(os.path.join(fig_dir, 'drawdown_assets.png'), dpi=300, bbox_inches='tight')
-print("Figure 2 saved.")
-
-# ==========================================
-# FIGURE 3: Dynamic vs Stocks
-# ==========================================
-fig3, ax3 = plt.subplots(figsize=(15, 8))
-
-plot_drawdown(ax3, dd['Stocks'], 'Stocks (S&P 500)', 'green', 'lower left')
-plot_drawdown(ax3, dd['Dynamic'], 'Dynamic Strategy', 'purple', 'lower right')
-
-ax3.set_title('Drawdown Analysis: Strategy vs Stocks', fontsize=16, fontweight='bold')
-ax3.set_ylabel('Drawdown (%)', fontsize=13, fontweight='bold')
-
-ax3.yaxis.set_major_formatter(plt.FuncFormatter(lambda y, _: '{:.0%}'.format(y)))
-ax3.xaxis.set_major_locator(mdates.YearLocator(3))
-ax3.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-plt.xticks(rotation=45)
-ax3.grid(True, alpha=0.3)
-ax3.legend(loc='upper right')
-
-plt.tight_layout()
-fig3.savefig(os.path.join(fig_dir, 'drawdown_vs_stocks.png'), dpi=300, bbox_inches='tight')
-print("Figure 3 saved.")
-
-# ==========================================
-# FIGURE 4: All Drawdowns (4 Panels - New)
-# ==========================================
-fig4, (ax4a, ax4b, ax4c, ax4d) = plt.subplots(4, 1, figsize=(15, 16), sharex=True)
-
-plot_drawdown(ax4a, dd['Stocks'], 'Stocks (S&P 500)', 'green', 'lower left')
-plot_drawdown(ax4b, dd['Bonds'], 'Bonds (10Y Treas)', 'red', 'lower left')
-plot_drawdown(ax4c, dd['60/40'], '60/40 Benchmark', 'gray', 'lower left')
-plot_drawdown(ax4d, dd['Dynamic'], 'Dynamic Strategy', 'purple', 'lower left')
-
-ax4a.set_title('Comprehensive Drawdown Comparison: All Assets', fontsize=16, fontweight='bold')
-
-for ax in [ax4a, ax4b, ax4c, ax4d]:
-    ax.set_ylabel('Drawdown (%)', fontsize=13, fontweight='bold')
-    ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda y, _: '{:.0%}'.format(y)))
-    ax.grid(True, alpha=0.3)
-    ax.legend(loc='upper right')
-
-ax4d.xaxis.set_major_locator(mdates.YearLocator(3))
-ax4d.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-plt.xticks(rotation=45)
-
-plt.tight_layout()
-fig4.savefig(os.path.join(fig_dir, 'drawdown_all_stacked.png'), dpi=300, bbox_inches='tight')
-print("Figure 4 saved.")
-
-plt.show()
\ No newline at end of file
+# Figures are rendered in worker processes in batch mode, which re-import this file
+if __name__ == '__main__':
+    os.makedirs(fig_dir, exist_ok=True)
+
+    # 2. Load Data
+    print("Loading Data...")
+    master_df = store.load(mod_dir, 'consolidated_portfolio_rebased',
+                           ['Dynamic_Equity', '60_40_Equity', 'Stock_Equity', 'Bond_Equity'])
+
+    # Prepare DataFrame for Drawdown Analysis
+    df = pd.DataFrame(index=master_df.index)
+    df['Dynamic'] = master_df['Dynamic_Equity']
+    df['60/40']   = master_df['60_40_Equity']
+    df['Stocks']  = master_df['Stock_Equity']
+    df['Bonds']   = master_df['Bond_Equity']
+    df.dropna(inplace=True)
+
+    # 3. Calculate Drawdowns
+    dd = drawdown.underwater(df)
+
+    # 4. Drawdown Statistics
+    # All episodes of all four series in one pass; every panel reuses the cached result per series
+    dd_stats = drawdown.stats_frame(dd)
+    print("\n--- Drawdown Episode Statistics ---")
+    print(dd_stats)
+
+    # 5. Helper: One Drawdown Line with its Stats Box
+    # Stats always come from the full series; only the plotted curve is reduced (--downsample)
+    plot_dd = downsample.frame(dd, 15)
+
+    def line(col, name, color, stats_loc='lower left'):
+        return {'values': plot_dd[col].to_numpy(), 'name': name, 'color': color,
+                'stats_loc': stats_loc, 'stats': drawdown.stats(dd[col])}
+
+    dates = plot_dd.index.values
+    jobs = [
+        # FIGURE 1: Dynamic vs 60/40
+        render.job(figures.drawdown_figure, os.path.join(fig_dir, 'drawdown_strategy.png'),
+                   dates=dates, figsize=(15, 8),
+                   title='Drawdown Analysis: Strategy vs Benchmark',
+                   panels=[[line('Dynamic', 'Dynamic Strategy', 'purple', 'lower right'),
+                            line('60/40', '60/40 Benchmark', 'gray', 'lower left')]]),
+
+        # FIGURE 2: Asset Classes (3 Panels - Original)
+        render.job(figures.drawdown_figure, os.path.join(fig_dir, 'drawdown_assets.png'),
+                   dates=dates, figsize=(15, 12),
+                   title='Drawdown Analysis: Asset Classes',
+                   panels=[[line('Stocks', 'Stocks (S&P 500)', 'green')],
+                           [line('Bonds', 'Bonds (10Y Treas)', 'red')],
+                           [line('60/40', '60/40 Benchmark', 'gray')]]),
+
+        # FIGURE 3: Dynamic vs Stocks
+        render.job(figures.drawdown_figure, os.path.join(fig_dir, 'drawdown_vs_stocks.png'),
+                   dates=dates, figsize=(15, 8),
+                   title='Drawdown Analysis: Strategy vs Stocks',
+                   panels=[[line('Stocks', 'Stocks (S&P 500)', 'green', 'lower left'),
+                            line('Dynamic', 'Dynamic Strategy', 'purple', 'lower right')]]),
+
+        # FIGURE 4: All Drawdowns (4 Panels - New)
+        render.job(figures.drawdown_figure, os.path.join(fig_dir, 'drawdown_all_stacked.png'),
+                   dates=dates, figsize=(15, 16),
+                   title='Comprehensive Drawdown Comparison: All Assets',
+                   panels=[[line('Stocks', 'Stocks (S&P 500)', 'green')],
+                           [line('Bonds', 'Bonds (10Y Treas)', 'red')],
+                           [line('60/40', '60/40 Benchmark', 'gray')],
+                           [line('Dynamic', 'Dynamic Strategy', 'purple')]]),
+    ]
+
+    # 6. Render (in parallel in batch mode)
+    for i, path in enumerate(render.run(jobs), start=1):
+        print(f"Figure {i} saved.")
+
+    render.show()
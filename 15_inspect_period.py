@@ -1,96 +1,86 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from matplotlib.ticker import FuncFormatter, ScalarFormatter
+import argparse
 import os
 
+from portfolio import figures, periods, render, store
+
 # 1. Setup
-base_dir = '/Users/pustak/Desktop/Dynamic Portfolio'
+base_dir = os.environ.get('DP_BASE_DIR', '/Users/pustak/Desktop/Dynamic Portfolio')
 mod_dir = os.path.join(base_dir, 'modified_data')
 fig_dir = os.path.join(base_dir, 'figures')
 
-os.makedirs(fig_dir, exist_ok=True)
-
-# 2. Load Data
-print("Loading Consolidated Data...")
-macro = pd.read_csv(os.path.join(mod_dir, 'macro_regimes.csv'), index_col='date', parse_dates=True)
-portfolio = pd.read_csv(os.path.join(mod_dir, 'consolidated_portfolio_rebased.csv'), index_col='date', parse_dates=True)
+# Figures are rendered in worker processes in batch mode, which re-import this file
+if __name__ == '__main__':
+    os.makedirs(fig_dir, exist_ok=True)
 
-# 3. Define Plotting Function
-def plot_and_save_period(start_date, end_date, period_name, filename, highlight_period=None):
-    # Slice Data
-    macro_sub = macro.loc[start_date:end_date]
-    port_sub = portfolio.loc[start_date:end_date]
-    
-    if len(macro_sub) == 0:
-        return
+    # 2. Load Data
+    print("Loading Consolidated Data...")
+    macro = store.load(mod_dir, 'macro_regimes', ['Growth_YoY', 'Inflation_YoY'])
+    portfolio = store.load(mod_dir, 'consolidated_portfolio_rebased',
+                           ['Stock_Equity', 'Bond_Equity', '60_40_Equity', 'Dynamic_Equity'])
 
-    fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(16, 12), sharex=True)
-    
-    fig.suptitle(f'{period_name}: Macro Signals & Portfolio Response ({start_date[:4]}-{end_date[:4]})', 
-                 fontsize=18, fontweight='bold', y=0.96)
+    # 3. Windows
+    # Default: the two episodes below. --windows FILE takes a CSV of many
+    # (name, start, end, highlight_start, highlight_end[, filename]) rows;
+    # --regime-switches zooms on every regime change instead.
+    parser = argparse.ArgumentParser(description='Zoom on macro signals and portfolio response over date windows.')
+    parser.add_argument('--windows', metavar='CSV', help='file of windows to render')
+    parser.add_argument('--regime-switches', action='store_true', help='one window around every regime change')
+    parser.add_argument('--months', type=int, default=12, help='months either side of a regime switch')
+    args, _ = parser.parse_known_args()
 
-    # --- PANEL 1: GROWTH ---
-    ax1.plot(macro_sub.index, macro_sub['Growth_YoY'], color='blue', linewidth=2, label='Ind. Production (YoY)')
-    ax1.axhline(0, color='black', linestyle='--', linewidth=1)
-    ax1.fill_between(macro_sub.index, macro_sub['Growth_YoY'], 0, where=(macro_sub['Growth_YoY'] < 0), 
-                    color='gray', alpha=0.2, label='Contraction')
-    
-    ax1.set_ylabel('Growth Rate (YoY)', fontweight='bold', fontsize=12)
-    ax1.yaxis.set_major_formatter(FuncFormatter(lambda y, _: '{:.1%}'.format(y)))
-    ax1.grid(True, alpha=0.3)
-    ax1.legend(loc='upper right')
+    if args.windows:
+        windows = periods.read(args.windows)
+    elif args.regime_switches:
+        regime = store.load(mod_dir, 'macro_regimes', ['Regime'])['Regime']
+        windows = periods.regime_switches(regime, args.months, args.months)
+    else:
+        windows = periods.frame([
+            # Post-COVID
+            {'name': 'Post-COVID Shock', 'start': '2020-01-01', 'end': '2024-12-31',
+             'highlight_start': '2022-08-01', 'highlight_end': '2022-10-01', 'filename': 'zoom_2020_post_covid.png'},
+            # Post-DotCom
+            {'name': 'Post-DotCom Transition', 'start': '2001-01-01', 'end': '2007-12-31',
+             'highlight_start': '2002-06-01', 'highlight_end': '2002-08-01', 'filename': 'zoom_2001_whipsaw.png'},
+        ])
+    print(f"{len(windows)} window(s) to render")
 
-    # --- PANEL 2: INFLATION ---
-    ax2.plot(macro_sub.index, macro_sub['Inflation_YoY'], color='red', linewidth=2, label='CPI Inflation (YoY)')
-    ax2.axhline(0.02, color='green', linestyle='--', linewidth=1, label='Target (2%)')
-    ax2.fill_between(macro_sub.index, macro_sub['Inflation_YoY'], 0.04, where=(macro_sub['Inflation_YoY'] > 0.04), 
-                    color='red', alpha=0.1, label='High Inflation')
-    
-    ax2.set_ylabel('Inflation Rate', fontweight='bold', fontsize=12)
-    ax2.yaxis.set_major_formatter(FuncFormatter(lambda y, _: '{:.1%}'.format(y)))
-    ax2.grid(True, alpha=0.3)
-    ax2.legend(loc='upper right')
+    # 4. Resolve Every Window to Row Offsets at Once
+    macro_rows = periods.resolve(macro.index, windows)
+    port_rows = periods.resolve(portfolio.index, windows)
 
-    # --- PANEL 3: EQUITY (ALL ASSETS) ---
-    # Plot Components (Background)
-    ax3.plot(port_sub.index, port_sub['Stock_Equity'], color='green', linewidth=1.5, alpha=0.6, label='Stocks (S&P 500)')
-    ax3.plot(port_sub.index, port_sub['Bond_Equity'], color='red', linewidth=1.5, alpha=0.6, label='Bonds (10Y)')
-    
-    # Plot Strategies (Foreground)
-    ax3.plot(port_sub.index, port_sub['60_40_Equity'], color='gray', linewidth=2.0, linestyle='--', label='60/40 Benchmark')
-    ax3.plot(port_sub.index, port_sub['Dynamic_Equity'], color='purple', linewidth=2.5, label='Dynamic Strategy')
-    
-    ax3.set_ylabel('Portfolio Value ($)', fontweight='bold', fontsize=12)
-    ax3.yaxis.set_major_formatter(ScalarFormatter())
-    ax3.grid(True, alpha=0.3)
-    ax3.legend(loc='upper left', ncol=2)
+    macro_dates, growth, inflation = macro.index.values, macro['Growth_YoY'].to_numpy(), macro['Inflation_YoY'].to_numpy()
+    port_dates = portfolio.index.values
+    equity = {'Stocks': portfolio['Stock_Equity'].to_numpy(),
+              'Bonds': portfolio['Bond_Equity'].to_numpy(),
+              '60/40': portfolio['60_40_Equity'].to_numpy(),
+              'Dynamic': portfolio['Dynamic_Equity'].to_numpy()}
 
-    # Apply Highlight to ALL Axes
-    if highlight_period:
-        for ax in [ax1, ax2, ax3]:
-            ax.axvspan(pd.Timestamp(highlight_period[0]), pd.Timestamp(highlight_period[1]), 
-                        color='orange', alpha=0.25, label='Focus Period')
+    # 5. One Job per Window
+    jobs, manifest = [], []
+    for w, (m0, m1), (p0, p1) in zip(windows.itertuples(), macro_rows, port_rows):
+        path = os.path.join(fig_dir, w.filename)
+        highlight = None if pd.isna(w.highlight_start) else (w.highlight_start, w.highlight_end)
+        manifest.append({'name': w.name, 'start': w.start.date(), 'end': w.end.date(),
+                         'highlight_start': w.highlight_start, 'highlight_end': w.highlight_end,
+                         'file': path, 'macro_rows': m1 - m0, 'portfolio_rows': p1 - p0,
+                         'status': 'empty' if m1 == m0 else 'saved' if render.PLOTS else 'not drawn'})
+        if m1 == m0:
+            continue
 
-    # X-Axis Formatting
-    ax3.xaxis.set_major_locator(mdates.YearLocator(1))
-    ax3.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-    ax3.xaxis.set_minor_locator(mdates.MonthLocator(interval=1))
-    
-    plt.xticks(rotation=45)
+        jobs.append(render.job(
+            figures.period_zoom, path,
+            macro_dates=macro_dates[m0:m1], growth=growth[m0:m1], inflation=inflation[m0:m1],
+            dates=port_dates[p0:p1], equity={k: v[p0:p1] for k, v in equity.items()},
+            title=f'{w.name}: Macro Signals & Portfolio Response ({w.start.year}-{w.end.year})',
+            highlight=highlight))
 
-    plt.tight_layout(rect=[0, 0, 1, 0.96])
-    save_path = os.path.join(fig_dir, filename)
-    plt.savefig(save_path, dpi=300, bbox_inches='tight')
-    print(f"Chart saved to: {save_path}")
-    
-    plt.show()
+    # 6. Render (in parallel in batch mode) & Manifest
+    for path in render.run(jobs):
+        print(f"Chart saved to: {path}")
 
-# 4. Run & Save
-# Post-COVID
-plot_and_save_period('2020-01-01', '2024-12-31', 'Post-COVID Shock', 'zoom_2020_post_covid.png', 
-                     highlight_period=('2022-08-01', '2022-10-01'))
+    manifest_path = os.path.join(fig_dir, 'zoom_manifest.csv')
+    pd.DataFrame(manifest).to_csv(manifest_path, index=False)
+    print(f"Manifest saved to: {manifest_path}")
 
-# Post-DotCom
-plot_and_save_period('2001-01-01', '2007-12-31', 'Post-DotCom Transition', 'zoom_2001_whipsaw.png',
-                     highlight_period=('2002-06-01', '2002-08-01'))
\ No newline at end of file
+    render.show()
@@ -0,0 +1,54 @@
+import numpy as np
+import time
+import os
+
+from portfolio import backtest, store
+from portfolio.regimes import REGIMES, encode
+
+# 1. Setup
+base_dir = os.environ.get('DP_BASE_DIR', '/Users/pustak/Desktop/Dynamic Portfolio')
+mod_dir = os.path.join(base_dir, 'modified_data')
+results_dir = os.path.join(base_dir, 'results')
+
+os.makedirs(results_dir, exist_ok=True)
+
+# 2. Load Data
+print("Loading Processed Data...")
+bench = store.load(mod_dir, 'benchmark_portfolio_1970_2025', ['Stock_Returns', 'Bond_Returns', '60_40_Returns'])
+alts  = store.load(mod_dir, 'alternative_assets_1970_2025', ['Commodities_Price', 'Oil_Price'])
+macro = store.load(mod_dir, 'macro_regimes', ['Regime'])
+rf_df = store.load(mod_dir, 'risk_free_daily', ['Risk_Free_Return'])
+
+# 3. Build the Sleeve Returns Matrix (Days x Sleeves)
+sleeves = ['Stocks', 'Bonds', '60/40', 'Commodities', 'Oil']
+sleeve_cols = [backtest.SLEEVES[name] for name in sleeves]
+
+df = backtest.align_inputs(bench, alts, macro)
+df['Risk_Free_Return'] = rf_df['Risk_Free_Return'].reindex(df.index).ffill()
+
+# Common sample: every sleeve priced and a regime signal available
+df = df.dropna(subset=sleeve_cols + ['Regime'])
+print(f"Sample: {df.index[0].date()} to {df.index[-1].date()} ({len(df)} days)")
+
+# 4. Sweep All Regime -> Sleeve Assignments
+n_strategies = len(sleeves) ** len(REGIMES)
+print(f"\nEvaluating {n_strategies} mappings ({len(REGIMES)} regimes x {len(sleeves)} sleeves)...")
+
+start = time.perf_counter()
+ranked = backtest.sweep_mappings(df[sleeve_cols].to_numpy(), encode(df['Regime']), sleeves,
+                                 rf=df['Risk_Free_Return'].fillna(0).to_numpy())
+elapsed = time.perf_counter() - start
+print(f"Done in {elapsed:.2f}s ({n_strategies / elapsed:,.0f} strategies/sec)")
+
+# 5. Report
+print("\n--- Top 15 Mappings (by Sharpe) ---")
+print(ranked.head(15))
+
+# Where does the baseline mapping from 05 land?
+is_baseline = np.logical_and.reduce([ranked[r] == a for r, a in backtest.MAPPING.items()])
+print("\n--- Baseline Mapping (05_dynamic_backtest.py) ---")
+print(ranked[is_baseline])
+
+save_path = os.path.join(results_dir, 'regime_mapping_sweep.csv')
+ranked.to_csv(save_path)
+print(f"\nRanked sweep saved to: {save_path}")
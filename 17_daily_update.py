@@ -0,0 +1,69 @@
+import pandas as pd
+import os
+
+from portfolio import fetch, rolling, store, streaming
+
+# 1. Setup
+base_dir = os.environ.get('DP_BASE_DIR', '/Users/pustak/Desktop/Dynamic Portfolio')
+raw_dir = os.path.join(base_dir, 'raw_data')
+mod_dir = os.path.join(base_dir, 'modified_data')
+results_dir = os.path.join(base_dir, 'results')
+
+os.makedirs(results_dir, exist_ok=True)
+
+# 2. Pull the Latest Observations
+# Incremental: only days after the last stored date are requested
+print("Refreshing daily inputs...")
+raw = fetch.refresh(['sprtrn', 'DGS10', 'PPIACO', 'WTISPLC'], raw_dir)
+
+# Monthly regimes come from 03 (re-run it when a new CPI / INDPRO print arrives)
+macro = store.load(mod_dir, 'macro_regimes', ['Regime'])
+
+# 3. Load (or Initialize) the Running State
+master_name = 'consolidated_portfolio_rebased'
+master = store.load(mod_dir, master_name, list(streaming.EQUITY.values()))
+master_index = master.index
+
+state = streaming.load_state(mod_dir)
+if state is None or state.get('master') != streaming.fingerprint(master):
+    # First run, or 01 -> 06 rebuilt the master dataset since (its last row changed): re-seed from it
+    print("Initializing state from the consolidated dataset...")
+    state = streaming.init_state(master, macro['Regime'])
+
+# 4. Extend by the New Days Only
+# Same regime -> allocation mapping as 05 (backtest.MAPPING)
+rows, drawdowns, state = streaming.extend(state, raw['sprtrn'], raw['DGS10'], raw['PPIACO'], raw['WTISPLC'],
+                                          macro['Regime'])
+
+if rows.empty:
+    print(f"\nNo new trading days after {master_index[-1].date()}.")
+else:
+    # Rolling correlation: seed the kernel with the last 24M of stored returns, then O(1) per new day
+    history = store.load(mod_dir, master_name, ['Stock_Returns', 'Bond_Returns'])
+    kernel = rolling.RollingCorrelation.from_history(history['Stock_Returns'], history['Bond_Returns'])
+    corr = pd.DataFrame({'Correlation': kernel.extend(rows['Stock_Returns'], rows['Bond_Returns'])},
+                        index=rows.index).dropna()
+
+    store.append(rows, mod_dir, master_name)
+    print(f"\nAppended {len(rows)} day(s) to {master_name}: {rows.index[0].date()} -> {rows.index[-1].date()}")
+    # As stored (e.g. in float32 with STORE_PRECISION), so the next run recognises it
+    state['master'] = streaming.fingerprint(store.load(mod_dir, master_name, list(streaming.EQUITY.values())))
+    store.append(corr, mod_dir, rolling.DATASET)
+
+    # 5. Publish NAV & Drawdown at Close
+    nav = pd.DataFrame({
+        'Regime': rows['Regime'],
+        'Dynamic_NAV': rows['Dynamic_Equity'],
+        'Dynamic_Drawdown': drawdowns['Dynamic_Equity'],
+        '60_40_NAV': rows['60_40_Equity'],
+        '60_40_Drawdown': drawdowns['60_40_Equity'],
+        'Stock_Bond_Corr': corr['Correlation'].reindex(rows.index)
+    })
+    print("\n--- Daily NAV ---")
+    print(nav)
+
+    nav_path = os.path.join(results_dir, 'daily_nav.csv')
+    nav.to_csv(nav_path, mode='a', header=not os.path.exists(nav_path))
+    print(f"NAV published to: {nav_path}")
+
+streaming.save_state(state, mod_dir)
@@ -0,0 +1,85 @@
+import pandas as pd
+import numpy as np
+import time
+import os
+
+from portfolio import backtest, bootstrap, figures, render, store
+from portfolio.regimes import REGIMES, encode
+
+# 1. Setup
+base_dir = os.environ.get('DP_BASE_DIR', '/Users/pustak/Desktop/Dynamic Portfolio')
+mod_dir = os.path.join(base_dir, 'modified_data')
+results_dir = os.path.join(base_dir, 'results')
+fig_dir = os.path.join(base_dir, 'figures')
+
+n_paths = 10000
+block_size = 63          # ~3 months (mean block length for the stationary bootstrap)
+method = 'stationary'    # or 'circular'
+seed = 2025
+
+# The pool's worker processes re-import this file, so the work only runs in the parent
+if __name__ == '__main__':
+    for path in [results_dir, fig_dir]:
+        os.makedirs(path, exist_ok=True)
+
+    # 2. Load Data (same aligned inputs as 05_dynamic_backtest.py)
+    print("Loading Processed Data...")
+    bench = store.load(mod_dir, 'benchmark_portfolio_1970_2025', ['Stock_Returns', 'Bond_Returns', '60_40_Returns'])
+    alts  = store.load(mod_dir, 'alternative_assets_1970_2025', ['Commodities_Price', 'Oil_Price'])
+    macro = store.load(mod_dir, 'macro_regimes', ['Regime'])
+    rf_df = store.load(mod_dir, 'risk_free_daily', ['Risk_Free_Return'])
+
+    # The 05 mapping as a weight matrix (any blend of sleeves); days on which a
+    # sleeve it uses (or the 60/40) has no return are left out
+    sleeve_cols = list(backtest.SLEEVES.values())
+    weights = backtest.weight_matrix(backtest.MAPPING, list(backtest.SLEEVES))
+    used = [col for col, w in zip(sleeve_cols, np.abs(weights).sum(axis=0)) if w > 0]
+
+    df = backtest.align_inputs(bench, alts, macro)
+    df['Risk_Free_Return'] = rf_df['Risk_Free_Return'].reindex(df.index).ffill()
+    df = df.dropna(subset=used + ['60_40_Returns', 'Regime'])
+    print(f"Sample: {df.index[0].date()} to {df.index[-1].date()} ({len(df)} days)")
+
+    # 3. Return of Each Regime's Allocation, Every Day
+    # (days x regimes) = sleeve returns @ weights.T; the resampled days carry
+    # their regime code, which picks the column (unused sleeves count as 0)
+    regime_returns = df[sleeve_cols].fillna(0).to_numpy() @ weights.T
+    codes = encode(df['Regime'])
+    rf = df['Risk_Free_Return'].fillna(0).to_numpy()
+
+    # Point estimates on the historical path, for reference
+    actual = pd.DataFrame(
+        backtest.summary_stats(np.vstack([
+            np.where(codes >= 0, regime_returns[np.arange(len(df)), codes], 0.0),
+            df['60_40_Returns'].to_numpy()
+        ]), rf, 252),
+        index=['Dynamic', '60/40'], columns=bootstrap.STATS)
+    print("\n--- Historical Path ---")
+    print(actual)
+
+    # 4. Resample
+    print(f"\nBootstrapping {n_paths:,} {method} block paths (mean block {block_size} days)...")
+    start = time.perf_counter()
+    paths = bootstrap.run(np.column_stack([regime_returns, df['60_40_Returns'].to_numpy()]), codes, len(REGIMES),
+                          rf=rf, n_paths=n_paths, block_size=block_size, method=method, seed=seed)
+    elapsed = time.perf_counter() - start
+    print(f"Done in {elapsed:.1f}s ({n_paths / elapsed:,.0f} paths/sec)")
+
+    # 5. Report
+    summary = bootstrap.summarize(paths)
+    print("\n--- Bootstrap Distribution ---")
+    print(summary)
+
+    paths.to_csv(os.path.join(results_dir, 'bootstrap_paths.csv'))
+    summary.to_csv(os.path.join(results_dir, 'bootstrap_summary.csv'))
+    print(f"\nBootstrap paths and summary saved to: {results_dir}")
+
+    # 6. Visualization
+    for path in render.run([
+        render.job(figures.bootstrap_figure, os.path.join(fig_dir, 'bootstrap_distributions.png'),
+                   paths=paths, actual=actual,
+                   title=f'Block Bootstrap: Dynamic vs 60/40 ({n_paths:,} paths)')
+    ]):
+        print(f"Figure saved to: {path}")
+
+    render.show()
@@ -0,0 +1,74 @@
+import pandas as pd
+import time
+import os
+
+from portfolio import figures, render, store, walkforward
+
+# 1. Setup
+base_dir = os.environ.get('DP_BASE_DIR', '/Users/pustak/Desktop/Dynamic Portfolio')
+mod_dir = os.path.join(base_dir, 'modified_data')
+results_dir = os.path.join(base_dir, 'results')
+fig_dir = os.path.join(base_dir, 'figures')
+
+for path in [results_dir, fig_dir]:
+    os.makedirs(path, exist_ok=True)
+
+# 2. Load Data (same inputs as 08_performance_metrics.py)
+print("Loading Master Dataset...")
+df = store.load(mod_dir, 'consolidated_portfolio_rebased',
+                ['Dynamic_Returns', '60_40_Returns', 'Stock_Returns', 'Bond_Returns'])
+rf_df = store.load(mod_dir, 'risk_free_daily')
+df = df.join(rf_df, how='left').ffill().dropna()
+
+strategies = {
+    'Dynamic': 'Dynamic_Returns',
+    '60/40': '60_40_Returns',
+    'Stocks': 'Stock_Returns',
+    'Bonds': 'Bond_Returns'
+}
+returns = df[list(strategies.values())].set_axis(list(strategies), axis=1)
+
+# 3. Every Start Month x Horizon
+# Instead of the single April-1971 start, every month-start with 1/3/5/10-year holding periods
+print("Evaluating every (start month, horizon) window...")
+start = time.perf_counter()
+grid = walkforward.grid(returns, df['Risk_Free_Return'])
+print(f"{len(grid):,} windows in {time.perf_counter() - start:.2f}s")
+
+# 4. Summary Across Start Dates
+summary = grid.groupby(['Horizon', 'Strategy'], sort=False).agg(
+    Windows=('CAGR', 'size'),
+    CAGR_Median=('CAGR', 'median'),
+    CAGR_P05=('CAGR', lambda x: x.quantile(0.05)),
+    CAGR_Worst=('CAGR', 'min'),
+    Sharpe_Median=('Sharpe', 'median'),
+    MaxDD_Median=('Max DD', 'median'),
+    MaxDD_Worst=('Max DD', 'min')
+)
+
+# Share of start dates on which the Dynamic strategy beat the 60/40
+wide = grid.pivot_table(index=['Horizon', 'Start'], columns='Strategy', values=['CAGR', 'Sharpe'])
+hit_rate = pd.DataFrame({
+    'CAGR': (wide['CAGR']['Dynamic'] > wide['CAGR']['60/40']).groupby(level='Horizon').mean(),
+    'Sharpe': (wide['Sharpe']['Dynamic'] > wide['Sharpe']['60/40']).groupby(level='Horizon').mean()
+}).reindex(list(walkforward.HORIZONS))
+
+print("\n--- Walk-Forward Summary ---")
+print(summary)
+print("\n--- Dynamic Beats 60/40 (Share of Start Dates) ---")
+print(hit_rate)
+
+grid.to_csv(os.path.join(results_dir, 'walk_forward_grid.csv'), index=False)
+summary.to_csv(os.path.join(results_dir, 'walk_forward_summary.csv'))
+print(f"\nWalk-forward grid and summary saved to: {results_dir}")
+
+# 5. Visualization: CAGR by Start Date for Each Horizon
+for path in render.run([
+    render.job(figures.walk_forward_figure, os.path.join(fig_dir, 'walk_forward_cagr.png'),
+               cagr={h: wide.loc[h, 'CAGR'] for h in walkforward.HORIZONS},
+               hit_rate=hit_rate['CAGR'].to_dict(),
+               title='Walk-Forward CAGR by Start Month: Dynamic vs 60/40')
+]):
+    print(f"Figure saved to: {path}")
+
+render.show()
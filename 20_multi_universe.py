@@ -0,0 +1,52 @@
+import pandas as pd
+import argparse
+import time
+import os
+
+from portfolio import universe
+
+# 1. Setup
+base_dir = os.environ.get('DP_BASE_DIR', '/Users/pustak/Desktop/Dynamic Portfolio')
+raw_dir = os.path.join(base_dir, 'raw_data')
+markets_dir = os.path.join(base_dir, 'markets')       # one folder of <role>.csv files per extra market
+universe_dir = os.path.join(base_dir, 'universes')    # outputs, one folder per universe
+results_dir = os.path.join(base_dir, 'results')
+
+# The pool's worker processes re-import this file, so the work only runs in the parent
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the regime framework on many markets at once.')
+    parser.add_argument('--synthetic', type=int, default=0, metavar='N', help='add N synthetic markets')
+    parser.add_argument('--workers', type=int, help='process pool size (default: UNIVERSE_WORKERS or CPU count)')
+    args, _ = parser.parse_known_args()
+
+    for path in [universe_dir, results_dir]:
+        os.makedirs(path, exist_ok=True)
+
+    # 2. Universes: the US pipeline inputs, every folder in markets/, synthetic markets
+    universes = [universe.US]
+    if os.path.isdir(markets_dir):
+        universes += [universe.from_dir(os.path.join(markets_dir, name))
+                      for name in sorted(os.listdir(markets_dir)) if os.path.isdir(os.path.join(markets_dir, name))]
+    universes += [universe.synthetic(f'synthetic_{i:03d}', seed=i) for i in range(args.synthetic)]
+    print(f"Running {len(universes)} universe(s): {', '.join(u['name'] for u in universes[:10])}"
+          f"{' ...' if len(universes) > 10 else ''}")
+
+    # 3. Benchmark -> Regimes -> Backtest -> Metrics, one process per universe
+    start = time.perf_counter()
+    summary = universe.run_many(universes, universe_dir, raw_dir, workers=args.workers)
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+
+    # 4. Cross-Universe Summary
+    wide = summary.unstack('Strategy')
+    edge = pd.DataFrame({
+        'CAGR Edge vs 60/40': wide['Return (Ann)']['Dynamic'] - wide['Return (Ann)']['60/40'],
+        'Sharpe Edge vs 60/40': wide['Sharpe']['Dynamic'] - wide['Sharpe']['60/40'],
+        'Max DD Edge vs 60/40': wide['Max DD']['Dynamic'] - wide['Max DD']['60/40']
+    })
+    print("\n--- Dynamic vs 60/40 by Universe ---")
+    print(edge)
+    print(f"\nDynamic beats the 60/40 on CAGR in {(edge['CAGR Edge vs 60/40'] > 0).mean():.0%} "
+          f"and on Sharpe in {(edge['Sharpe Edge vs 60/40'] > 0).mean():.0%} of universes.")
+
+    summary.to_csv(os.path.join(results_dir, 'universe_summary.csv'))
+    print(f"\nPer-universe outputs in {universe_dir}; summary saved to: {results_dir}")
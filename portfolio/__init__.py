@@ -0,0 +1,3 @@
+# Shared engine code for the numbered pipeline stages (01_... to 16_...).
+# Modules here hold the reusable calculations; the stage scripts keep the
+# loading, printing and plotting.
@@ -0,0 +1,212 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from portfolio import vintages
+from portfolio.regimes import REGIMES, encode
+
+# Candidate sleeves and the aligned return column that backs each of them
+SLEEVES = {
+    'Stocks': 'Stock_Returns',
+    'Bonds': 'Bond_Returns',
+    '60/40': '60_40_Returns',
+    'Commodities': 'Commodity_Returns',
+    'Oil': 'Oil_Returns'
+}
+
+# The live regime -> sleeve assignment used by 05_dynamic_backtest.py
+MAPPING = {
+    'Goldilocks': 'Stocks',
+    'Reflation': 'Commodities',
+    'Stagflation': 'Commodities',
+    'Deflation': 'Bonds'
+}
+
+
+def align_inputs(bench, alts, macro, released=None):
+    """Daily frame of every sleeve's returns plus the regime known the day before.
+
+    `macro` is keyed on the observation month. With `released` (03's
+    point-in-time regimes, keyed on release date) a month's regime only
+    applies once it was published.
+    """
+    alts = alts[['Commodities_Price', 'Oil_Price']].pct_change()
+    alts.columns = ['Commodity_Returns', 'Oil_Returns']
+
+    df = pd.DataFrame(index=bench.index)
+    df = df.join(bench[['Stock_Returns', 'Bond_Returns', '60_40_Returns']])
+    df = df.join(alts)
+
+    # Align Regime Signal (Monthly -> Daily): the row in force on each day, one
+    # searchsorted for all days, shifted 1 day to avoid lookahead bias
+    signal = (macro if released is None else released)['Regime']
+    rows = vintages.asof(signal.index.values, df.index.values)
+    df['Regime'] = signal.iloc[np.maximum(rows, 0)].where(rows >= 0).set_axis(df.index).shift(1)
+    return df
+
+
+def weight_matrix(mapping, sleeves):
+    """(regimes x sleeves) target weights from a regime -> allocation mapping.
+
+    An allocation is a sleeve name (100% in it) or a dict of sleeve weights,
+    e.g. {'Commodities': 0.7, 'Bonds': 0.3}. Weights summing to less than 1
+    leave the rest in cash; regimes missing from the mapping are all cash.
+    """
+    weights = np.zeros((len(REGIMES), len(sleeves)))
+    for r, regime in enumerate(REGIMES):
+        alloc = mapping.get(regime, {})
+        alloc = {alloc: 1.0} if isinstance(alloc, str) else alloc
+        for sleeve, w in alloc.items():
+            weights[r, sleeves.index(sleeve)] = w
+    return weights
+
+
+def one_hot(codes, n_regimes=len(REGIMES)):
+    # (days x regimes) indicator matrix; unknown regimes (code -1) get an all-zero row
+    return np.eye(n_regimes + 1)[np.asarray(codes)][:, :n_regimes]
+
+
+def exposure(regime, mapping=MAPPING, sleeves=list(SLEEVES)):
+    # (days x sleeves) target weights held on each day of a daily regime label series
+    return one_hot(encode(regime)) @ weight_matrix(mapping, sleeves)
+
+
+def _holdings(returns, exposure):
+    """Start- and end-of-day holdings (sleeves + cash) per unit invested at the last rebalance.
+
+    Weights are set to target whenever the exposure changes and drift with
+    the sleeves' returns in between.
+    """
+    growth = np.cumprod(1 + returns, axis=0)
+    prev = np.vstack([np.ones((1, returns.shape[1])), growth[:-1]])
+
+    change = np.r_[True, np.any(exposure[1:] != exposure[:-1], axis=1)]
+    spell_start = np.maximum.accumulate(np.where(change, np.arange(len(exposure)), 0))
+    base = prev[spell_start]
+
+    cash = 1 - exposure.sum(axis=1, keepdims=True)
+    return np.hstack([exposure * prev / base, cash]), np.hstack([exposure * growth / base, cash])
+
+
+def _drifted(returns, exposure):
+    start, end = _holdings(returns, exposure)
+    return end.sum(axis=1) / start.sum(axis=1) - 1
+
+
+def turnover(exposure, returns=None):
+    """One-way turnover traded on each day: half the L1 change of the weights, cash included.
+
+    A full switch from one sleeve to another counts 1. Only days on which the
+    target exposure changes trade. Without `returns` the weights going in are
+    the previous day's target (daily rebalanced). With `returns` (drift mode)
+    they are that target drifted since the last change.
+    """
+    exposure = np.asarray(exposure, dtype=float)
+    target = np.hstack([exposure, 1 - exposure.sum(axis=1, keepdims=True)])
+    before = target[:-1]
+    if returns is not None:
+        _, end = _holdings(np.nan_to_num(np.asarray(returns, dtype=float)), exposure)
+        before = end[:-1] / end[:-1].sum(axis=1, keepdims=True)
+
+    traded = np.zeros(len(exposure))
+    traded[1:] = 0.5 * np.abs(target[1:] - before).sum(axis=1)
+    traded[1:][np.all(exposure[1:] == exposure[:-1], axis=1)] = 0.0
+    return traded
+
+
+def net_of_costs(returns, traded, costs):
+    """(days x cost levels) returns after paying cost * turnover at the open of each trading day.
+
+    `costs` are fractions of the traded amount (0.001 = 10 bps), one column each.
+    """
+    costs = np.atleast_1d(np.asarray(costs, dtype=float))
+    return (1 + np.asarray(returns, dtype=float))[:, None] * (1 - np.outer(traded, costs)) - 1
+
+
+def allocate(returns, probs, weights, drift=False):
+    """Daily returns of regime-based allocations over N sleeves.
+
+    `returns` is (days x sleeves), `probs` a (days x regimes) one-hot or
+    regime-probability matrix, and `weights` a (regimes x sleeves) matrix or a
+    (strategies x regimes x sleeves) stack of them. Each day's return is the
+    row-wise product probs @ weights * returns, done for the whole stack as
+    a single matmul; the result is (days,) or (days x strategies).
+    With drift=True the weights are set on regime changes and then drift
+    with the sleeves' returns instead of being rebalanced daily.
+
+    A missing return in a sleeve that is held makes the day missing. A
+    missing return in a sleeve that is not held is ignored, like np.select.
+    """
+    returns = np.asarray(returns, dtype=float)
+    probs = np.asarray(probs, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    stack = weights[None] if weights.ndim == 2 else weights
+
+    def product(x, w):
+        # Row-wise outer product of probs and x, (days x regimes*sleeves), times every flattened weight matrix
+        rows = (probs[:, :, None] * x[:, None, :]).reshape(len(x), -1)
+        return rows @ w.reshape(len(w), -1).T
+
+    missing = np.isnan(returns)
+    filled = np.where(missing, 0.0, returns)
+
+    if drift:
+        out = np.column_stack([_drifted(filled, probs @ w) for w in stack])
+    else:
+        out = product(filled, stack)
+
+    if missing.any():
+        # Days on which a strategy holds a sleeve with no return
+        out[product(missing.astype(float), np.abs(stack)) > 0] = np.nan
+
+    return out[:, 0] if weights.ndim == 2 else out
+
+
+def summary_stats(returns, rf, periods):
+    # Row-wise CAGR / Vol / Sharpe / Max DD for a (strategies x days) matrix
+    equity = np.cumprod(1 + returns, axis=1)
+    years = returns.shape[1] / periods
+
+    cagr = equity[:, -1] ** (1 / years) - 1
+    vol = returns.std(axis=1, ddof=1) * np.sqrt(periods)
+
+    excess = returns - rf
+    sharpe = (excess.mean(axis=1) * periods) / (excess.std(axis=1, ddof=1) * np.sqrt(periods) + 1e-9)
+
+    max_dd = (equity / np.maximum.accumulate(equity, axis=1) - 1).min(axis=1)
+    return np.column_stack([cagr, vol, sharpe, max_dd])
+
+
+def sweep_mappings(returns, codes, names, rf=None, periods=252, chunk_size=256):
+    """Evaluate every regime -> sleeve assignment (N ** 4 strategies) at once.
+
+    `returns` is a (days x sleeves) matrix without gaps, `codes` the lagged
+    regime code per day (-1 = unknown, held in cash like the np.select default
+    in 05). Returns a table ranked by Sharpe.
+    """
+    returns = np.asarray(returns, dtype=float)
+    codes = np.asarray(codes)
+    n_days, n_sleeves = returns.shape
+    rf = np.zeros(n_days) if rf is None else np.asarray(rf, dtype=float)
+
+    # Every assignment as a row of sleeve indices, one column per regime.
+    # A trailing cash column is addressed by code -1 on unknown-regime days.
+    mappings = np.array(list(itertools.product(range(n_sleeves), repeat=len(REGIMES))))
+    lookup = np.column_stack([mappings, np.full(len(mappings), n_sleeves)])
+    padded = np.column_stack([returns, np.zeros(n_days)])
+
+    days = np.arange(n_days)
+    stats = []
+    for i in range(0, len(mappings), chunk_size):
+        # Batched gather: (strategies x days) matrix of the held sleeve's return
+        held = lookup[i:i + chunk_size][:, codes]
+        stats.append(summary_stats(padded[days, held], rf, periods))
+
+    table = pd.DataFrame(np.array(names)[mappings], columns=REGIMES)
+    table[['CAGR', 'Volatility', 'Sharpe', 'Max DD']] = np.vstack(stats)
+
+    table = table.sort_values('Sharpe', ascending=False, kind='stable').reset_index(drop=True)
+    table.index = table.index + 1
+    table.index.name = 'Rank'
+    return table
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+# Constant-maturity par bond returns from the FRED CMT yields.
+# Each day the bond bought at par on the previous day (coupon = previous
+# yield) is repriced in closed form at today's yield, with its maturity one
+# day shorter, plus the coupon accrued over the day. Duration and convexity
+# then move with the yield level instead of being fixed, which matters most
+# in the high-yield 1970s-80s. Every day and every maturity is one array
+# expression: (days x maturities).
+MATURITIES = {'2Y': 2, '5Y': 5, '10Y': 10, '30Y': 30}
+SERIES = {'2Y': 'DGS2', '5Y': 'DGS5', '10Y': 'DGS10', '30Y': 'DGS30'}
+BENCHMARK = '10Y'   # the Bond sleeve of 01 / 17
+
+FREQ = 2            # semi-annual coupons
+PERIODS = 252       # one FRED row = 1/252 year, as the income accrual of the old model
+LINEAR_DURATION = 7.0
+
+
+def _discount(yld, maturity, freq=FREQ):
+    return (1 + yld / freq) ** (-maturity * freq)
+
+
+def price(coupon, yld, maturity, freq=FREQ):
+    """Price per 1 of face of a bond paying `coupon` a year, at yield `yld`.
+
+    Annuity closed form; a fractional maturity is a fractional number of coupon periods.
+    """
+    v = _discount(yld, maturity, freq)
+    flat = np.isclose(yld, 0)
+    annuity = np.where(flat, maturity, (1 - v) / np.where(flat, 1, yld))
+    return coupon * annuity + v
+
+
+def sensitivities(yld, maturity, freq=FREQ):
+    """Modified duration and convexity of a par bond at yield `yld` (closed form).
+
+    At a zero yield they are the limits maturity and maturity * (maturity + 1/freq).
+    """
+    yld = np.asarray(yld, dtype=float)
+    maturity = np.asarray(maturity, dtype=float)
+    v = _discount(yld, maturity, freq)
+    dv = -maturity * v / (1 + yld / freq)
+
+    # Derivatives of c/y * (1 - v) + v, evaluated at par (c = y, price 1)
+    flat = np.isclose(yld, 0)
+    y = np.where(flat, 1, yld)
+    duration = np.where(flat, maturity, (1 - v) / y)
+    convexity = np.where(flat, maturity * (maturity + 1 / freq), 2 * (1 - v) / y ** 2 + 2 * dv / y)
+    return duration, convexity
+
+
+def holding_return(prev_yield, yld, maturity, dt=1 / PERIODS, freq=FREQ):
+    # Return over dt of a par bond bought at prev_yield, repriced at yld
+    return price(prev_yield, yld, maturity - dt, freq) - 1 + prev_yield * dt
+
+
+def par_returns(yields, maturities=None, dt=1 / PERIODS):
+    """Daily total returns of constant-maturity par bonds.
+
+    `yields` is a DataFrame of CMT yields in percent, one column per maturity
+    (named as in MATURITIES unless `maturities` gives the years). A missing
+    yield makes that day and the next one missing, like the diff() it replaces.
+    """
+    years = np.asarray(maturities or [MATURITIES[col] for col in yields.columns], dtype=float)
+    y = yields.to_numpy(dtype=float) / 100
+    prev = np.vstack([np.full((1, y.shape[1]), np.nan), y[:-1]])
+    return pd.DataFrame(holding_return(prev, y, years, dt), index=yields.index, columns=yields.columns)
+
+
+def linear_returns(yields, duration=LINEAR_DURATION):
+    # The old constant-duration approximation (income - duration x yield change), for comparison
+    y = yields / 100
+    return y / PERIODS - duration * y.diff()
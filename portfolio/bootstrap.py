@@ -0,0 +1,102 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from portfolio.backtest import summary_stats
+
+# Block-bootstrap robustness engine.
+# Resamples whole days (sleeve returns, regime signal and risk-free rate
+# together) in blocks, so the regime -> return link and short-range
+# autocorrelation survive, then evaluates the strategy and the 60/40 on every
+# path as one (paths x days) array per chunk. Chunks are spread over a process
+# pool; each chunk draws from its own child of one SeedSequence, so the output
+# depends only on the seed, not on the number of workers.
+METHODS = ['stationary', 'circular']
+STATS = ['CAGR', 'Volatility', 'Sharpe', 'Max DD']
+
+# Per-worker copy of the inputs (sent once through the pool initializer)
+_inputs = {}
+
+
+def block_indices(rng, n_paths, n_days, block_size, method='stationary'):
+    """(paths x days) row indices into the original sample.
+
+    'stationary': block lengths are geometric with mean `block_size`
+    (Politis-Romano); 'circular': fixed-length blocks. Blocks wrap around the
+    end of the sample.
+    """
+    t = np.arange(n_days)
+    if method == 'stationary':
+        new_block = rng.random((n_paths, n_days)) < 1.0 / block_size
+        new_block[:, 0] = True
+    elif method == 'circular':
+        new_block = np.broadcast_to(t % block_size == 0, (n_paths, n_days))
+    else:
+        raise ValueError(f"method must be one of {METHODS}")
+
+    # Day on which the current block began, and where in the sample it starts
+    block_start = np.maximum.accumulate(np.where(new_block, t, 0), axis=1)
+    origin = rng.integers(0, n_days, size=(n_paths, n_days))
+    origin = np.take_along_axis(origin, block_start, axis=1)
+    return (origin + t - block_start) % n_days
+
+
+def _init_worker(sleeves, held, bench_col, rf, periods):
+    _inputs.update(sleeves=sleeves, held=held, bench_col=bench_col, rf=rf, periods=periods)
+
+
+def _run_chunk(seed, n_paths, block_size, method):
+    sleeves, held, rf = _inputs['sleeves'], _inputs['held'], _inputs['rf']
+    rng = np.random.default_rng(seed)
+    idx = block_indices(rng, n_paths, len(held), block_size, method)
+
+    # Strategy: the sleeve held under each resampled day's regime (cash column for unknown)
+    dynamic = sleeves[idx, held[idx]]
+    benchmark = sleeves[idx, _inputs['bench_col']]
+    rf_paths = rf[idx]
+
+    return np.hstack([summary_stats(dynamic, rf_paths, _inputs['periods']),
+                      summary_stats(benchmark, rf_paths, _inputs['periods'])])
+
+
+def run(sleeves, held, bench_col, rf=None, n_paths=10000, block_size=63, method='stationary',
+        seed=0, workers=None, chunk_size=250, periods=252):
+    """Bootstrap distribution of the strategy vs the benchmark sleeve.
+
+    `sleeves` is a (days x columns) returns matrix, `held` the column the
+    strategy holds each day (-1 = cash) and `bench_col` the benchmark's column.
+    18 passes the return of every regime's allocation (sleeve returns @
+    weights.T) plus the 60/40, with the regime code as `held`.
+    Returns one row per path: CAGR / Volatility / Sharpe / Max DD of the
+    Dynamic strategy and the 60/40, plus the Dynamic-minus-60/40 spreads.
+    """
+    sleeves = np.asarray(sleeves, dtype=float)
+    n_days = len(sleeves)
+    padded = np.column_stack([sleeves, np.zeros(n_days)])
+    held = np.where(np.asarray(held) < 0, sleeves.shape[1], held).astype(np.intp)
+    rf = np.zeros(n_days) if rf is None else np.asarray(rf, dtype=float)
+
+    sizes = [min(chunk_size, n_paths - i) for i in range(0, n_paths, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), initializer=_init_worker,
+                             initargs=(padded, held, bench_col, rf, periods)) as pool:
+        parts = list(pool.map(_run_chunk, seeds, sizes, [block_size] * len(sizes), [method] * len(sizes)))
+
+    columns = [f'Dynamic_{s}' for s in STATS] + [f'60_40_{s}' for s in STATS]
+    paths = pd.DataFrame(np.vstack(parts), columns=columns)
+    paths.index.name = 'Path'
+    for s in STATS:
+        paths[f'Spread_{s}'] = paths[f'Dynamic_{s}'] - paths[f'60_40_{s}']
+    return paths
+
+
+def summarize(paths, levels=(0.05, 0.25, 0.5, 0.75, 0.95)):
+    # Mean, percentiles and share of paths above zero for every column
+    table = paths.quantile(list(levels)).T
+    table.columns = [f'P{int(q * 100):02d}' for q in levels]
+    table.insert(0, 'Mean', paths.mean())
+    table['P(>0)'] = (paths > 0).mean()
+    return table
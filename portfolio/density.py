@@ -0,0 +1,60 @@
+import hashlib
+
+import numpy as np
+
+# Binned kernel density estimation.
+# Each series is linearly binned onto a fixed grid once (O(n)). The Gaussian
+# kernel is then applied by FFT convolution, which costs O(g log g) instead of
+# summing every observation at every grid point (O(n*g)). The bandwidth and
+# support match seaborn's kdeplot defaults: Scott's rule, and a grid that
+# reaches `cut` bandwidths past the data.
+GRIDSIZE = 2000
+CUT = 3
+
+# Per-series grids, keyed on the content of the values and the settings
+_cache = {}
+
+
+def scott_bandwidth(values, bw_adjust=1.0):
+    # scipy.stats.gaussian_kde's 'scott' factor times the sample std (ddof=1), as seaborn uses
+    n = len(values)
+    return values.std(ddof=1) * n ** (-1 / 5) * bw_adjust
+
+
+def _linear_bin(values, lo, dx, gridsize):
+    # Each observation split between its two neighbouring grid points
+    pos = (values - lo) / dx
+    left = np.clip(np.floor(pos).astype(int), 0, gridsize - 2)
+    frac = pos - left
+    counts = np.bincount(left, weights=1 - frac, minlength=gridsize)
+    counts += np.bincount(left + 1, weights=frac, minlength=gridsize)
+    return counts
+
+
+def kde(values, gridsize=GRIDSIZE, cut=CUT, bw_adjust=1.0):
+    """Gaussian KDE of `values` on an evenly spaced grid; returns (grid, density).
+
+    NaNs are dropped. Repeated calls with the same data come from the cache.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    h = hashlib.sha1(np.ascontiguousarray(values).tobytes())
+    h.update(f'{gridsize}:{cut}:{bw_adjust}'.encode())
+    k = h.hexdigest()
+    if k in _cache:
+        return _cache[k]
+
+    bw = scott_bandwidth(values, bw_adjust)
+    grid = np.linspace(values.min() - cut * bw, values.max() + cut * bw, gridsize)
+    dx = grid[1] - grid[0]
+    counts = _linear_bin(values, grid[0], dx, gridsize)
+
+    # Kernel on every grid offset; zero-padding to >= 2g - 1 makes the circular FFT product a linear convolution
+    offsets = np.arange(-(gridsize - 1), gridsize) * dx
+    kernel = np.exp(-0.5 * (offsets / bw) ** 2) / (bw * np.sqrt(2 * np.pi))
+    size = 1 << int(np.ceil(np.log2(3 * gridsize - 2)))
+    conv = np.fft.irfft(np.fft.rfft(counts, size) * np.fft.rfft(kernel, size), size)
+    density = np.maximum(conv[gridsize - 1:2 * gridsize - 1], 0) / len(values)
+
+    _cache[k] = (grid, density)
+    return grid, density
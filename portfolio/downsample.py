@@ -0,0 +1,59 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Shape-preserving downsampling of long daily series before plotting.
+# A 15in figure at 300 dpi is ~4,500 pixels wide, while each line carries
+# ~13,500 daily points. The rows are split into buckets a few pixels wide,
+# and every bucket keeps only its first, last, min and max point for each
+# column (M4). Troughs, spikes and the line's vertical extent in every
+# bucket stay exact. Boolean columns, such as `where=` masks for
+# fill_between, keep every row where they flip. All columns share one
+# set of rows, so the frame stays aligned.
+#
+# Off by default, so paper-grade output uses the full data. Turn it on with
+# `--downsample` on the command line or PLOT_DOWNSAMPLE=1.
+ENABLED = '--downsample' in sys.argv or os.environ.get('PLOT_DOWNSAMPLE') == '1'
+BUCKET_PX = 4   # ~ a 1pt line at 300 dpi
+
+
+def indices(values, n_buckets):
+    """Row positions to keep from one series: first/last/min/max per bucket.
+
+    NaNs are ignored for min/max; the bucket edges still keep the gaps they
+    open in the line. A boolean series keeps every row on either side of a flip.
+    """
+    values = np.asarray(values)
+    n = len(values)
+    if n <= 4 * n_buckets:
+        return np.arange(n)
+
+    bucket = np.arange(n) * n_buckets // n
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    keep = [starts, np.r_[starts[1:] - 1, n - 1]]
+
+    if values.dtype == bool:
+        flips = np.flatnonzero(values[1:] != values[:-1])
+        return np.unique(np.concatenate(keep + [flips, flips + 1]))
+
+    values = values.astype(float)
+    finite = ~np.isnan(values)
+    for pick, fill in ((np.fmin, np.inf), (np.fmax, -np.inf)):
+        ext = pick.reduceat(np.where(finite, values, fill), starts)
+        hit = np.flatnonzero(finite & (values == ext[bucket]))
+        # First hit in each bucket
+        keep.append(hit[np.r_[True, bucket[hit][1:] != bucket[hit][:-1]]])
+
+    return np.unique(np.concatenate(keep))
+
+
+def frame(df, inches, dpi=300):
+    """Rows of `df` needed to draw it `inches` wide at `dpi` (all rows when disabled)."""
+    if not ENABLED:
+        return df
+    n_buckets = max(int(inches * dpi) // BUCKET_PX, 1)
+    cols = [df[c].to_numpy() for c in df.columns] if isinstance(df, pd.DataFrame) else [df.to_numpy()]
+    keep = np.unique(np.concatenate([indices(c, n_buckets) for c in cols]))
+    return df.iloc[keep]
@@ -0,0 +1,123 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# Drawdown-episode engine.
+# An episode starts on the first day under water and ends on the day the
+# previous peak is regained (or on the last day if it is still open). Episodes
+# of every column are labelled in one run-length encoding pass and reduced with
+# np.minimum.reduceat instead of looping over them one by one.
+STAT_COLUMNS = ['avg_dd', 'med_dd', 'max_dd', 'avg_rec', 'med_rec', 'avg_dur', 'med_dur', 'count']
+
+# Per-series results, keyed on the content of the drawdown series
+_cache = {}
+
+
+def underwater(equity):
+    # Drawdown from the running peak (0 at new highs)
+    return equity / equity.cummax() - 1
+
+
+def episodes(dd):
+    """Every drawdown episode of every column of `dd` (days x series).
+
+    Returns one row per episode: series, start, trough, end, depth (trough
+    value), duration (start -> end, calendar days), recovery (trough -> end)
+    and whether the episode is still open.
+    """
+    dd = dd.to_frame() if isinstance(dd, pd.Series) else dd
+    values = dd.to_numpy(dtype=float)
+    n_days, n_series = values.shape
+    dates = dd.index.values
+
+    # Column-major with a row above water before and after each column, so runs
+    # never cross from one series into the next and every run has a boundary
+    stride = n_days + 2
+    flat = np.zeros((n_series, stride))
+    flat[:, 1:-1] = values.T
+    flat = np.nan_to_num(flat.ravel())
+
+    edges = np.flatnonzero(np.diff((flat < 0).astype(np.int8)))
+    starts, stops = edges[0::2] + 1, edges[1::2] + 1
+
+    series = starts // stride
+    start_row = starts % stride - 1
+    open_ = stops % stride - 1 == n_days
+    # The episode includes its end day: the recovery day, or the last day if open
+    ends = np.where(open_, stops - 1, stops)
+    end_row = ends % stride - 1
+
+    # Segment reductions over [start, end]: depth, then the first day it is reached
+    bounds = np.column_stack([starts, ends + 1]).ravel()
+    depth = np.minimum.reduceat(flat, bounds)[0::2] if len(starts) else np.array([])
+
+    lengths = ends + 1 - starts
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    positions = np.arange(lengths.sum()) - np.repeat(offsets - starts, lengths)
+    at_trough = flat[positions] == np.repeat(depth, lengths)
+    first = np.where(at_trough, positions, len(flat))
+    trough = np.minimum.reduceat(first, offsets) if len(starts) else np.array([], dtype=int)
+    trough_row = trough % stride - 1
+
+    day = np.timedelta64(1, 'D')
+    return pd.DataFrame({
+        'series': np.asarray(dd.columns)[series],
+        'start': dates[start_row],
+        'trough': dates[trough_row],
+        'end': dates[end_row],
+        'depth': depth,
+        'duration': (dates[end_row] - dates[start_row]) // day,
+        'recovery': (dates[end_row] - dates[trough_row]) // day,
+        'open': open_
+    })
+
+
+def summarize(table, names):
+    # Episode statistics per series (the text boxes in 10_drawdown_analysis.py)
+    grouped = table.groupby('series', sort=False)
+    stats = pd.DataFrame({
+        'avg_dd': grouped['depth'].mean(),
+        'med_dd': grouped['depth'].median(),
+        'max_dd': grouped['depth'].min(),
+        'avg_rec': grouped['recovery'].mean(),
+        'med_rec': grouped['recovery'].median(),
+        'avg_dur': grouped['duration'].mean(),
+        'med_dur': grouped['duration'].median(),
+        'count': grouped.size()
+    })
+    return stats.reindex(names)[STAT_COLUMNS]
+
+
+def _key(series):
+    h = hashlib.sha1(np.ascontiguousarray(series.to_numpy(dtype=float)).tobytes())
+    h.update(np.ascontiguousarray(series.index.values).tobytes())
+    return h.hexdigest()
+
+
+def stats_frame(dd):
+    """Episode statistics for every column of `dd`, one row per column.
+
+    Columns already seen (same values and dates) come from the cache; the rest
+    are computed together in a single pass.
+    """
+    keys = {col: _key(dd[col]) for col in dd.columns}
+    todo = [col for col in dd.columns if keys[col] not in _cache]
+
+    if todo:
+        fresh = summarize(episodes(dd[todo]), todo)
+        for col in todo:
+            _cache[keys[col]] = fresh.loc[col]
+
+    rows = [_cache[keys[col]] for col in dd.columns]
+    return pd.DataFrame(rows, index=dd.columns, columns=STAT_COLUMNS)
+
+
+def stats(series):
+    # Statistics of one series as a dict, None if it never goes under water
+    row = stats_frame(series.to_frame()).iloc[0]
+    if pd.isna(row['count']):
+        return None
+    stats = row.to_dict()
+    stats['count'] = int(stats['count'])
+    return stats
@@ -0,0 +1,214 @@
+import os
+import time
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+# Shared download layer for the WRDS / FRED series.
+# The raw_data/ CSVs double as the on-disk series store: a refresh only asks
+# the provider for observations after the last stored date and merges them in.
+FRED_API_KEY = os.environ.get('FRED_API_KEY', '23dd8644a8456a82f3dc0e07c51e2a9b')
+START_DATE = '1970-01-01'
+
+# series id -> where it comes from and where it is stored (file, column name,
+# and for the revised macro series the file of its ALFRED release history).
+# An optional series (the 2/5/30-year yields of the maturity curve) is skipped
+# when it cannot be found or fetched, e.g. offline without a local copy.
+SERIES = {
+    'sprtrn':   {'source': 'wrds', 'file': 'crsp_stocks_raw.csv',      'column': 'Stock_Returns'},
+    'DGS10':    {'source': 'fred', 'file': 'fred_bonds_raw.csv',       'column': 'DGS10'},
+    'DGS2':     {'source': 'fred', 'file': 'fred_bonds_2y_raw.csv',    'column': 'DGS2', 'optional': True},
+    'DGS5':     {'source': 'fred', 'file': 'fred_bonds_5y_raw.csv',    'column': 'DGS5', 'optional': True},
+    'DGS30':    {'source': 'fred', 'file': 'fred_bonds_30y_raw.csv',   'column': 'DGS30', 'optional': True},
+    'CPIAUCSL': {'source': 'fred', 'file': 'fred_cpi_raw.csv',         'column': 'CPI',
+                 'vintages': 'alfred_cpi_vintages.csv'},
+    'INDPRO':   {'source': 'fred', 'file': 'fred_indpro_raw.csv',      'column': 'INDPRO',
+                 'vintages': 'alfred_indpro_vintages.csv'},
+    'PPIACO':   {'source': 'fred', 'file': 'fred_commodities_raw.csv', 'column': 'Commodities_Price'},
+    'WTISPLC':  {'source': 'fred', 'file': 'fred_oil_raw.csv',         'column': 'Oil_Price'},
+    'DTB3':     {'source': 'fred', 'file': 'fred_rf_raw.csv',          'column': 'DTB3'},
+}
+
+
+# ==========================================
+# Providers
+# ==========================================
+class FredProvider:
+    def __init__(self, api_key=FRED_API_KEY):
+        self.api_key = api_key
+        self._fred = None
+
+    def _client(self):
+        if self._fred is None:
+            from fredapi import Fred
+            self._fred = Fred(api_key=self.api_key)
+        return self._fred
+
+    def get(self, series_id, start):
+        return self._client().get_series(series_id, observation_start=start)
+
+    def vintages(self, series_id):
+        # Every print of every observation (ALFRED): date, release, value
+        rows = self._client().get_series_all_releases(series_id)
+        return rows.rename(columns={'realtime_start': 'release'})
+
+
+class WrdsProvider:
+    def __init__(self):
+        self._db = None
+
+    def get(self, series_id, start):
+        # CRSP daily index file (crsp.dsi); the connection is opened on first use
+        if self._db is None:
+            import wrds
+            self._db = wrds.Connection()
+        rows = self._db.raw_sql(f"SELECT date, {series_id} FROM crsp.dsi WHERE date >= '{start.date()}'")
+        rows['date'] = pd.to_datetime(rows['date'])
+        return rows.set_index('date')[series_id]
+
+
+class LiveProvider:
+    # Routes each series to WRDS or FRED
+    def __init__(self):
+        self.sources = {'fred': FredProvider(), 'wrds': WrdsProvider()}
+
+    def get(self, series_id, start):
+        return self.sources[SERIES[series_id]['source']].get(series_id, start)
+
+    def vintages(self, series_id):
+        return self.sources['fred'].vintages(series_id)
+
+
+class LocalProvider:
+    # File-backed stand-in: serves series from a folder laid out like raw_data/
+    # so the pipeline can run offline
+    def __init__(self, source_dir):
+        self.source_dir = source_dir
+
+    def get(self, series_id, start):
+        series = _read_stored(self.source_dir, series_id)
+        if series is None:
+            raise FileNotFoundError(f"No local copy of {series_id} in {self.source_dir}")
+        return series[series.index >= start]
+
+    def vintages(self, series_id):
+        path = os.path.join(self.source_dir, SERIES[series_id]['vintages'])
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No local release history of {series_id} in {self.source_dir}")
+        return pd.read_csv(path)
+
+
+def default_provider(raw_dir):
+    # DATA_PROVIDER=local serves data from DATA_SOURCE_DIR (default: raw_dir itself)
+    if os.environ.get('DATA_PROVIDER', 'live') == 'local':
+        return LocalProvider(os.environ.get('DATA_SOURCE_DIR', raw_dir))
+    return LiveProvider()
+
+
+# ==========================================
+# Series Store
+# ==========================================
+def _read_stored(raw_dir, series_id):
+    spec = SERIES[series_id]
+    path = os.path.join(raw_dir, spec['file'])
+    if not os.path.exists(path):
+        return None
+    stored = pd.read_csv(path, index_col='date', parse_dates=True)
+    return stored[spec['column']].rename(series_id)
+
+
+def _write_stored(raw_dir, series_id, series):
+    spec = SERIES[series_id]
+    df = series.to_frame(name=spec['column'])
+    df.index.name = 'date'
+    df.to_csv(os.path.join(raw_dir, spec['file']))
+
+
+def _transient(e):
+    # Worth retrying: dropped / timed-out connections and server-side (5xx) HTTP errors.
+    # A missing local file or a bad request (4xx, ValueError) fails at once.
+    status = getattr(e, 'code', None)
+    if status is None:
+        status = getattr(getattr(e, 'response', None), 'status_code', None)
+    if isinstance(status, int):
+        return status >= 500
+    if isinstance(e, (FileNotFoundError, ValueError)):
+        return False
+    return (isinstance(e, (ConnectionError, TimeoutError, urllib.error.URLError))
+            or type(e).__name__ == 'OperationalError')   # WRDS (postgres) connection lost
+
+
+def _with_retry(func, retries, backoff):
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == retries or not _transient(e):
+                raise
+            wait = backoff * 2 ** attempt
+            print(f"  retrying after error ({e}); waiting {wait:.0f}s...")
+            time.sleep(wait)
+
+
+def _refresh_one(series_id, raw_dir, provider, retries, backoff):
+    stored = _read_stored(raw_dir, series_id)
+
+    # Only ask for observations after the last stored date
+    if stored is None or stored.empty:
+        start = pd.Timestamp(START_DATE)
+    else:
+        start = stored.index[-1] + pd.Timedelta(days=1)
+
+    new = _with_retry(lambda: provider.get(series_id, start), retries, backoff)
+    new = pd.Series(new, dtype=float).rename(series_id)
+    new.index = pd.to_datetime(new.index)
+    new.index.name = 'date'
+
+    if stored is None:
+        merged = new.sort_index()
+    else:
+        merged = pd.concat([stored, new])
+        merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+
+    if stored is None or len(merged) != len(stored):
+        _write_stored(raw_dir, series_id, merged)
+    return merged, len(new), start
+
+
+def refresh(series_ids, raw_dir, provider=None, workers=None, retries=3, backoff=2.0):
+    """Bring the stored series up to date, fetching them concurrently.
+
+    Returns {series_id: full merged series}. An optional series that cannot
+    be fetched keeps its stored copy, or is left out if there is none.
+    """
+    os.makedirs(raw_dir, exist_ok=True)
+    provider = provider or default_provider(raw_dir)
+
+    with ThreadPoolExecutor(max_workers=workers or len(series_ids)) as pool:
+        futures = {sid: pool.submit(_refresh_one, sid, raw_dir, provider, retries, backoff)
+                   for sid in series_ids}
+
+        data = {}
+        for sid, future in futures.items():
+            try:
+                data[sid], n_new, start = future.result()
+            except (OSError, ValueError) as e:
+                if not SERIES[sid].get('optional'):
+                    raise
+                stored = _read_stored(raw_dir, sid)
+                if stored is not None:
+                    data[sid] = stored
+                print(f"  {sid}: skipped ({e}), {0 if stored is None else len(stored)} stored")
+                continue
+            print(f"  {sid}: {n_new} new observation(s) since {start.date()}, {len(data[sid])} stored")
+        return data
+
+
+def load(series_ids, raw_dir, provider=None):
+    # Stored series as-is; anything never downloaded is fetched first (optional ones may be missing)
+    data = {sid: _read_stored(raw_dir, sid) for sid in series_ids}
+    missing = [sid for sid, s in data.items() if s is None]
+    if missing:
+        data.update(refresh(missing, raw_dir, provider))
+    return {sid: s for sid, s in data.items() if s is not None}
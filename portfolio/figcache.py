@@ -0,0 +1,131 @@
+import hashlib
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# Rendered-figure cache.
+# A figure's key is a hash of the exact arrays it plots, its plot parameters
+# (everything passed to the builder: figsize, labels, date range, highlight
+# spans...), the dpi and the code version (figures.py source, builder name,
+# matplotlib version). On a hit the stored PNG is copied into place instead of
+# rasterizing again. The cache is bounded in size: least recently used PNGs go first.
+CACHE_DIR = os.environ.get('FIGCACHE_DIR')
+MAX_BYTES = int(float(os.environ.get('FIGCACHE_MAX_MB', 512)) * 2 ** 20)
+ENABLED = os.environ.get('FIGCACHE', '1') != '0'
+
+_code_versions = {}
+
+
+def cache_dir(path):
+    # Default: <base_dir>/.figcache next to the figures/ folder
+    return CACHE_DIR or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(path))), '.figcache')
+
+
+def _update(h, obj):
+    # Feed an object's exact content into the hash, recursively
+    if isinstance(obj, pd.DataFrame):
+        h.update(b'DataFrame')
+        _update(h, list(obj.columns))
+        _update(h, obj.index)
+        for col in obj.columns:
+            _update(h, obj[col].to_numpy())
+    elif isinstance(obj, pd.Series):
+        h.update(b'Series')
+        _update(h, obj.name)
+        _update(h, obj.index)
+        _update(h, obj.to_numpy())
+    elif isinstance(obj, pd.Index):
+        h.update(b'Index')
+        _update(h, obj.to_numpy())
+    elif isinstance(obj, np.ndarray):
+        h.update(f'ndarray{obj.dtype.str}{obj.shape}'.encode())
+        if obj.dtype == object:
+            _update(h, obj.tolist())
+        else:
+            h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update(b'dict')
+        for k in sorted(obj, key=repr):
+            _update(h, k)
+            _update(h, obj[k])
+    elif isinstance(obj, (list, tuple)):
+        h.update(type(obj).__name__.encode() + str(len(obj)).encode())
+        for item in obj:
+            _update(h, item)
+    else:
+        h.update(repr(obj).encode())
+
+
+def _code_version(builder):
+    import matplotlib   # imported by the time anything is drawn
+
+    module = builder.__module__
+    if module not in _code_versions:
+        path = getattr(__import__(module, fromlist=['_']), '__file__', None)
+        with open(path, 'rb') as f:
+            _code_versions[module] = hashlib.sha256(f.read()).hexdigest()
+    return f'{module}.{builder.__qualname__}:{_code_versions[module]}:mpl{matplotlib.__version__}'
+
+
+def key(builder, data, dpi):
+    h = hashlib.sha256()
+    h.update(_code_version(builder).encode())
+    h.update(f'dpi={dpi}'.encode())
+    _update(h, data)
+    return h.hexdigest()
+
+
+def fetch(k, path):
+    """Copy the cached PNG for key `k` to `path`; False on a miss.
+
+    Stages running in parallel share the cache, so the entry can be evicted
+    by another process at any point: that is a miss too.
+    """
+    cached = os.path.join(cache_dir(path), f'{k}.png')
+    if not ENABLED:
+        return False
+    try:
+        shutil.copyfile(cached, path)
+    except OSError:
+        return False
+    try:
+        os.utime(cached)  # most recently used
+    except OSError:
+        pass
+    return True
+
+
+def store(k, path):
+    # Keep a copy of a freshly rendered figure, then trim the cache to MAX_BYTES
+    if not ENABLED:
+        return
+    folder = cache_dir(path)
+    os.makedirs(folder, exist_ok=True)
+    tmp = os.path.join(folder, f'{k}.png.{os.getpid()}.tmp')
+    shutil.copyfile(path, tmp)
+    os.replace(tmp, os.path.join(folder, f'{k}.png'))
+    evict(folder)
+
+
+def evict(folder, max_bytes=MAX_BYTES):
+    # Files already removed by another process's evict() are skipped
+    entries = []
+    for name in os.listdir(folder):
+        if name.endswith('.png'):
+            try:
+                st = os.stat(os.path.join(folder, name))
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, name))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, name in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(os.path.join(folder, name))
+        except FileNotFoundError:
+            pass
+        total -= size
@@ -0,0 +1,480 @@
+import numpy as np
+import pandas as pd
+
+from portfolio import lazy
+
+# Figure builders for the render jobs (see portfolio/render.py).
+# Each takes plain arrays / small tables and returns the Figure; saving is
+# left to the renderer so the same builder works in-process and in a worker.
+# The plotting libraries load on the first drawing call, so stages can refer
+# to the builders without importing matplotlib (e.g. with --no-plots).
+plt = lazy.module('matplotlib.pyplot')
+mdates = lazy.module('matplotlib.dates')
+mcolors = lazy.module('matplotlib.colors')
+gridspec = lazy.module('matplotlib.gridspec')
+offsetbox = lazy.module('matplotlib.offsetbox')
+ticker = lazy.module('matplotlib.ticker')
+sns = lazy.module('seaborn')
+stats = lazy.module('scipy.stats')
+
+
+def _percent(decimals=0):
+    return ticker.FuncFormatter(lambda y, _: f'{{:.{decimals}%}}'.format(y))
+
+
+def _year_axis(ax, step=3):
+    ax.xaxis.set_major_locator(mdates.YearLocator(step))
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
+    ax.tick_params(axis='x', labelrotation=45)
+
+
+# ==========================================
+# 10_drawdown_analysis.py
+# ==========================================
+def _drawdown_stats_box(ax, stats, name, color, loc):
+    text_str = (
+        f"Statistics ({name}):\n"
+        f"---------------------------\n"
+        f"Avg DD: {stats['avg_dd']:.2%}\n"
+        f"Median DD: {stats['med_dd']:.2%}\n"
+        f"Max DD: {stats['max_dd']:.2%}\n"
+        f"---------------------------\n"
+        f"Avg Recovery: {stats['avg_rec']:.0f} days\n"
+        f"Med Recovery: {stats['med_rec']:.0f} days\n"
+        f"---------------------------\n"
+        f"Avg Duration: {stats['avg_dur']:.0f} days\n"
+        f"Med Duration: {stats['med_dur']:.0f} days\n"
+        f"---------------------------\n"
+        f"Total Drawdowns: {stats['count']}"
+    )
+
+    at = offsetbox.AnchoredText(text_str, loc=loc, prop=dict(size=8), frameon=True)
+    at.patch.set_boxstyle("round,pad=0.,rounding_size=0.2")
+    at.patch.set_facecolor(color)
+    at.patch.set_alpha(0.1)
+    ax.add_artist(at)
+
+
+def drawdown_figure(dates, panels, title, figsize):
+    """Drawdown curves with their statistics boxes.
+
+    `panels` is one list of lines per subplot; a line is a dict with
+    values, name, color, stats_loc and stats (from portfolio.drawdown, or None).
+    """
+    fig, axes = plt.subplots(len(panels), 1, figsize=figsize, sharex=len(panels) > 1, squeeze=False)
+    axes = axes[:, 0]
+
+    for ax, lines in zip(axes, panels):
+        for line in lines:
+            ax.plot(dates, line['values'], label=line['name'], color=line['color'], linewidth=1.5, alpha=0.9)
+            ax.fill_between(dates, line['values'], 0, color=line['color'], alpha=0.1)
+            if line['stats']:
+                _drawdown_stats_box(ax, line['stats'], line['name'], line['color'], line['stats_loc'])
+
+        ax.set_ylabel('Drawdown (%)', fontsize=13, fontweight='bold')
+        ax.yaxis.set_major_formatter(_percent())
+        ax.grid(True, alpha=0.3)
+        ax.legend(loc='upper right')
+
+    axes[0].set_title(title, fontsize=16, fontweight='bold')
+    _year_axis(axes[-1])
+
+    fig.tight_layout()
+    return fig
+
+
+# ==========================================
+# 09_distributional_analysis.py
+# ==========================================
+def kde_figure(lines, boxes, title, figsize=(14, 8), xlim=(-0.04, 0.04)):
+    """Return-distribution KDEs with statistics boxes.
+
+    A line is a dict with grid and density (from portfolio.density), label,
+    color, linewidth and optional linestyle / fill; a box is a dict with
+    text, x, y, color, fontsize and optional ha.
+    """
+    fig, ax = plt.subplots(figsize=figsize)
+
+    for line in lines:
+        style = dict(color=line['color'], linewidth=line['linewidth'], linestyle=line.get('linestyle', '-'))
+        if line.get('fill', False):
+            # Drawn like seaborn's filled kdeplot: faint face, opaque edge
+            artist = ax.fill_between(line['grid'], 0, line['density'],
+                                     facecolor=mcolors.to_rgba(line['color'], 0.1),
+                                     edgecolor=line['color'], label=line['label'],
+                                     linewidth=line['linewidth'], linestyle=style['linestyle'])
+        else:
+            artist, = ax.plot(line['grid'], line['density'], label=line['label'], **style)
+        artist.sticky_edges.y[:] = [0]  # density axis starts at 0
+
+    for box in boxes:
+        ax.text(box['x'], box['y'], box['text'], transform=ax.transAxes, fontsize=box['fontsize'],
+                verticalalignment='top', horizontalalignment=box.get('ha', 'left'),
+                bbox=dict(boxstyle='round', facecolor=box['color'], alpha=0.1))
+
+    ax.set_title(title, fontsize=16, fontweight='bold')
+    ax.set_xlabel('Daily Return', fontsize=13, fontweight='bold')
+    ax.set_ylabel('Density', fontsize=13, fontweight='bold')
+    ax.set_xlim(*xlim)
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+
+    fig.tight_layout()
+    return fig
+
+
+def qq_figure(panels, title, figsize=(16, 7)):
+    # Normal Q-Q plots side by side; a panel is (values, title, color)
+    fig, axes = plt.subplots(1, len(panels), figsize=figsize)
+    fig.suptitle(title, fontsize=16, fontweight='bold')
+
+    for ax, (values, name, color) in zip(np.atleast_1d(axes), panels):
+        stats.probplot(values, dist="norm", plot=ax)
+        ax.get_lines()[0].set_markerfacecolor(color)
+        ax.get_lines()[0].set_markeredgecolor(color)
+        ax.get_lines()[0].set_alpha(0.6)
+        ax.get_lines()[0].set_markersize(2.0)
+        ax.get_lines()[1].set_color('black')
+        ax.set_title(name, fontsize=14, fontweight='bold')
+        ax.set_xlabel('Theoretical Quantiles', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Ordered Values', fontsize=12, fontweight='bold')
+        ax.grid(True, alpha=0.3)
+
+    fig.tight_layout(rect=[0, 0.03, 1, 0.95])
+    return fig
+
+
+# ==========================================
+# 12_yearly_analysis.py
+# ==========================================
+def yearly_heatmap(table, title, figsize=(14, 20)):
+    # Calendar-year returns, one column per strategy
+    fig, ax = plt.subplots(figsize=figsize)
+
+    sns.heatmap(table, annot=True, fmt=".1%", cmap='RdYlGn', center=0, cbar=False, linewidths=0.5, ax=ax)
+
+    ax.set_title(title, fontsize=16, fontweight='bold')
+    ax.set_ylabel('Year', fontsize=13, fontweight='bold')
+    ax.tick_params(axis='x', labelsize=12, labeltop=True, labelbottom=False)
+
+    fig.tight_layout()
+    return fig
+
+
+# ==========================================
+# 15_inspect_period.py
+# ==========================================
+def period_zoom(macro_dates, growth, inflation, dates, equity, title, highlight=None):
+    """Three-panel zoom: growth, inflation and every equity curve over one window.
+
+    `equity` maps 'Stocks' / 'Bonds' / '60/40' / 'Dynamic' to arrays aligned
+    with `dates`; `highlight` is an optional (start, end) span.
+    """
+    fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(16, 12), sharex=True)
+    fig.suptitle(title, fontsize=18, fontweight='bold', y=0.96)
+
+    # --- PANEL 1: GROWTH ---
+    ax1.plot(macro_dates, growth, color='blue', linewidth=2, label='Ind. Production (YoY)')
+    ax1.axhline(0, color='black', linestyle='--', linewidth=1)
+    ax1.fill_between(macro_dates, growth, 0, where=(growth < 0), color='gray', alpha=0.2, label='Contraction')
+
+    ax1.set_ylabel('Growth Rate (YoY)', fontweight='bold', fontsize=12)
+    ax1.yaxis.set_major_formatter(_percent(1))
+    ax1.grid(True, alpha=0.3)
+    ax1.legend(loc='upper right')
+
+    # --- PANEL 2: INFLATION ---
+    ax2.plot(macro_dates, inflation, color='red', linewidth=2, label='CPI Inflation (YoY)')
+    ax2.axhline(0.02, color='green', linestyle='--', linewidth=1, label='Target (2%)')
+    ax2.fill_between(macro_dates, inflation, 0.04, where=(inflation > 0.04), color='red', alpha=0.1,
+                     label='High Inflation')
+
+    ax2.set_ylabel('Inflation Rate', fontweight='bold', fontsize=12)
+    ax2.yaxis.set_major_formatter(_percent(1))
+    ax2.grid(True, alpha=0.3)
+    ax2.legend(loc='upper right')
+
+    # --- PANEL 3: EQUITY (ALL ASSETS) ---
+    # Components (Background), then Strategies (Foreground)
+    ax3.plot(dates, equity['Stocks'], color='green', linewidth=1.5, alpha=0.6, label='Stocks (S&P 500)')
+    ax3.plot(dates, equity['Bonds'], color='red', linewidth=1.5, alpha=0.6, label='Bonds (10Y)')
+    ax3.plot(dates, equity['60/40'], color='gray', linewidth=2.0, linestyle='--', label='60/40 Benchmark')
+    ax3.plot(dates, equity['Dynamic'], color='purple', linewidth=2.5, label='Dynamic Strategy')
+
+    ax3.set_ylabel('Portfolio Value ($)', fontweight='bold', fontsize=12)
+    ax3.yaxis.set_major_formatter(ticker.ScalarFormatter())
+    ax3.grid(True, alpha=0.3)
+    ax3.legend(loc='upper left', ncol=2)
+
+    # Highlight on ALL Axes
+    if highlight:
+        for ax in [ax1, ax2, ax3]:
+            ax.axvspan(pd.Timestamp(highlight[0]), pd.Timestamp(highlight[1]),
+                       color='orange', alpha=0.25, label='Focus Period')
+
+    ax3.xaxis.set_major_locator(mdates.YearLocator(1))
+    ax3.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
+    ax3.xaxis.set_minor_locator(mdates.MonthLocator(interval=1))
+    ax3.tick_params(axis='x', labelrotation=45)
+
+    fig.tight_layout(rect=[0, 0, 1, 0.96])
+    return fig
+
+
+# ==========================================
+# 01 / 02 / 05 / 06: Equity Curves (Log Scale)
+# ==========================================
+def equity_figure(dates, lines, title, y_ticks, year_step=3, figsize=(15, 8),
+                  title_kw=None, ylabel_kw=None, legend_kw=None):
+    """Growth-of-$1 curves on a log axis.
+
+    A line is a dict with `values` plus any ax.plot keyword (label, color,
+    linewidth, alpha, linestyle).
+    """
+    fig, ax = plt.subplots(figsize=figsize)
+
+    for line in lines:
+        line = dict(line)
+        ax.plot(dates, line.pop('values'), **line)
+
+    ax.set_yscale('log')
+    ax.set_yticks(y_ticks)
+    ax.get_yaxis().set_major_formatter(ticker.ScalarFormatter())
+    ax.yaxis.set_minor_locator(ticker.NullLocator())
+
+    ax.set_title(title, **(title_kw or {}))
+    ax.set_ylabel('Portfolio Value (Growth of $1)', **(ylabel_kw or {}))
+    _year_axis(ax, year_step)
+
+    ax.grid(True, which="major", ls="-", alpha=0.5)
+    ax.legend(loc='upper left', **(legend_kw or {}))
+
+    fig.tight_layout()
+    return fig
+
+
+# ==========================================
+# 11_correlation_analysis.py
+# ==========================================
+def correlation_timeline(dates, corr, title='Historical Stock-Bond Returns Correlation (24M Rolling)',
+                         figsize=(15, 7)):
+    fig, ax = plt.subplots(figsize=figsize)
+
+    ax.plot(dates, corr, color='black', linewidth=1.5, label='Stock-Bond Returns Correlation')
+    ax.axhline(0, color='red', linestyle='--', linewidth=1)
+
+    ax.set_title(title, fontsize=16, fontweight='bold')
+    ax.set_ylabel('Correlation', fontsize=13, fontweight='bold')
+
+    ax.set_ylim(-1, 1)
+    _year_axis(ax)
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+
+    fig.tight_layout()
+    return fig
+
+
+def correlation_boxplot(table, order, palette, figsize=(10, 7)):
+    # Distribution of the rolling correlation per regime (table: Regime, Correlation)
+    fig, ax = plt.subplots(figsize=figsize)
+
+    sns.boxplot(data=table, x='Regime', y='Correlation', hue='Regime', order=order, palette=palette,
+                legend=False, ax=ax, width=0.5)
+    ax.axhline(0, color='black', linestyle='--', linewidth=1)
+
+    ax.set_title('Stock-Bond Correlation by Macro Regime', fontsize=16, fontweight='bold')
+    ax.set_ylabel('Correlation Distribution', fontsize=13, fontweight='bold')
+    ax.grid(True, alpha=0.3, axis='y')
+
+    fig.tight_layout()
+    return fig
+
+
+# ==========================================
+# 14_create_dashboard.py
+# ==========================================
+def dashboard(dates, lines, corr_dates, corr, stagflation, table, title):
+    """Executive tear sheet: equity, drawdown, correlation with Stagflation
+    shading, and the metrics table (`table`: DataFrame of display strings).
+
+    A line is a dict with label, short (drawdown legend), color, equity and
+    drawdown arrays; the first is the headline strategy, the rest are
+    drawn as comparisons.
+    """
+    fig = plt.figure(figsize=(20, 14))
+    gs = gridspec.GridSpec(3, 2, height_ratios=[2, 1.5, 1])
+    fig.suptitle(title, fontsize=20, y=0.95)
+    main, others = lines[0], lines[1:]
+
+    # --- CHART 1: EQUITY CURVE (Top Spanning) ---
+    ax1 = fig.add_subplot(gs[0, :])
+    ax1.plot(dates, main['equity'], color=main['color'], linewidth=2, label=main['label'])
+    for line in others:
+        ax1.plot(dates, line['equity'], color=line['color'], linewidth=1.5, linestyle='--', label=line['label'])
+    ax1.set_yscale('log')
+    ax1.set_ylabel('Growth of $1 (Log)')
+    ax1.set_title('Cumulative Performance', fontsize=12, loc='left')
+    ax1.legend(loc='upper left')
+    ax1.grid(True, alpha=0.3)
+    ax1.yaxis.set_major_formatter(ticker.ScalarFormatter())
+
+    # --- CHART 2: DRAWDOWN (Middle Left) ---
+    ax2 = fig.add_subplot(gs[1, 0])
+    ax2.plot(dates, main['drawdown'], color=main['color'], linewidth=1, label=main['short'])
+    ax2.fill_between(dates, main['drawdown'], 0, color=main['color'], alpha=0.2)
+    for line in others:
+        ax2.plot(dates, line['drawdown'], color=line['color'], linewidth=1, alpha=0.6, label=line['short'])
+    ax2.set_title('Drawdown Profile', fontsize=12, loc='left')
+    ax2.set_ylabel('Drawdown %')
+    ax2.yaxis.set_major_formatter(_percent())
+    ax2.grid(True, alpha=0.3)
+    ax2.legend(loc='lower left')
+
+    # --- CHART 3: CORRELATION & REGIMES (Middle Right) ---
+    ax3 = fig.add_subplot(gs[1, 1])
+    ax3.plot(corr_dates, corr, color='black', linewidth=1)
+    ax3.axhline(0, color='red', linestyle='--', linewidth=0.8)
+    ax3.set_title('Stock-Bond Correlation (Regime Dependent)', fontsize=12, loc='left')
+    ax3.set_ylabel('24M Rolling Corr')
+    ax3.set_ylim(-1, 1)
+
+    # Simple Regime Shading (Stagflation Only)
+    if stagflation.any():
+        ax3.fill_between(corr_dates, -1, 1, where=stagflation, color='red', alpha=0.15, label='Stagflation')
+    ax3.legend(loc='upper right')
+    ax3.grid(True, alpha=0.3)
+
+    # --- TABLE 4: METRICS (Bottom) ---
+    ax4 = fig.add_subplot(gs[2, :])
+    ax4.axis('off')
+
+    cell = ax4.table(cellText=table.values.tolist(), colLabels=table.columns, rowLabels=table.index,
+                     loc='center', cellLoc='center', colColours=['#f2f2f2'] * len(table.columns))
+    cell.auto_set_font_size(False)
+    cell.set_fontsize(12)
+    cell.scale(1, 2)
+
+    fig.tight_layout(rect=[0, 0, 1, 0.95])
+    return fig
+
+
+# ==========================================
+# 03_macro_regimes.py
+# ==========================================
+def regime_history(dates, inflation, regime, colors, title, figsize=(15, 6)):
+    # CPI YoY with the regime of every month shaded (colors: regime -> color)
+    fig, ax = plt.subplots(figsize=figsize)
+
+    ax.plot(dates, inflation, color='black', linewidth=1, label='Inflation (CPI YoY)')
+    for name, color in colors.items():
+        ax.fill_between(dates, np.nanmin(inflation), np.nanmax(inflation), where=regime == name,
+                        color=color, alpha=0.3, label=name, step='mid')
+
+    ax.yaxis.set_major_formatter(_percent())
+    _year_axis(ax)
+
+    ax.set_title(title, fontsize=14)
+    ax.set_ylabel('Inflation Rate (YoY)')
+    ax.legend(loc='upper left', bbox_to_anchor=(1, 1))
+    ax.grid(True, alpha=0.3)
+
+    fig.tight_layout()
+    return fig
+
+
+# ==========================================
+# 04_construct_alternatives.py
+# ==========================================
+def alternatives_figure(dates, commodities, oil, title, figsize=(15, 8)):
+    # Commodities (left axis) and WTI oil (right axis)
+    fig, ax1 = plt.subplots(figsize=figsize)
+
+    ax1.plot(dates, commodities, color='brown', label='Commodities (PPI)', linewidth=1.5)
+    ax1.set_ylabel('PPI Commodities Index', color='brown', fontsize=12)
+    ax1.tick_params(axis='y', labelcolor='brown')
+
+    ax2 = ax1.twinx()
+    ax2.plot(dates, oil, color='black', label='WTI Oil ($)', linewidth=1.5, linestyle='--')
+    ax2.set_ylabel('WTI Crude Oil ($)', color='black', fontsize=12)
+    ax2.tick_params(axis='y', labelcolor='black')
+
+    ax1.set_title(title, fontsize=14)
+    ax1.xaxis.set_major_locator(mdates.YearLocator(3))
+    ax1.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
+    fig.autofmt_xdate()
+    ax1.grid(True, alpha=0.3)
+
+    # Combined Legend
+    lines_1, labels_1 = ax1.get_legend_handles_labels()
+    lines_2, labels_2 = ax2.get_legend_handles_labels()
+    ax1.legend(lines_1 + lines_2, labels_1 + labels_2, loc='upper left')
+
+    fig.tight_layout()
+    return fig
+
+
+# ==========================================
+# 18_bootstrap_robustness.py
+# ==========================================
+def bootstrap_figure(paths, actual, title, bins=80, figsize=(15, 10)):
+    """Bootstrap distributions of CAGR / Sharpe / Max DD and of the CAGR spread.
+
+    `paths` has the Dynamic_* / 60_40_* / Spread_CAGR columns of
+    bootstrap.run(); `actual` the realised metrics (strategy x stat).
+    """
+    fig, axes = plt.subplots(2, 2, figsize=figsize)
+    fig.suptitle(title, fontsize=16, fontweight='bold')
+
+    panels = [('CAGR', '{:.0%}'), ('Sharpe', '{:.2f}'), ('Max DD', '{:.0%}')]
+    for ax, (stat, fmt) in zip(axes.flat, panels):
+        ax.hist(paths[f'Dynamic_{stat}'], bins=bins, color='purple', alpha=0.5, label='Dynamic Strategy')
+        ax.hist(paths[f'60_40_{stat}'], bins=bins, color='gray', alpha=0.5, label='60/40 Benchmark')
+        ax.axvline(actual.loc['Dynamic', stat], color='purple', linestyle='--', linewidth=1.5)
+        ax.axvline(actual.loc['60/40', stat], color='black', linestyle='--', linewidth=1.5)
+        ax.set_title(stat, fontsize=13, fontweight='bold')
+        ax.xaxis.set_major_formatter(ticker.FuncFormatter(lambda x, _, fmt=fmt: fmt.format(x)))
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+
+    ax = axes[1, 1]
+    spread = paths['Spread_CAGR']
+    ax.hist(spread, bins=bins, color='teal', alpha=0.6)
+    ax.axvline(0, color='red', linestyle='--', linewidth=1)
+    ax.set_title(f'CAGR Spread (Dynamic - 60/40): P(>0) = {(spread > 0).mean():.1%}', fontsize=13, fontweight='bold')
+    ax.xaxis.set_major_formatter(_percent(1))
+    ax.grid(True, alpha=0.3)
+
+    fig.tight_layout(rect=[0, 0, 1, 0.95])
+    return fig
+
+
+# ==========================================
+# 19_walk_forward.py
+# ==========================================
+def walk_forward_figure(cagr, hit_rate, title, figsize=(15, 14)):
+    """CAGR by start month, one panel per horizon.
+
+    `cagr` maps each horizon to a DataFrame (start dates x Dynamic / 60/40);
+    `hit_rate` the share of start dates on which Dynamic is ahead.
+    """
+    fig, axes = plt.subplots(len(cagr), 1, figsize=figsize, sharex=True)
+    fig.suptitle(title, fontsize=16, fontweight='bold')
+
+    for ax, (horizon, df) in zip(axes, cagr.items()):
+        ax.plot(df.index, df['Dynamic'], color='purple', linewidth=1.5, label='Dynamic Strategy')
+        ax.plot(df.index, df['60/40'], color='gray', linewidth=1.2, linestyle='--', label='60/40 Benchmark')
+        ax.fill_between(df.index, df['Dynamic'], df['60/40'], where=df['Dynamic'] >= df['60/40'],
+                        color='purple', alpha=0.15, interpolate=True)
+        ax.axhline(0, color='black', linewidth=0.8)
+        ax.set_title(f"{horizon} Horizon (Dynamic ahead on {hit_rate[horizon]:.0%} of start dates)",
+                     fontsize=12, loc='left')
+        ax.set_ylabel('CAGR', fontsize=11, fontweight='bold')
+        ax.yaxis.set_major_formatter(_percent())
+        ax.grid(True, alpha=0.3)
+        ax.legend(loc='upper right')
+
+    _year_axis(axes[-1])
+
+    fig.tight_layout(rect=[0, 0, 1, 0.97])
+    return fig
@@ -0,0 +1,26 @@
+import importlib
+
+# Deferred imports for the heavy plotting libraries (matplotlib, seaborn, scipy).
+# module('matplotlib.pyplot') returns a stand-in that imports the real module on
+# first attribute access, so stages that never draw (--no-plots, compute-only
+# stages importing a shared module) never pay for the import. fredapi / wrds
+# are already imported on first use by the providers in portfolio/fetch.py.
+
+
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def module(name):
+    return LazyModule(name)
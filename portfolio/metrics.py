@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+# Grouped performance metrics.
+# Every (group, strategy) cell comes out of one pass of np.bincount segment sums
+# over a (days x strategies) matrix and an integer group code per day, instead
+# of a boolean-mask copy per regime and a loop per strategy. The overall
+# statistics are the single-group case.
+METRICS = ['Return (Ann)', 'Volatility', 'Sharpe', 'Sortino', 'Max DD']
+
+
+def _group_sums(values, codes, n_groups):
+    # Column-wise sums per group: (n_groups x n_strategies)
+    n_cols = values.shape[1]
+    cells = (codes[:, None] * n_cols + np.arange(n_cols)).ravel()
+    return np.bincount(cells, weights=values.ravel(), minlength=n_groups * n_cols).reshape(n_groups, n_cols)
+
+
+def _group_std(values, codes, n_groups, mask=None):
+    # Two-pass sample std (ddof=1) per group, optionally over masked entries only
+    if mask is None:
+        count = np.repeat(np.bincount(codes, minlength=n_groups)[:, None], values.shape[1], axis=1).astype(float)
+        total = _group_sums(values, codes, n_groups)
+    else:
+        count = _group_sums(mask.astype(float), codes, n_groups)
+        total = _group_sums(np.where(mask, values, 0.0), codes, n_groups)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        dev = values - mean[codes]
+        dev = dev if mask is None else np.where(mask, dev, 0.0)
+        var = _group_sums(dev * dev, codes, n_groups) / (count - 1)
+    var[count < 2] = np.nan
+    return mean, np.sqrt(var), count
+
+
+def _group_max_dd(returns, codes, n_groups):
+    # Max drawdown of each group's own compounded path (its days in order, gaps closed).
+    # Rows are ordered by group and a per-group offset is added to the log equity,
+    # so one running maximum restarts at every group boundary.
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    log_eq = np.log1p(returns[order])
+
+    # Cumulative sums restarted at each group: subtract the running total at the group's first row
+    bounds = np.searchsorted(sorted_codes, np.arange(n_groups + 1))
+    prefix = np.vstack([np.zeros((1, returns.shape[1])), np.cumsum(log_eq, axis=0)])
+    log_eq = prefix[1:] - prefix[bounds[sorted_codes]]
+
+    span = (np.ptp(log_eq, axis=0) if len(log_eq) else 0) + 1.0
+    shifted = log_eq + sorted_codes[:, None] * span
+    drawdown = np.expm1(shifted - np.maximum.accumulate(shifted, axis=0))
+
+    max_dd = np.full((n_groups, returns.shape[1]), np.nan)
+    present = bounds[:-1] < bounds[1:]
+    if present.any():
+        max_dd[present] = np.minimum.reduceat(drawdown, bounds[:-1][present], axis=0)
+    return max_dd
+
+
+def grouped_metrics(returns, excess, codes, n_groups, geometric=False, periods=252):
+    """Return, vol, Sharpe, Sortino and Max DD for every (group, strategy) cell.
+
+    `returns` and `excess` are (days x strategies), `codes` the group of each
+    day (rows with a negative code are left out). Returns an array shaped
+    (n_groups, n_strategies, 5) in METRICS order. The return is the CAGR when
+    `geometric`, otherwise the annualized arithmetic mean (run rate).
+    """
+    returns = np.asarray(returns, dtype=float)
+    excess = np.asarray(excess, dtype=float)
+    codes = np.asarray(codes)
+
+    keep = codes >= 0
+    returns, excess, codes = returns[keep], excess[keep], codes[keep].astype(np.intp)
+
+    mean, std, count = _group_std(returns, codes, n_groups)
+    ex_mean, ex_std, _ = _group_std(excess, codes, n_groups)
+    _, down_std, _ = _group_std(returns, codes, n_groups, mask=returns < 0)
+
+    with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+        if geometric:
+            log_growth = _group_sums(np.log1p(returns), codes, n_groups)
+            ann_return = np.expm1(log_growth * periods / count)
+        else:
+            ann_return = mean * periods
+
+        vol = std * np.sqrt(periods)
+        sharpe = (ex_mean * periods) / (ex_std * np.sqrt(periods) + 1e-9)
+        sortino = (ex_mean * periods) / (down_std * np.sqrt(periods) + 1e-9)
+
+    out = np.stack([ann_return, vol, sharpe, sortino, _group_max_dd(returns, codes, n_groups)], axis=-1)
+
+    # Too little history for a statistic: zeros, as 08 always reported
+    out[count < 2] = 0.0
+    return out
+
+
+def overall(returns, excess, periods=252):
+    # Whole-sample table (CAGR), one row per strategy column
+    codes = np.zeros(len(returns), dtype=np.intp)
+    values = grouped_metrics(returns, excess, codes, 1, geometric=True, periods=periods)[0]
+    return pd.DataFrame(values, index=returns.columns, columns=METRICS)
+
+
+def by_group(returns, excess, codes, groups, periods=252):
+    # {group name: table} with the arithmetic run rate, one row per strategy column
+    values = grouped_metrics(returns, excess, codes, len(groups), geometric=False, periods=periods)
+    return {g: pd.DataFrame(values[i], index=returns.columns, columns=METRICS) for i, g in enumerate(groups)}
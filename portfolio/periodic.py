@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+# Period-return tables (monthly, quarterly, yearly, per regime spell).
+# Period boundaries are found once as integer row offsets, from changes in
+# an integer period key. Every strategy column is then compounded in one
+# np.multiply.reduceat over the gross returns. A period is whatever days the
+# data has in it, so partial first and last periods need no special case.
+# Rebased equity that starts at 1.0 gives a first-period return of End / 1.0 - 1.
+FREQS = ['M', 'Q', 'Y']
+
+
+def _period_key(index, freq):
+    years = index.year.to_numpy().astype(np.int64)
+    months = index.month.to_numpy().astype(np.int64)
+    if freq == 'Y':
+        return years
+    if freq == 'Q':
+        return years * 4 + (months - 1) // 3
+    if freq == 'M':
+        return years * 12 + months - 1
+    raise ValueError(f"freq must be one of {FREQS}, got {freq!r}")
+
+
+def _starts(key):
+    # First row of every run of equal keys
+    key = np.asarray(key)
+    return np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+
+
+def boundaries(index, freq):
+    """Start offsets and labels of the calendar periods in a sorted DatetimeIndex."""
+    starts = _starts(_period_key(index, freq))
+    first = index[starts]
+    if freq == 'Y':
+        labels = first.year
+    elif freq == 'Q':
+        labels = pd.Index([f'{d.year}Q{(d.month - 1) // 3 + 1}' for d in first])
+    else:
+        labels = pd.Index([f'{d.year}-{d.month:02d}' for d in first])
+    return starts, labels
+
+
+def _gross(returns):
+    # 1 + r as a 2-D float array; missing daily returns count as flat
+    gross = 1 + np.asarray(returns, dtype=float)
+    np.copyto(gross, 1.0, where=np.isnan(gross))
+    return gross[:, None] if gross.ndim == 1 else gross
+
+
+def compound(returns, starts):
+    # (periods x columns) compounded returns
+    return np.multiply.reduceat(_gross(returns), starts, axis=0) - 1
+
+
+def from_equity(equity):
+    # Daily returns of equity curves rebased to 1.0 on the first day (first day flat)
+    return equity.pct_change().fillna(equity.iloc[0] - 1)
+
+
+def table(returns, freq='Y'):
+    """Compounded returns per calendar period, one column per strategy."""
+    starts, labels = boundaries(returns.index, freq)
+    return pd.DataFrame(compound(returns, starts), index=labels, columns=returns.columns)
+
+
+def tables(returns, freqs=FREQS):
+    """Several frequencies from one pass over the daily data.
+
+    Daily returns are compounded to months once; quarters and years are
+    then reduced from the monthly products, since their boundaries nest.
+    """
+    m_starts, m_labels = boundaries(returns.index, 'M')
+    monthly = np.multiply.reduceat(_gross(returns), m_starts, axis=0)
+    month_index = returns.index[m_starts]
+
+    out = {}
+    for freq in freqs:
+        if freq == 'M':
+            values, labels = monthly, m_labels
+        else:
+            starts, labels = boundaries(month_index, freq)
+            values = np.multiply.reduceat(monthly, starts, axis=0)
+        out[freq] = pd.DataFrame(values - 1, index=labels, columns=returns.columns)
+    return out
+
+
+def spells(returns, regime):
+    """Compounded returns over every unbroken run of one regime.
+
+    Columns: Start, End, Regime, Days, then one per strategy.
+    """
+    regime = regime.reindex(returns.index)
+    codes = pd.factorize(regime, use_na_sentinel=True)[0]
+    starts = _starts(codes)
+    ends = np.r_[starts[1:], len(returns)] - 1
+
+    out = pd.DataFrame({
+        'Start': returns.index[starts],
+        'End': returns.index[ends],
+        'Regime': regime.to_numpy()[starts],
+        'Days': ends - starts + 1
+    })
+    values = pd.DataFrame(compound(returns, starts), columns=returns.columns)
+    return pd.concat([out, values], axis=1)
+
+
+def month_grid(series):
+    # Year x month table of one strategy's monthly returns (for heatmaps)
+    starts, _ = boundaries(series.index, 'M')
+    first = series.index[starts]
+    values = compound(series, starts)[:, 0]
+    grid = pd.DataFrame({'Year': first.year, 'Month': first.strftime('%b'), 'Return': values})
+    months = pd.date_range('2000-01-01', periods=12, freq='MS').strftime('%b')
+    return grid.pivot(index='Year', columns='Month', values='Return').reindex(columns=months)
@@ -0,0 +1,52 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Zoom windows for 15_inspect_period.py.
+# A window is one row of a table with name, start, end and an optional
+# highlight_start / highlight_end span (plus an optional output filename).
+# Windows are resolved to integer row offsets with one searchsorted per
+# date index for all of them at once, instead of a label-based .loc per window.
+COLUMNS = ['name', 'start', 'end', 'highlight_start', 'highlight_end', 'filename']
+
+
+def frame(windows):
+    """Normalise a list of dicts / a DataFrame of windows (dates parsed, filenames filled in)."""
+    df = pd.DataFrame(windows).reindex(columns=COLUMNS)
+    for col in ['start', 'end', 'highlight_start', 'highlight_end']:
+        df[col] = pd.to_datetime(df[col])
+
+    default = [f"zoom_{re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')}_{start:%Y%m}.png"
+               for name, start in zip(df['name'], df['start'])]
+    df['filename'] = df['filename'].astype(object).where(df['filename'].notna(), default)
+    return df.reset_index(drop=True)
+
+
+def read(path):
+    # CSV with the COLUMNS above (highlight and filename may be left empty)
+    return frame(pd.read_csv(path, dtype={'name': str, 'filename': str}))
+
+
+def regime_switches(regime, months_before=12, months_after=12):
+    """One window around every regime change, highlighting the month it happened."""
+    switch = regime.ne(regime.shift()) & regime.shift().notna()
+    dates = regime.index[switch]
+    prev = regime.shift()[switch]
+    return frame({
+        'name': [f'{a} to {b}' for a, b in zip(prev, regime[switch])],
+        'start': dates - pd.DateOffset(months=months_before),
+        'end': dates + pd.DateOffset(months=months_after),
+        'highlight_start': dates,
+        'highlight_end': dates + pd.DateOffset(months=1),
+    })
+
+
+def resolve(index, windows):
+    """Integer (start, stop) row offsets of every window in a sorted DatetimeIndex.
+
+    Same rows as index.to_series().loc[start:end] (both ends inclusive).
+    """
+    lo = index.searchsorted(windows['start'].to_numpy(), side='left')
+    hi = index.searchsorted(windows['end'].to_numpy(), side='right')
+    return np.stack([lo, hi], axis=1)
@@ -0,0 +1,255 @@
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from portfolio import fetch, store
+
+# Paths are relative to the project base_dir
+BENCH     = 'modified_data/benchmark_portfolio_1970_2025.csv'
+MACRO     = 'modified_data/macro_regimes.csv'
+MACRO_PIT = 'modified_data/macro_regimes_pit.csv'
+ALTS      = 'modified_data/alternative_assets_1970_2025.csv'
+BACKTEST  = 'modified_data/final_backtest_results.csv'
+MASTER    = 'modified_data/consolidated_portfolio_rebased.csv'
+RF        = 'modified_data/risk_free_daily.csv'
+CORR      = 'modified_data/stock_bond_correlation.csv'
+
+# Declared inputs and outputs of every numbered stage.
+# A stage depends on every stage that writes one of its inputs.
+STAGES = {
+    '00': {'script': '00_fetch_data.py',
+           'inputs': [],
+           'outputs': [os.path.join('raw_data', spec['file']) for spec in fetch.SERIES.values()
+                       if not spec.get('optional')]},
+    '01': {'script': '01_construct_benchmark.py',
+           'inputs': ['raw_data/crsp_stocks_raw.csv', 'raw_data/fred_bonds_raw.csv', 'raw_data/fred_bonds_2y_raw.csv',
+                      'raw_data/fred_bonds_5y_raw.csv', 'raw_data/fred_bonds_30y_raw.csv'],
+           'outputs': [BENCH, 'modified_data/bond_returns_by_maturity.csv', 'figures/benchmark_performance.png']},
+    '02': {'script': '02_visualize_assets.py',
+           'inputs': [BENCH],
+           'outputs': ['figures/asset_class_comparison.png']},
+    '03': {'script': '03_macro_regimes.py',
+           'inputs': ['raw_data/fred_cpi_raw.csv', 'raw_data/fred_indpro_raw.csv',
+                      'raw_data/alfred_cpi_vintages.csv', 'raw_data/alfred_indpro_vintages.csv'],
+           'outputs': [MACRO, MACRO_PIT, 'modified_data/regime_grid.npz', 'results/regime_grid_summary.csv',
+                       'figures/macro_regimes_history.png']},
+    '04': {'script': '04_construct_alternatives.py',
+           'inputs': ['raw_data/fred_commodities_raw.csv', 'raw_data/fred_oil_raw.csv'],
+           'outputs': [ALTS, 'figures/alternative_assets_history.png']},
+    '05': {'script': '05_dynamic_backtest.py',
+           'inputs': [BENCH, ALTS, MACRO, MACRO_PIT],
+           'outputs': [BACKTEST, 'results/cost_surface.csv', 'figures/dynamic_backtest_result.png']},
+    '06': {'script': '06_comparative_visualization.py',
+           'inputs': [BACKTEST, BENCH],
+           'outputs': [MASTER, CORR, 'figures/comprehensive_comparison_rebased.png']},
+    '07': {'script': '07_construct_risk_free.py',
+           'inputs': ['raw_data/fred_rf_raw.csv'],
+           'outputs': [RF]},
+    '08': {'script': '08_performance_metrics.py',
+           'inputs': [MASTER, RF],
+           'outputs': ['results/metrics_overall_comprehensive.csv', 'results/metrics_regime_comprehensive.csv']},
+    '09': {'script': '09_distributional_analysis.py',
+           'inputs': [MASTER],
+           'outputs': ['figures/distribution_strategy.png', 'figures/distribution_assets.png',
+                       'figures/qq_strategy.png', 'figures/qq_assets.png']},
+    '10': {'script': '10_drawdown_analysis.py',
+           'inputs': [MASTER],
+           'outputs': ['figures/drawdown_strategy.png', 'figures/drawdown_assets.png',
+                       'figures/drawdown_vs_stocks.png', 'figures/drawdown_all_stacked.png']},
+    '11': {'script': '11_correlation_analysis.py',
+           'inputs': [CORR, MACRO],
+           'outputs': ['figures/correlation_timeline.png']},
+    '12': {'script': '12_yearly_analysis.py',
+           'inputs': [MASTER],
+           'outputs': ['results/yearly_returns_comprehensive.csv', 'results/quarterly_returns_comprehensive.csv',
+                       'results/monthly_returns_comprehensive.csv', 'results/regime_spell_returns.csv',
+                       'figures/yearly_heatmap_comprehensive.png', 'figures/monthly_heatmap_dynamic.png']},
+    '13': {'script': '13_turnover_analysis.py',
+           'inputs': [MASTER],
+           'outputs': ['results/turnover_stats.csv']},
+    '14': {'script': '14_create_dashboard.py',
+           'inputs': [MASTER, RF, CORR],
+           'outputs': ['figures/executive_dashboard.png']},
+    '15': {'script': '15_inspect_period.py',
+           'inputs': [MACRO, MASTER],
+           'outputs': ['figures/zoom_2020_post_covid.png', 'figures/zoom_2001_whipsaw.png',
+                       'figures/zoom_manifest.csv']},
+    '16': {'script': '16_mapping_sweep.py',
+           'inputs': [BENCH, ALTS, MACRO, RF],
+           'outputs': ['results/regime_mapping_sweep.csv']},
+    '18': {'script': '18_bootstrap_robustness.py',
+           'inputs': [BENCH, ALTS, MACRO, RF],
+           'outputs': ['results/bootstrap_paths.csv', 'results/bootstrap_summary.csv',
+                       'figures/bootstrap_distributions.png']},
+    '19': {'script': '19_walk_forward.py',
+           'inputs': [MASTER, RF],
+           'outputs': ['results/walk_forward_grid.csv', 'results/walk_forward_summary.csv',
+                       'figures/walk_forward_cagr.png']},
+    '20': {'script': '20_multi_universe.py',
+           'inputs': [os.path.join('raw_data', fetch.SERIES[sid]['file']) for sid in
+                      ['sprtrn', 'DGS10', 'PPIACO', 'WTISPLC', 'CPIAUCSL', 'INDPRO', 'DTB3']],
+           'outputs': ['results/universe_summary.csv']},
+}
+
+STATE_DIR = '.pipeline'
+
+# Settings read from the environment that change what a stage writes
+# (STORE_PRECISION: float width of the columnar copies; PLOT_DOWNSAMPLE: figures)
+SETTINGS = {'STORE_PRECISION': lambda: store.FLOAT_DTYPE.name,
+            'PLOT_DOWNSAMPLE': lambda: os.environ.get('PLOT_DOWNSAMPLE') == '1'}
+
+
+def dependencies(stages=STAGES):
+    # stage -> set of upstream stages whose outputs it reads
+    producers = {out: name for name, spec in stages.items() for out in spec['outputs']}
+    return {name: {producers[p] for p in spec['inputs'] if p in producers and producers[p] != name}
+            for name, spec in stages.items()}
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _code_files(script, code_dir):
+    # The stage script plus every portfolio module it pulls in (transitively)
+    files, queue = [], [os.path.join(code_dir, script)]
+    while queue:
+        path = queue.pop()
+        if path in files or not os.path.exists(path):
+            continue
+        files.append(path)
+        with open(path) as f:
+            src = f.read()
+        for mod in re.findall(r'^\s*from portfolio(?:\.(\w+))? import ([\w, ]+)', src, re.M):
+            names = [mod[0]] if mod[0] else [n.strip() for n in mod[1].split(',')]
+            queue += [os.path.join(code_dir, 'portfolio', f'{n}.py') for n in names]
+    return sorted(files)
+
+
+def stage_key(name, base_dir, code_dir, stages=STAGES):
+    # Content hash of the stage's code, declared inputs and output settings
+    spec = stages[name]
+    h = hashlib.sha256()
+    for setting, value in SETTINGS.items():
+        h.update(f'{setting}={value()}'.encode())
+    for path in _code_files(spec['script'], code_dir):
+        h.update(os.path.relpath(path, code_dir).encode())
+        h.update(file_hash(path).encode())
+    for rel in spec['inputs']:
+        path = os.path.join(base_dir, rel)
+        h.update(rel.encode())
+        h.update(file_hash(path).encode() if os.path.exists(path) else b'<missing>')
+    return h.hexdigest()
+
+
+def _load_state(base_dir):
+    path = os.path.join(base_dir, STATE_DIR, 'state.json')
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_state(base_dir, state):
+    path = os.path.join(base_dir, STATE_DIR, 'state.json')
+    with open(path + '.tmp', 'w') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def outputs(name, stages=STAGES, plots=True):
+    # Declared outputs, without the figures when running with --no-plots
+    return [p for p in stages[name]['outputs'] if plots or not p.endswith('.png')]
+
+
+def is_current(name, key, state, base_dir, stages=STAGES, plots=True):
+    entry = state.get(name)
+    outputs_exist = all(os.path.exists(os.path.join(base_dir, p)) for p in outputs(name, stages, plots))
+    # A compute-only run leaves the stage's figures out of date for a plotting run
+    drawn = (not plots or entry is None or entry.get('plots', True)
+             or outputs(name, stages, plots=False) == outputs(name, stages))
+    return entry is not None and entry['key'] == key and outputs_exist and drawn
+
+
+def _run_stage(name, base_dir, code_dir, stages, plots=True):
+    # One stage in its own worker process, headless: Agg, show() never blocks,
+    # figures rendered in the stage's own process pool (or not at all without plots).
+    # DP_BASE_DIR points the script's base_dir at the folder the state is kept for.
+    env = dict(os.environ, MPLBACKEND='Agg', RENDER_BATCH='1', RENDER_PLOTS='1' if plots else '0',
+               DP_BASE_DIR=os.path.abspath(base_dir))
+    log_path = os.path.join(base_dir, STATE_DIR, 'logs', f'{name}.log')
+    with open(log_path, 'w') as log:
+        proc = subprocess.run([sys.executable, stages[name]['script']], cwd=code_dir, env=env,
+                              stdout=log, stderr=subprocess.STDOUT)
+    return proc.returncode
+
+
+def run(base_dir, code_dir, workers=None, force=(), dry_run=False, stages=STAGES, log=print, plots=True):
+    """Run every stale stage, in parallel where dependencies allow.
+
+    A stage is skipped when the hash of its code and inputs matches the last
+    successful run and its outputs exist. Stages in `force` always run.
+    With plots=False (--no-plots) the stages only compute their data outputs
+    and stages that only draw figures are not run ('no plots').
+    Returns {stage: 'ran' | 'skipped' | 'no plots' | 'failed' | 'blocked' | 'stale'}.
+    """
+    os.makedirs(os.path.join(base_dir, STATE_DIR, 'logs'), exist_ok=True)
+    state = _load_state(base_dir)
+    deps = dependencies(stages)
+    force = set(force)
+
+    status = {}
+    pending = set(stages)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        while pending or running:
+            progressed = True
+            while progressed:
+                progressed = False
+                for name in sorted(pending):
+                    upstream = deps[name]
+                    if any(status.get(u) in ('failed', 'blocked', 'stale') for u in upstream):
+                        # A dry run cannot know whether an upstream rerun changes its outputs
+                        status[name] = 'stale' if dry_run else 'blocked'
+                    elif not all(status.get(u) in ('ran', 'skipped', 'no plots') for u in upstream):
+                        continue
+                    elif not outputs(name, stages, plots):
+                        status[name] = 'no plots'
+                    else:
+                        key = stage_key(name, base_dir, code_dir, stages)
+                        if name not in force and is_current(name, key, state, base_dir, stages, plots):
+                            status[name] = 'skipped'
+                        elif dry_run:
+                            status[name] = 'stale'
+                        else:
+                            log(f"[{name}] running {stages[name]['script']}...")
+                            running[pool.submit(_run_stage, name, base_dir, code_dir, stages, plots)] = (name, key)
+                            status[name] = 'running'
+                    pending.discard(name)
+                    progressed = True
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, key = running.pop(future)
+                if future.result() == 0:
+                    status[name] = 'ran'
+                    state[name] = {'key': key, 'script': stages[name]['script'], 'plots': plots}
+                    _save_state(base_dir, state)
+                    log(f"[{name}] done")
+                else:
+                    status[name] = 'failed'
+                    log(f"[{name}] FAILED (see {os.path.join(STATE_DIR, 'logs', name + '.log')})")
+
+    return status
@@ -0,0 +1,123 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Fixed label order: the integer code of a regime is its position in this list.
+# Regime columns are carried as this categorical dtype (int8 codes + the
+# four labels), which the columnar store writes as codes.
+REGIMES = ['Goldilocks', 'Reflation', 'Stagflation', 'Deflation']
+DTYPE = pd.CategoricalDtype(REGIMES)
+
+# Classifier parameter grid (03_macro_regimes.py). The live definition is
+# 12-month YoY rates, a 3-month change as the trend and 0 thresholds.
+YOY_WINDOWS = [6, 9, 12, 18, 24]
+TREND_LAGS = [1, 2, 3, 6, 12]
+THRESHOLDS = [-0.005, -0.0025, 0.0, 0.0025, 0.005]
+BASELINE = {'yoy': 12, 'trend': 3, 'growth': 0.0, 'inflation': 0.0}
+
+GRID_FILE = 'regime_grid.npz'
+
+
+def encode(labels):
+    # Regime labels -> int8 codes (-1 for missing / unknown labels)
+    if isinstance(getattr(labels, 'dtype', None), pd.CategoricalDtype) and labels.dtype == DTYPE:
+        return np.asarray(getattr(labels, 'cat', labels).codes, dtype=np.int8)
+    return pd.Categorical(labels, dtype=DTYPE).codes.astype(np.int8)
+
+
+def categorical(codes):
+    # int8 codes -> regime column (missing for -1)
+    return pd.Categorical.from_codes(np.asarray(codes, dtype=np.int8), dtype=DTYPE)
+
+
+def classify(growth_delta, inflation_delta, growth_threshold=0.0, inflation_threshold=0.0):
+    """Regime codes from the growth / inflation trends (broadcasts over any shapes).
+
+    Rising means strictly above the threshold, as in the original np.select.
+    Days with a missing trend get -1.
+    """
+    g_up = growth_delta > growth_threshold
+    i_up = inflation_delta > inflation_threshold
+    codes = np.where(g_up, np.where(i_up, 1, 0), np.where(i_up, 2, 3)).astype(np.int8)
+    codes[np.broadcast_to(np.isnan(growth_delta) | np.isnan(inflation_delta), codes.shape)] = -1
+    return codes
+
+
+def trend_grid(level, yoy_windows=YOY_WINDOWS, trend_lags=TREND_LAGS):
+    """(yoy windows x trend lags x months) array of pct_change(k).diff(m) of a monthly level.
+
+    Every YoY rate is computed once and differenced at every lag. Leading
+    axes of `level` (e.g. one row per data vintage) are kept in front.
+    """
+    level = np.asarray(level, dtype=float)
+    lead, n = level.shape[:-1], level.shape[-1]
+
+    yoy = np.full(lead + (len(yoy_windows), n), np.nan)
+    for i, k in enumerate(yoy_windows):
+        yoy[..., i, k:] = level[..., k:] / level[..., :-k] - 1
+
+    out = np.full(lead + (len(yoy_windows), len(trend_lags), n), np.nan)
+    for j, m in enumerate(trend_lags):
+        out[..., j, m:] = yoy[..., m:] - yoy[..., :-m]
+    return out
+
+
+def classifier_grid(cpi, indpro, yoy_windows=YOY_WINDOWS, trend_lags=TREND_LAGS,
+                    growth_thresholds=THRESHOLDS, inflation_thresholds=THRESHOLDS):
+    """int8 regime codes for every (yoy, trend, growth threshold, inflation threshold).
+
+    `cpi` and `indpro` are aligned monthly Series. Returns a dict with `codes`
+    of shape (yoy x trend x growth thr x inflation thr x months), the month
+    `dates` and the parameter lists.
+    """
+    growth = trend_grid(indpro, yoy_windows, trend_lags)[:, :, None, None, :]
+    inflation = trend_grid(cpi, yoy_windows, trend_lags)[:, :, None, None, :]
+    g_thr = np.asarray(growth_thresholds, dtype=float)[None, None, :, None, None]
+    i_thr = np.asarray(inflation_thresholds, dtype=float)[None, None, None, :, None]
+
+    return {
+        'codes': classify(growth, inflation, g_thr, i_thr),
+        'dates': cpi.index.values.astype('datetime64[ns]'),
+        'yoy': np.asarray(yoy_windows), 'trend': np.asarray(trend_lags),
+        'growth': np.asarray(growth_thresholds, dtype=float),
+        'inflation': np.asarray(inflation_thresholds, dtype=float)
+    }
+
+
+def configurations(grid):
+    # One row per (yoy, trend, growth, inflation) cell, in the order of grid['codes'] flattened
+    axes = pd.MultiIndex.from_product([grid['yoy'], grid['trend'], grid['growth'], grid['inflation']],
+                                      names=['yoy', 'trend', 'growth', 'inflation'])
+    return axes.to_frame(index=False)
+
+
+def save_grid(grid, mod_dir):
+    # Cache the labelled grid next to macro_regimes (written aside, then swapped in)
+    path = os.path.join(mod_dir, GRID_FILE)
+    np.savez(path + '.tmp.npz', **grid)
+    os.replace(path + '.tmp.npz', path)
+    return path
+
+
+def load_grid(mod_dir):
+    with np.load(os.path.join(mod_dir, GRID_FILE)) as data:
+        return {key: data[key] for key in data.files}
+
+
+def cell(grid, yoy=12, trend=3, growth=0.0, inflation=0.0):
+    # Index of one configuration in grid['codes'] (all but the month axis)
+    return (np.flatnonzero(grid['yoy'] == yoy)[0], np.flatnonzero(grid['trend'] == trend)[0],
+            np.flatnonzero(np.isclose(grid['growth'], growth))[0],
+            np.flatnonzero(np.isclose(grid['inflation'], inflation))[0])
+
+
+def grid_labels(grid, yoy=12, trend=3, growth=0.0, inflation=0.0):
+    """Monthly regime labels of one configuration, like macro_regimes['Regime'].
+
+    Months without a signal for this configuration are dropped.
+    """
+    codes = grid['codes'][cell(grid, yoy, trend, growth, inflation)]
+    known = codes >= 0
+    return pd.Series(categorical(codes[known]), index=pd.DatetimeIndex(grid['dates'][known], name='date'),
+                     name='Regime')
@@ -0,0 +1,92 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from portfolio import figcache
+
+# Figure rendering for the numbered scripts.
+# Each figure is a job: a builder function from portfolio.figures, the arrays
+# it needs and where to save it. Interactively the jobs are drawn in-process and
+# shown at the end as before. In batch mode (`--batch` on the command line or
+# RENDER_BATCH=1, which the pipeline sets) the Agg backend is used, show() never
+# blocks and the jobs are rasterized side by side in a process pool. Unchanged
+# figures are served from the figure cache (portfolio/figcache.py).
+# With `--no-plots` (or RENDER_PLOTS=0) no job is drawn and matplotlib is never
+# imported: the stage only computes and writes its data outputs.
+PLOTS = '--no-plots' not in sys.argv and os.environ.get('RENDER_PLOTS') != '0'
+BATCH = '--batch' in sys.argv or os.environ.get('RENDER_BATCH') == '1'
+WORKERS = int(os.environ['RENDER_WORKERS']) if os.environ.get('RENDER_WORKERS') else None
+
+
+def _backend():
+    # Agg in batch mode; matplotlib is only imported once there is something to draw
+    if BATCH:
+        import matplotlib
+        matplotlib.use('Agg')
+
+
+def job(builder, path, dpi=300, **data):
+    # One figure: builder(**data) must return the matplotlib Figure
+    return {'builder': builder, 'path': path, 'dpi': dpi, 'data': data}
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _draw(builder, path, dpi, data, close, key=None):
+    import matplotlib.pyplot as plt
+
+    fig = builder(**data)
+    if path is not None:
+        fig.savefig(path, dpi=dpi, bbox_inches='tight')
+        if key is not None:
+            figcache.store(key, path)
+    if close:
+        plt.close(fig)
+    return path
+
+
+def run(jobs, workers=None):
+    """Render every job and return the saved paths in job order.
+
+    Figures whose data, parameters and code are unchanged are copied from the
+    figure cache instead of being rasterized again (interactively they are
+    still drawn for show(), just not saved). A job without a path is only
+    drawn for show(). Scripts that call this in batch mode must keep their
+    work under `if __name__ == '__main__':`, since the pool's workers re-import them.
+    With --no-plots nothing is drawn and no path is returned.
+    """
+    if not PLOTS:
+        print(f"Skipping {len(jobs)} figure(s) (--no-plots)")
+        return []
+    _backend()
+
+    keys = [figcache.key(j['builder'], j['data'], j['dpi']) if j['path'] else None for j in jobs]
+    cached = [k is not None and figcache.fetch(k, j['path']) for j, k in zip(jobs, keys)]
+
+    if not BATCH:
+        # In-process, figures kept open for show()
+        for j, k, hit in zip(jobs, keys, cached):
+            _draw(j['builder'], None if hit else j['path'], j['dpi'], j['data'], close=False, key=k)
+        return [j['path'] for j in jobs]
+
+    todo = [(j, k) for j, k, hit in zip(jobs, keys, cached) if j['path'] and not hit]
+    if len(todo) < 2:
+        for j, k in todo:
+            _draw(j['builder'], j['path'], j['dpi'], j['data'], close=True, key=k)
+    else:
+        workers = min(workers or WORKERS or os.cpu_count() or 1, len(todo))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(_draw, j['builder'], j['path'], j['dpi'], j['data'], True, k) for j, k in todo]
+            for f in futures:
+                f.result()
+    return [j['path'] for j in jobs]
+
+
+def show():
+    # plt.show() unless running headless
+    if PLOTS and not BATCH:
+        import matplotlib.pyplot as plt
+        plt.show()
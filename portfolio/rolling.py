@@ -0,0 +1,123 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# Rolling stock-bond correlation shared by 06 (which persists it), 11, 14 and
+# the daily append mode (17). 24 months of trading days, like the original
+# rolling(504, min_periods=100).corr() calls.
+WINDOW = 504
+MIN_PERIODS = 100
+
+DATASET = 'stock_bond_correlation'
+
+
+def rolling_corr(x, y, window=WINDOW, min_periods=MIN_PERIODS):
+    """Batch pass: rolling correlation of every row from windowed running sums.
+
+    Matches pandas' rolling().corr(): pairs with a missing value are skipped
+    but still take up a slot in the window. The data are centred before the
+    sums are accumulated so the sum-of-squares differences don't cancel.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = ~(np.isnan(x) | np.isnan(y))
+
+    xc = np.where(valid, x - x[valid].mean(), 0.0) if valid.any() else np.zeros_like(x)
+    yc = np.where(valid, y - y[valid].mean(), 0.0) if valid.any() else np.zeros_like(y)
+
+    def window_sum(a):
+        s = np.concatenate([[0.0], np.cumsum(a)])
+        end = np.arange(1, len(a) + 1)
+        return s[end] - s[np.maximum(end - window, 0)]
+
+    n = window_sum(valid.astype(float))
+    sx, sy = window_sum(xc), window_sum(yc)
+    sxx, syy, sxy = window_sum(xc * xc), window_sum(yc * yc), window_sum(xc * yc)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = sxy - sx * sy / n
+        var_x = sxx - sx * sx / n
+        var_y = syy - sy * sy / n
+        corr = cov / np.sqrt(var_x * var_y)
+
+    corr[(n < max(min_periods, 2)) | (var_x <= 0) | (var_y <= 0)] = np.nan
+    return np.clip(corr, -1, 1)
+
+
+class RollingCorrelation:
+    """Online rolling correlation: O(1) per appended day.
+
+    Keeps the last `window` pairs plus Welford-style co-moments (means, sums of
+    squared deviations, sum of cross deviations), so adding the new day and
+    evicting the oldest one never revisits the rest of the window.
+    """
+
+    def __init__(self, window=WINDOW, min_periods=MIN_PERIODS):
+        self.window = window
+        self.min_periods = min_periods
+        self._pairs = deque()
+        self._n = 0
+        self._mean_x = self._mean_y = 0.0
+        self._m2_x = self._m2_y = self._c_xy = 0.0
+
+    def _add(self, x, y):
+        self._n += 1
+        dx = x - self._mean_x
+        self._mean_x += dx / self._n
+        dy = y - self._mean_y
+        self._mean_y += dy / self._n
+        self._m2_x += dx * (x - self._mean_x)
+        self._m2_y += dy * (y - self._mean_y)
+        self._c_xy += dx * (y - self._mean_y)
+
+    def _remove(self, x, y):
+        if self._n == 1:
+            self._n = 0
+            self._mean_x = self._mean_y = 0.0
+            self._m2_x = self._m2_y = self._c_xy = 0.0
+            return
+        self._n -= 1
+        dx = x - self._mean_x
+        self._mean_x -= dx / self._n
+        dy = y - self._mean_y
+        self._mean_y -= dy / self._n
+        self._m2_x -= dx * (x - self._mean_x)
+        self._m2_y -= dy * (y - self._mean_y)
+        self._c_xy -= dx * (y - self._mean_y)
+
+    def update(self, x, y):
+        # Append one day and return the correlation of the window ending on it
+        x, y = float(x), float(y)
+        valid = not (np.isnan(x) or np.isnan(y))
+        self._pairs.append((x, y, valid))
+        if valid:
+            self._add(x, y)
+
+        if len(self._pairs) > self.window:
+            old_x, old_y, old_valid = self._pairs.popleft()
+            if old_valid:
+                self._remove(old_x, old_y)
+        return self.value
+
+    def extend(self, xs, ys):
+        return np.array([self.update(x, y) for x, y in zip(xs, ys)])
+
+    @property
+    def value(self):
+        if self._n < max(self.min_periods, 2) or self._m2_x <= 0 or self._m2_y <= 0:
+            return np.nan
+        return min(max(self._c_xy / np.sqrt(self._m2_x * self._m2_y), -1.0), 1.0)
+
+    @classmethod
+    def from_history(cls, x, y, window=WINDOW, min_periods=MIN_PERIODS):
+        # Seed from the last `window` days only: everything older has left the window
+        kernel = cls(window, min_periods)
+        kernel.extend(np.asarray(x)[-window:], np.asarray(y)[-window:])
+        return kernel
+
+
+def correlation_frame(returns, window=WINDOW, min_periods=MIN_PERIODS):
+    # Persisted layout: one 'Correlation' column, days before min_periods dropped
+    corr = rolling_corr(returns['Stock_Returns'], returns['Bond_Returns'], window, min_periods)
+    return pd.DataFrame({'Correlation': corr}, index=returns.index).dropna()
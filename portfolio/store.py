@@ -0,0 +1,207 @@
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Binary columnar copies of the modified_data datasets.
+# Each dataset lives in modified_data/columnar/<name>/ as one .npy file per
+# column plus a datetime64 index, so readers can memory-map just the columns
+# they need instead of re-parsing the CSV. The CSV stays the human-readable export.
+# Categorical columns (e.g. Regime) are written as integer codes with their
+# labels in the metadata. STORE_PRECISION=float32 writes the numeric columns
+# (returns, equity, prices) in single precision, for half the disk and memory.
+STORE_DIR = 'columnar'
+FLOAT_DTYPE = np.dtype(os.environ.get('STORE_PRECISION', 'float64'))
+META_FILE = '_meta.json'
+INDEX_FILE = '_index.npy'
+
+
+def _dataset_dir(mod_dir, name):
+    return os.path.join(mod_dir, STORE_DIR, name)
+
+
+def save(df, mod_dir, name):
+    # Write the CSV export and its columnar copy side by side
+    df.to_csv(os.path.join(mod_dir, f'{name}.csv'))
+    write_columns(df, mod_dir, name)
+
+
+def _save_npy(path, arr):
+    # Write next to the target and swap it in, so readers still mapping the old
+    # file (e.g. a frame loaded from this dataset being saved back) are unaffected
+    np.save(path + '.tmp.npy', arr)
+    os.replace(path + '.tmp.npy', path)
+
+
+def _code_dtype(categories):
+    return np.int8 if len(categories) < 128 else np.int32
+
+
+def write_columns(df, mod_dir, name):
+    path = _dataset_dir(mod_dir, name)
+    os.makedirs(path, exist_ok=True)
+
+    index = pd.DatetimeIndex(df.index)
+    _save_npy(os.path.join(path, INDEX_FILE), index.values.astype('datetime64[ns]'))
+
+    columns = []
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        file_name = f'{i:03d}.npy'
+
+        spec = {'name': col, 'file': file_name}
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Codes + labels; -1 = missing
+            categories = values.cat.categories.tolist()
+            spec.update(kind='category', categories=categories)
+            arr = values.cat.codes.to_numpy().astype(_code_dtype(categories))
+        elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            spec.update(kind='float', dtype=FLOAT_DTYPE.name)
+            arr = values.to_numpy(dtype=FLOAT_DTYPE)
+        else:
+            # Other labels as fixed-width unicode so they can be mapped too; '' = missing
+            spec.update(kind='str')
+            arr = values.astype(object).where(values.notna(), '').to_numpy(dtype=str)
+
+        _save_npy(os.path.join(path, file_name), arr)
+        columns.append(spec)
+
+    # Metadata goes last: a dataset only counts as written once it exists
+    with open(os.path.join(path, META_FILE), 'w') as f:
+        json.dump({'index': index.name, 'rows': len(index), 'columns': columns}, f, indent=1)
+
+
+def _is_fresh(mod_dir, name):
+    # The columnar copy is only trusted if it is at least as new as the CSV
+    meta_path = os.path.join(_dataset_dir(mod_dir, name), META_FILE)
+    csv_path = os.path.join(mod_dir, f'{name}.csv')
+    if not os.path.exists(meta_path):
+        return False
+    return not os.path.exists(csv_path) or os.path.getmtime(meta_path) >= os.path.getmtime(csv_path)
+
+
+def load(mod_dir, name, columns=None):
+    """Load a modified_data dataset, projecting `columns` (default: all).
+
+    Uses the memory-mapped columnar copy when it is up to date, otherwise
+    falls back to parsing the CSV.
+    """
+    if not _is_fresh(mod_dir, name):
+        usecols = None if columns is None else ['date'] + list(columns)
+        df = pd.read_csv(os.path.join(mod_dir, f'{name}.csv'), index_col='date',
+                         parse_dates=True, usecols=usecols)
+        return df if columns is None else df[list(columns)]
+
+    path = _dataset_dir(mod_dir, name)
+    with open(os.path.join(path, META_FILE)) as f:
+        meta = json.load(f)
+
+    by_name = {c['name']: c for c in meta['columns']}
+    wanted = list(by_name) if columns is None else list(columns)
+    missing = [c for c in wanted if c not in by_name]
+    if missing:
+        raise KeyError(f"{missing} not in dataset '{name}'")
+
+    data = {}
+    for col in wanted:
+        spec = by_name[col]
+        arr = np.load(os.path.join(path, spec['file']), mmap_mode='r')
+        if spec['kind'] == 'str':
+            arr = pd.Series(arr.astype(object)).replace('', np.nan).to_numpy()
+        elif spec['kind'] == 'category':
+            arr = pd.Categorical.from_codes(arr, categories=spec['categories'])
+        data[col] = arr
+
+    index = pd.DatetimeIndex(np.load(os.path.join(path, INDEX_FILE), mmap_mode='r'), name=meta['index'])
+    return pd.DataFrame(data, index=index, columns=wanted, copy=False)
+
+
+def _append_npy(path, values):
+    # Grow a 1-D .npy file in place: patch the shape in the header, write the new
+    # rows at the end. Falls back to a full rewrite if the dtype has to widen.
+    with open(path, 'r+b') as f:
+        version = np.lib.format.read_magic(f)
+        read_header, write_header = {
+            (1, 0): (np.lib.format.read_array_header_1_0, np.lib.format.write_array_header_1_0),
+            (2, 0): (np.lib.format.read_array_header_2_0, np.lib.format.write_array_header_2_0),
+        }[version]
+        shape, fortran, dtype = read_header(f)
+        header_len = f.tell()
+        values = np.asarray(values)
+
+        if values.dtype.kind == dtype.kind and values.dtype.itemsize <= dtype.itemsize:
+            # The header is padded to a fixed block, so a longer shape usually fits in
+            # place; it is only written over the old one if it has the same length
+            header = io.BytesIO()
+            write_header(header, {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': fortran,
+                                  'shape': (shape[0] + len(values),)})
+            if len(header.getvalue()) == header_len:
+                f.seek(0)
+                f.write(header.getvalue())
+                f.seek(0, os.SEEK_END)
+                f.write(values.astype(dtype).tobytes())
+                return
+
+    _save_npy(path, np.concatenate([np.load(path), values]))
+
+
+def _category_codes(values, categories, name, col):
+    # Codes of the labels in the stored categories; a label outside them is an error
+    codes = pd.Categorical(values, categories=categories).codes
+    if (values.notna().to_numpy() & (codes < 0)).any():
+        raise ValueError(f"Column {col!r} of '{name}' has labels outside {categories}")
+    return codes.astype(_code_dtype(categories))
+
+
+def _read_meta(mod_dir, name):
+    path = os.path.join(_dataset_dir(mod_dir, name), META_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def append(df, mod_dir, name):
+    """Append rows to a dataset without rewriting it: CSV lines are added at
+    the end and each columnar .npy file grows in place.
+    """
+    fresh = _is_fresh(mod_dir, name)
+    meta = _read_meta(mod_dir, name)
+    if not fresh:
+        # No usable binary copy: build it from the extended CSV (keeping categorical columns).
+        # Labels are still checked against the stored categories before the CSV grows.
+        for spec in (meta or {}).get('columns', []):
+            if spec['kind'] == 'category' and spec['name'] in df:
+                _category_codes(df[spec['name']], spec['categories'], name, spec['name'])
+        df.to_csv(os.path.join(mod_dir, f'{name}.csv'), mode='a', header=False)
+        extended = load(mod_dir, name)
+        for col in df.columns[[isinstance(t, pd.CategoricalDtype) for t in df.dtypes]]:
+            extended[col] = extended[col].astype(df[col].dtype)
+        write_columns(extended, mod_dir, name)
+        return
+
+    path = _dataset_dir(mod_dir, name)
+
+    # Convert every column first, so rows that do not fit are rejected before anything is written
+    arrays = []
+    for spec in meta['columns']:
+        values = df[spec['name']]
+        if spec['kind'] == 'str':
+            values = values.astype(object).where(values.notna(), '').to_numpy(dtype=str)
+        elif spec['kind'] == 'category':
+            values = _category_codes(values, spec['categories'], name, spec['name'])
+        else:
+            # Same precision as the stored column
+            values = values.to_numpy(dtype=spec.get('dtype', 'float64'))
+        arrays.append((spec['file'], values))
+
+    df.to_csv(os.path.join(mod_dir, f'{name}.csv'), mode='a', header=False)
+    _append_npy(os.path.join(path, INDEX_FILE), pd.DatetimeIndex(df.index).values.astype('datetime64[ns]'))
+    for file_name, values in arrays:
+        _append_npy(os.path.join(path, file_name), values)
+
+    meta['rows'] += len(df)
+    with open(os.path.join(path, META_FILE), 'w') as f:
+        json.dump(meta, f, indent=1)
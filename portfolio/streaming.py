@@ -0,0 +1,154 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from portfolio import backtest, bonds, universe, vintages
+from portfolio.regimes import categorical, encode
+
+# Append mode for the consolidated dataset.
+# Instead of recomputing every cumprod and the rebasing over the full history,
+# the running state (last equity per sleeve, running peak, regime in force) is
+# kept in modified_data/daily_state.json and each new day costs O(1).
+# Extending from the last *rebased* equity carries the April-1971 rebase
+# factors along implicitly. The state also records the last row of the
+# consolidated dataset it continues (fingerprint), so a full 01 -> 06 rebuild
+# that changed the history is noticed and the state re-seeded from it.
+# The appended rows match a rebuild on the same data, but a later rebuild can
+# rewrite them: a day's regime is the latest month 03 has classified, while
+# 05 applies a month's regime from its first day once it is classified, and
+# days dropped for want of a commodity / oil print come back once it is out.
+STATE_FILE = 'daily_state.json'
+
+# Same column layout as consolidated_portfolio_rebased (06)
+COLUMNS = ['Dynamic_Equity', '60_40_Equity', 'Stock_Equity', 'Bond_Equity',
+           'Stock_Returns', 'Bond_Returns', '60_40_Returns', 'Dynamic_Returns', 'Regime']
+
+EQUITY = {
+    'Dynamic_Returns': 'Dynamic_Equity',
+    '60_40_Returns': '60_40_Equity',
+    'Stock_Returns': 'Stock_Equity',
+    'Bond_Returns': 'Bond_Equity'
+}
+
+def _asof(series, dates):
+    # Value of a sparse (e.g. monthly) series in force on each date
+    pos = vintages.asof(series.index.values, pd.DatetimeIndex(dates).values)
+    values = series.to_numpy()[np.maximum(pos, 0)]
+    return np.where(pos >= 0, values, np.nan)
+
+
+def fingerprint(master):
+    # Last date and equities of the consolidated dataset
+    return {'date': str(master.index[-1].date()),
+            'equity': {col: float(master[col].iloc[-1]) for col in EQUITY.values()}}
+
+
+def init_state(master, macro_regime):
+    # One-time O(n) pass over the existing consolidated dataset
+    last_date = master.index[-1]
+    regime = _asof(macro_regime, pd.DatetimeIndex([last_date]))[0]
+    return {
+        'last_date': str(last_date.date()),
+        'equity': {col: float(master[col].iloc[-1]) for col in EQUITY.values()},
+        'peak': {col: float(master[col].max()) for col in EQUITY.values()},
+        'regime': regime if isinstance(regime, str) else None,
+        'master': fingerprint(master)
+    }
+
+
+def load_state(mod_dir):
+    path = os.path.join(mod_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(state, mod_dir):
+    path = os.path.join(mod_dir, STATE_FILE)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(state, f, indent=1)
+    os.replace(path + '.tmp', path)
+
+
+def extend(state, stocks, yields, commodities, oil, macro_regime, mapping=backtest.MAPPING):
+    """Compute the consolidated rows for every trading day after the state.
+
+    `stocks` are CRSP daily returns, `yields` the DGS10 series (percent),
+    `commodities` / `oil` the monthly PPIACO / WTISPLC prints and
+    `macro_regime` the monthly regime labels from 03. The Dynamic return goes
+    through the allocation engine of 05 (backtest.weight_matrix / allocate,
+    daily-rebalanced weights), so any `mapping` valid there works here.
+    Returns (new rows, drawdowns, updated state).
+    """
+    last = pd.Timestamp(state['last_date'])
+
+    # Benchmark rows: CRSP trading days that FRED also lists (the inner join in 01)
+    dates = stocks.index[stocks.index > last]
+    dates = dates[dates.isin(yields.index)]
+    if len(dates) == 0:
+        return pd.DataFrame(columns=COLUMNS), pd.DataFrame(columns=list(EQUITY.values())), state
+
+    # Bonds: the par bond of 01, repriced against the previous FRED observation
+    pos = yields.index.get_indexer(dates)
+    y = yields.to_numpy() / 100
+    y_prev = np.where(pos > 0, y[pos - 1], np.nan)
+    bond = bonds.holding_return(y_prev, y[pos], bonds.MATURITIES[bonds.BENCHMARK])
+
+    stock = stocks.loc[dates].to_numpy()
+
+    # Commodities / Oil: 04's daily held prints and 05's returns on them, from the print in
+    # force the day before the first new day. Past the last print they are missing, as in
+    # a rebuild, so a day holding them is dropped rather than booked flat
+    def recent(prints):
+        return prints.iloc[max(prints.index.searchsorted(dates[0] - pd.Timedelta(days=1), side='right') - 1, 0):]
+
+    alts = universe.alternatives({'commodities': recent(commodities), 'oil': recent(oil)})
+    alt_returns = alts.pct_change().reindex(dates).to_numpy()
+
+    sleeves = {'Stocks': stock, 'Bonds': bond, '60/40': 0.60 * stock + 0.40 * bond,
+               'Commodities': alt_returns[:, 0], 'Oil': alt_returns[:, 1]}
+
+    # Regime signal lagged one row: the label in force on the previous benchmark day
+    in_force = _asof(macro_regime, dates)
+    signal = np.concatenate([[state['regime']], in_force[:-1]])
+    codes = encode(signal)
+
+    names = list(backtest.SLEEVES)
+    dynamic = backtest.allocate(np.column_stack([sleeves[n] for n in names]), backtest.one_hot(codes),
+                                backtest.weight_matrix(mapping, names))
+
+    returns = pd.DataFrame({
+        'Stock_Returns': stock,
+        'Bond_Returns': bond,
+        '60_40_Returns': sleeves['60/40'],
+        'Dynamic_Returns': dynamic
+    }, index=pd.DatetimeIndex(dates, name='date'))
+
+    # The full rebuild compounds every benchmark day (cumprod skips gaps) but only
+    # keeps days with a complete record, so a kept day's return can span a dropped one
+    keep = returns.notna().all(axis=1).to_numpy() & (codes >= 0)
+
+    regime = in_force[-1] if isinstance(in_force[-1], str) else None
+    new_state = {'last_date': str(dates[-1].date()), 'equity': dict(state['equity']),
+                 'peak': dict(state['peak']), 'regime': regime, 'master': state.get('master')}
+
+    rows = pd.DataFrame(index=returns.index[keep])
+    drawdowns = pd.DataFrame(index=rows.index)
+    for ret_col, eq_col in EQUITY.items():
+        growth = np.cumprod(1 + returns[ret_col].fillna(0).to_numpy())
+        equity = state['equity'][eq_col] * growth[keep]
+        peak = np.maximum(state['peak'][eq_col], np.maximum.accumulate(equity))
+
+        rows[eq_col] = equity
+        rows[ret_col] = equity / np.concatenate([[state['equity'][eq_col]], equity[:-1]]) - 1
+        drawdowns[eq_col] = equity / peak - 1
+
+        if len(equity):
+            new_state['equity'][eq_col] = float(equity[-1])
+            new_state['peak'][eq_col] = float(peak[-1])
+
+    rows['Regime'] = categorical(codes[keep])
+    return rows[COLUMNS], drawdowns, new_state
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+
+from portfolio import backtest, downsample, drawdown, figures, metrics, render, rolling
+
+# In-memory tear sheets.
+# build() takes a daily returns panel (one column per strategy) and computes
+# everything the executive dashboard shows in one go: equity, drawdowns,
+# the overall metrics table and turnover / friction; the rolling stock-bond
+# correlation is passed in (06 persists it) or computed here. job() lays the
+# dashboard out from that one results dict for any list of strategies, so no
+# stage has to round-trip through results CSVs.
+COST_PER_TRADE = 0.0010   # 10 bps per unit of one-way turnover (a full switch = 1), as in 05
+COLORS = ['purple', 'gray', 'green', 'red', 'orange', 'blue', 'brown', 'teal']
+
+
+def turnover(returns, exposures=None, cost_per_trade=COST_PER_TRADE, periods=252):
+    """Switches, turnover and gross / net CAGR per strategy (05's cost model).
+
+    `exposures` maps every strategy that trades to its (days x sleeves)
+    target weights, e.g. backtest.exposure(regime); the others count as
+    buy-and-hold. Each strategy enters from cash on the first day and pays
+    cost_per_trade * turnover at the open of every trading day, compounded
+    with its returns, as in 05's cost surface.
+    """
+    years = len(returns) / periods
+    gross = pd.Series(np.nan, index=returns.columns)
+    net = gross.copy()
+    traded = pd.DataFrame(0.0, index=returns.index, columns=returns.columns)
+
+    for name in returns.columns:
+        if exposures is not None and name in exposures:
+            weights = np.asarray(exposures[name], dtype=float)
+            traded[name] = backtest.turnover(np.vstack([np.zeros((1, weights.shape[1])), weights]))[1:]
+        net_returns = backtest.net_of_costs(returns[name].fillna(0), traded[name], [0, cost_per_trade])
+        gross[name], net[name] = np.prod(1 + net_returns, axis=0) ** (1 / years) - 1
+
+    return pd.DataFrame({
+        'Trading Years': years,
+        'Switches': (traded > 0).sum(),
+        'Turnover Per Year': traded.sum() / years,
+        'Gross CAGR': gross,
+        'Net CAGR': net,
+        'Cost Drag (CAGR)': gross - net
+    })
+
+
+def build(returns, rf=None, exposures=None, regime=None, corr=None, pair=('Stocks', 'Bonds'),
+          cost_per_trade=COST_PER_TRADE, periods=252):
+    """Results dict for a returns panel.
+
+    `rf` is the daily risk-free return (0 if None), `exposures` as in
+    turnover(), `regime` the daily regime labels (for the Stagflation
+    shading) and `corr` the rolling correlation to show, e.g. the persisted
+    rolling.DATASET. Without it, the correlation of the two `pair` columns
+    is computed here.
+    """
+    equity = (1 + returns.fillna(0)).cumprod()
+    clean = returns.dropna()
+    rf = rf.reindex(clean.index).ffill().fillna(0) if rf is not None else pd.Series(0.0, index=clean.index)
+
+    sheet = {
+        'equity': equity,
+        'drawdown': drawdown.underwater(equity),
+        'metrics': metrics.overall(clean, clean.sub(rf, axis=0), periods),
+        'turnover': turnover(returns, exposures, cost_per_trade, periods),
+        'correlation': None,
+        'regime': regime.reindex(returns.index, method='ffill') if regime is not None else None
+    }
+    if corr is not None:
+        sheet['correlation'] = corr.dropna()
+    elif pair and set(pair) <= set(returns.columns):
+        corr = rolling.rolling_corr(returns[pair[0]], returns[pair[1]])
+        sheet['correlation'] = pd.Series(corr, index=returns.index).dropna()
+    return sheet
+
+
+def table(sheet, strategies):
+    # Display strings for the dashboard: metrics + turnover, one row per strategy
+    stats = sheet['metrics'].loc[strategies].astype(object)
+    stats['Annual Turnover'] = [f"{x:.2f}x" for x in sheet['turnover'].loc[strategies, 'Turnover Per Year']]
+    stats['Net CAGR'] = sheet['turnover'].loc[strategies, 'Net CAGR']
+    return stats.map(lambda val: f"{val:.2%}" if isinstance(val, (int, float)) else str(val))
+
+
+def job(sheet, path, strategies, title, labels=None, colors=None):
+    """Render job for the executive dashboard of `strategies`.
+
+    The first strategy is drawn solid with a filled drawdown, the rest as
+    comparisons. `labels` maps a strategy to (legend label, short label).
+    """
+    labels = labels or {}
+    colors = colors or dict(zip(strategies, COLORS))
+
+    # Optional min/max reduction to the panels' pixel width (--downsample)
+    equity, dd = sheet['equity'][strategies], sheet['drawdown'][strategies]
+    curves = downsample.frame(equity.join(dd, rsuffix='_DD'), 20)
+
+    corr = sheet['correlation']
+    if corr is None:
+        corr = pd.Series(np.nan, index=equity.index[:0])
+    stagflation = (sheet['regime'].reindex(corr.index) == 'Stagflation') if sheet['regime'] is not None \
+        else pd.Series(False, index=corr.index)
+    corr_plot = downsample.frame(pd.DataFrame({'Correlation': corr, 'Stagflation': stagflation}), 10)
+
+    lines = []
+    for name in strategies:
+        label, short = labels.get(name, (name, name))
+        lines.append({'label': label, 'short': short, 'color': colors[name],
+                      'equity': curves[name].to_numpy(), 'drawdown': curves[f'{name}_DD'].to_numpy()})
+
+    return render.job(figures.dashboard, path,
+                      dates=curves.index.values, lines=lines,
+                      corr_dates=corr_plot.index.values,
+                      corr=corr_plot['Correlation'].to_numpy(),
+                      stagflation=corr_plot['Stagflation'].to_numpy(),
+                      table=table(sheet, strategies), title=title)
@@ -0,0 +1,235 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from portfolio import backtest, bonds, fetch, metrics, regimes, store
+
+# The benchmark -> regime -> backtest -> metrics chain (01, 03-08) as functions
+# of one "universe": a market's stock returns, bond yields, commodity and oil
+# prices, CPI / INDPRO and T-bill rate. A universe is a dict with a name and
+# its data source, one of
+#   'series': {role: series id} read from the raw_data/ store (fetch.SERIES),
+#   'dir':    a folder with one <role>.csv (date, value) per role,
+#   'data':   {role: pd.Series} already in memory (e.g. synthetic()),
+# plus optional 'maturity' (bond years) and 'mapping' (regime -> allocation).
+# Nothing here reads base_dir: every output goes under the directory passed
+# to run(), so many universes can run side by side in a process pool.
+# The stage functions are the one implementation of that chain: 01 and 03-08
+# call them on the US universe and only add their own reports and figures.
+ROLES = ['stocks', 'yields', 'commodities', 'oil', 'cpi', 'indpro', 'rf']
+
+US = {
+    'name': 'us',
+    'series': {'stocks': 'sprtrn', 'yields': 'DGS10', 'commodities': 'PPIACO', 'oil': 'WTISPLC',
+               'cpi': 'CPIAUCSL', 'indpro': 'INDPRO', 'rf': 'DTB3'},
+}
+
+WORKERS = int(os.environ['UNIVERSE_WORKERS']) if os.environ.get('UNIVERSE_WORKERS') else None
+
+
+def from_dir(path, **spec):
+    # Universe served from a folder of <role>.csv files, named after the folder
+    return {'name': os.path.basename(os.path.normpath(path)), 'dir': path, **spec}
+
+
+def synthetic(name, seed, start='1970-01-01', end='2024-12-31'):
+    """Universe of random but plausible data (for testing the framework at scale).
+
+    Daily stock returns and yields on business days, monthly prices and
+    macro levels with persistent trends, all reproducible from `seed`.
+    """
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range(start, end, name='date')
+    months = pd.date_range(start, end, freq='MS', name='date')
+
+    def monthly_level(drift, vol, persistence=0.9):
+        shocks = rng.normal(0, vol, len(months))
+        growth = np.empty(len(months))
+        growth[0] = drift
+        for t in range(1, len(months)):
+            growth[t] = drift + persistence * (growth[t - 1] - drift) + shocks[t]
+        return pd.Series(100 * np.exp(np.cumsum(growth)), index=months)
+
+    yields = np.clip(6 + np.cumsum(rng.normal(0, 0.06, len(days))), 0.1, None)
+    return {'name': name, 'data': {
+        'stocks': pd.Series(rng.normal(0.0003, 0.01, len(days)), index=days),
+        'yields': pd.Series(yields, index=days),
+        'commodities': monthly_level(0.003, 0.01),
+        'oil': monthly_level(0.004, 0.06),
+        'cpi': monthly_level(0.003, 0.002),
+        'indpro': monthly_level(0.002, 0.006),
+        'rf': pd.Series(np.clip(yields - 1.5, 0, None), index=days),
+    }}
+
+
+def load(universe, raw_dir=None, roles=ROLES):
+    # {role: series} for the given roles of the universe (default: all)
+    if 'data' in universe:
+        return {role: universe['data'][role] for role in roles}
+    if 'dir' in universe:
+        data = {}
+        for role in roles:
+            df = pd.read_csv(os.path.join(universe['dir'], f'{role}.csv'), index_col='date', parse_dates=True)
+            data[role] = df.iloc[:, 0]
+        return data
+    series = universe['series']
+    raw = fetch.load([series[role] for role in roles], raw_dir)
+    return {role: raw[series[role]] for role in roles}
+
+
+# ==========================================
+# Stages
+# ==========================================
+def benchmark(data, maturity=bonds.MATURITIES[bonds.BENCHMARK]):
+    # 01: stocks, constant-maturity par bonds and the 60/40
+    stocks = data['stocks'].to_frame(name='Stock_Returns')
+    yields = data['yields'].to_frame(name='Bond_Returns')
+    bond_returns = bonds.par_returns(yields, [maturity])
+
+    df = pd.merge(stocks, bond_returns, left_index=True, right_index=True, how='inner')
+    df['60_40_Returns'] = (0.60 * df['Stock_Returns']) + (0.40 * df['Bond_Returns'])
+    df['Stock_Equity'] = (1 + df['Stock_Returns']).cumprod()
+    df['Bond_Equity'] = (1 + df['Bond_Returns']).cumprod()
+    df['60_40_Equity'] = (1 + df['60_40_Returns']).cumprod()
+    df.index.name = 'date'
+    return df
+
+
+def macro_signals(data, yoy=12, trend=3):
+    # 03: CPI / INDPRO on their common months, with YoY rates and their trends
+    macro = pd.merge(data['cpi'].to_frame(name='CPI'), data['indpro'].to_frame(name='INDPRO'),
+                     left_index=True, right_index=True, how='inner')
+    macro.index.name = 'date'
+    macro['Inflation_YoY'] = macro['CPI'].pct_change(yoy, fill_method=None)
+    macro['Growth_YoY'] = macro['INDPRO'].pct_change(yoy, fill_method=None)
+    macro['Inflation_Delta'] = macro['Inflation_YoY'].diff(trend)
+    macro['Growth_Delta'] = macro['Growth_YoY'].diff(trend)
+    return macro
+
+
+def macro_regimes(data, yoy=12, trend=3, growth=0.0, inflation=0.0, grid=None):
+    """03: monthly signals and regime labels of one classifier configuration.
+
+    The labels are that configuration's cell of `grid` (regimes.classifier_grid
+    on the same CPI / INDPRO), or of a one-cell grid if none is given.
+    """
+    macro = macro_signals(data, yoy, trend)
+    if grid is None:
+        grid = regimes.classifier_grid(macro['CPI'], macro['INDPRO'], [yoy], [trend], [growth], [inflation])
+    macro['Regime'] = regimes.grid_labels(grid, yoy, trend, growth, inflation)
+    return macro.dropna()
+
+
+def alternatives(data):
+    # 04: monthly commodity / oil prices held daily
+    alts = pd.merge(data['commodities'].to_frame(name='Commodities_Price'), data['oil'].to_frame(name='Oil_Price'),
+                    left_index=True, right_index=True, how='outer')
+    alts = alts.resample('D').ffill().dropna()
+    alts.index.name = 'date'
+    return alts
+
+
+def risk_free(data):
+    # 07: daily geometric T-bill return
+    rf = (np.power(1 + data['rf'] / 100, 1 / 252) - 1).to_frame(name='Risk_Free_Return')
+    rf.index.name = 'date'
+    return rf
+
+
+def strategy(bench, alts, macro, mapping=backtest.MAPPING, drift=False, released=None):
+    # 05: every aligned day, with the regime-switching strategy and the 60/40 (unknown regime -> cash)
+    df = backtest.align_inputs(bench, alts, macro, released)
+    probs = backtest.one_hot(regimes.encode(df['Regime']))
+    df['Dynamic_Returns'] = backtest.allocate(df[list(backtest.SLEEVES.values())], probs,
+                                              backtest.weight_matrix(mapping, list(backtest.SLEEVES)), drift=drift)
+    df['Dynamic_Equity'] = (1 + df['Dynamic_Returns']).cumprod()
+    df['60_40_Equity'] = (1 + df['60_40_Returns']).cumprod()
+    return df
+
+
+def backtest_results(df):
+    # 05: the saved rows, days with a regime and both strategies
+    return df[['Regime', 'Dynamic_Returns', 'Dynamic_Equity', '60_40_Returns', '60_40_Equity']].dropna()
+
+
+def dynamic(bench, alts, macro, mapping=backtest.MAPPING, drift=False, released=None):
+    return backtest_results(strategy(bench, alts, macro, mapping, drift, released))
+
+
+def consolidate(final, bench):
+    # 06: every equity curve rebased to $1 on the first backtest day, returns from the rebased curves
+    df = final[['Dynamic_Equity', '60_40_Equity']].join(bench[['Stock_Equity', 'Bond_Equity']], how='inner')
+    df = df / df.iloc[0]
+    df = df[['Dynamic_Equity', '60_40_Equity', 'Stock_Equity', 'Bond_Equity']]
+    for equity, ret in [('Stock_Equity', 'Stock_Returns'), ('Bond_Equity', 'Bond_Returns'),
+                        ('60_40_Equity', '60_40_Returns'), ('Dynamic_Equity', 'Dynamic_Returns')]:
+        df[ret] = df[equity].pct_change()
+    return df.join(final[['Regime']], how='left')
+
+
+def performance(master, rf):
+    # 08: overall table and {regime: table}
+    strategies = {'Dynamic': 'Dynamic_Returns', '60/40': '60_40_Returns',
+                  'Stocks': 'Stock_Returns', 'Bonds': 'Bond_Returns'}
+    df = master[list(strategies.values()) + ['Regime']].join(rf, how='left').ffill().dropna()
+    returns = df[list(strategies.values())].set_axis(list(strategies), axis=1)
+    excess = returns.sub(df['Risk_Free_Return'], axis=0)
+
+    overall = metrics.overall(returns, excess)
+    return overall, metrics.by_group(returns, excess, regimes.encode(df['Regime']), regimes.REGIMES)
+
+
+# ==========================================
+# Driver
+# ==========================================
+def run(universe, out_dir, data=None, raw_dir=None):
+    """Every stage for one universe; outputs go to out_dir/<name>/{modified_data,results}.
+
+    Returns the overall metrics table with the universe name as the outer index level.
+    """
+    data = data if data is not None else load(universe, raw_dir)
+    mod_dir = os.path.join(out_dir, universe['name'], 'modified_data')
+    results_dir = os.path.join(out_dir, universe['name'], 'results')
+    for path in [mod_dir, results_dir]:
+        os.makedirs(path, exist_ok=True)
+
+    bench = benchmark(data, universe.get('maturity', bonds.MATURITIES[bonds.BENCHMARK]))
+    macro = macro_regimes(data)
+    alts = alternatives(data)
+    rf = risk_free(data)
+    final = dynamic(bench, alts, macro, universe.get('mapping', backtest.MAPPING))
+    master = consolidate(final, bench)
+    overall, by_regime = performance(master, rf)
+    by_regime = pd.concat(by_regime, axis=0)
+
+    for df, name in [(bench, 'benchmark_portfolio'), (macro, 'macro_regimes'), (alts, 'alternative_assets'),
+                     (rf, 'risk_free_daily'), (final, 'final_backtest_results'),
+                     (master, 'consolidated_portfolio_rebased')]:
+        store.save(df, mod_dir, name)
+    overall.to_csv(os.path.join(results_dir, 'metrics_overall_comprehensive.csv'))
+    by_regime.to_csv(os.path.join(results_dir, 'metrics_regime_comprehensive.csv'))
+
+    return pd.concat({universe['name']: overall}, names=['Universe', 'Strategy'])
+
+
+def run_many(universes, out_dir, raw_dir=None, workers=None):
+    """run() for every universe, spread over a process pool.
+
+    The data are loaded in the parent first (so downloads into raw_data/ never
+    race), then each universe runs in its own process. Returns the stacked
+    overall metrics of all universes.
+    """
+    names = [u['name'] for u in universes]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Universe names must be unique: {names}")
+    data = [load(u, raw_dir) for u in universes]
+
+    if len(universes) < 2:
+        parts = [run(u, out_dir, d) for u, d in zip(universes, data)]
+    else:
+        workers = min(workers or WORKERS or os.cpu_count() or 1, len(universes))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(run, universes, [out_dir] * len(universes), data))
+    return pd.concat(parts)
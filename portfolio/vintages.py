@@ -0,0 +1,135 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from portfolio import fetch, regimes
+
+# Point-in-time store for the revised monthly macro series (CPI, INDPRO).
+# Every print is one row: the observation month (date), the day it was
+# published (release) and the value published that day, so a revision is
+# another row for the same date. With the rows sorted by release, "what was
+# known on day t" is one searchsorted over the release dates for all days at
+# once (asof(), which 05 and 17 use to put the regimes on trading days),
+# instead of a filter of the whole table per day.
+# ALFRED's release history only starts in the 1990s, so the first stored print
+# of an observation counts as released no later than RELEASE_LAG_DAYS after
+# the observation month; series without a stored history get that nominal
+# release for every month (first_release).
+COLUMNS = ['date', 'release', 'value']
+RELEASE_LAG_DAYS = 45   # CPI and INDPRO for month M come out mid-month M+1
+
+
+def table(df):
+    # Normalise to COLUMNS, sorted by release (then observation date)
+    df = pd.DataFrame(df)[COLUMNS].copy()
+    df['date'] = pd.to_datetime(df['date'])
+    df['release'] = pd.to_datetime(df['release'])
+    df['value'] = pd.to_numeric(df['value'], errors='coerce')
+    df = df.dropna(subset=['value'])
+    return df.sort_values(['release', 'date'], kind='stable').reset_index(drop=True)
+
+
+def cap_first_release(df, lag_days=RELEASE_LAG_DAYS):
+    # The first print of each observation is dated no later than the nominal release
+    first = ~df['date'].duplicated()
+    nominal = df['date'] + pd.Timedelta(days=lag_days)
+    return table(df.assign(release=df['release'].where(~first | (df['release'] <= nominal), nominal)))
+
+
+def first_release(series, lag_days=RELEASE_LAG_DAYS):
+    # Release table of a plain (latest vintage) series: one print per month, no revisions
+    series = series.dropna()
+    return table({'date': series.index, 'release': series.index + pd.Timedelta(days=lag_days),
+                  'value': series.to_numpy()})
+
+
+# ==========================================
+# Store (raw_data/alfred_*_vintages.csv)
+# ==========================================
+def _path(raw_dir, series_id):
+    return os.path.join(raw_dir, fetch.SERIES[series_id]['vintages'])
+
+
+def read(raw_dir, series_id):
+    path = _path(raw_dir, series_id)
+    return table(pd.read_csv(path)) if os.path.exists(path) else None
+
+
+def refresh(series_ids, raw_dir, provider=None):
+    # Download the full release history of every series (ALFRED) and store it
+    provider = provider or fetch.default_provider(raw_dir)
+    data = {}
+    for sid in series_ids:
+        data[sid] = table(provider.vintages(sid))
+        data[sid].to_csv(_path(raw_dir, sid), index=False)
+        print(f"  {sid}: {len(data[sid])} prints of {data[sid]['date'].nunique()} months, "
+              f"releases {data[sid]['release'].iloc[0].date()} to {data[sid]['release'].iloc[-1].date()}")
+    return data
+
+
+def load(series, raw_dir, lag_days=RELEASE_LAG_DAYS):
+    """Release tables for {series_id: latest-vintage series}.
+
+    Uses the stored release history where there is one, otherwise the
+    nominal first release of the given series.
+    """
+    data = {}
+    for sid, latest in series.items():
+        stored = read(raw_dir, sid)
+        data[sid] = cap_first_release(stored, lag_days) if stored is not None else first_release(latest, lag_days)
+    return data
+
+
+# ==========================================
+# As-of joins
+# ==========================================
+def asof(keys, at):
+    # Row of the last sorted key <= each `at` (-1 before the first)
+    return np.searchsorted(np.asarray(keys), np.asarray(at), side='right') - 1
+
+
+def snapshots(df, releases=None):
+    """The series as known after every release: (releases x observation dates).
+
+    `releases` (sorted) defaults to the table's own release dates; every
+    row carries the latest print of each month up to that release.
+    """
+    wide = df.pivot_table(index='release', columns='date', values='value', aggfunc='last')
+    if releases is None:
+        return wide.ffill()
+    rows = asof(wide.index.values, pd.DatetimeIndex(releases).values)
+    out = wide.ffill().to_numpy()[np.maximum(rows, 0)]
+    out[rows < 0] = np.nan
+    return pd.DataFrame(out, index=pd.DatetimeIndex(releases, name='release'), columns=wide.columns)
+
+
+def _last_known(values):
+    # Column of the last non-missing entry of every row (and whether there is one)
+    known = ~np.isnan(values) if values.dtype.kind == 'f' else values >= 0
+    last = values.shape[1] - 1 - np.argmax(known[:, ::-1], axis=1)
+    return last, known.any(axis=1)
+
+
+def regime_history(cpi, indpro, yoy=12, trend=3, growth=0.0, inflation=0.0):
+    """Point-in-time regime: the regime of the newest month known after every release.
+
+    `cpi` and `indpro` are release tables. Every vintage is classified in one
+    pass (releases x months), on the months both series have, as in 03.
+    Returns Month (observation month, 'YYYY-MM') and Regime, indexed by the
+    release date on which they became known.
+    """
+    releases = np.union1d(cpi['release'].values, indpro['release'].values)
+    c, g = snapshots(cpi, releases), snapshots(indpro, releases)
+    months = c.columns.intersection(g.columns)
+
+    inflation_delta = regimes.trend_grid(c[months].to_numpy(), [yoy], [trend])[:, 0, 0]
+    growth_delta = regimes.trend_grid(g[months].to_numpy(), [yoy], [trend])[:, 0, 0]
+    codes = regimes.classify(growth_delta, inflation_delta, growth, inflation)
+
+    last, any_known = _last_known(codes)
+    out = pd.DataFrame({
+        'Month': months[last].strftime('%Y-%m'),
+        'Regime': regimes.categorical(codes[np.arange(len(codes)), last])
+    }, index=pd.DatetimeIndex(releases, name='date'))
+    return out[any_known]
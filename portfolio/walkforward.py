@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Walk-forward evaluation over every start date.
+# Each window [start, end) is read off prefix arrays (cumulative log returns,
+# centred sums and sums of squares), so CAGR, vol and Sharpe cost O(1) per
+# window. Max drawdown is path dependent: grid() makes one running max / min
+# pass per strategy and start over the longest horizon and reads every shorter
+# horizon from it.
+HORIZONS = {'1Y': 12, '3Y': 36, '5Y': 60, '10Y': 120}
+METRICS = ['CAGR', 'Volatility', 'Sharpe', 'Max DD']
+
+
+def month_starts(index):
+    # Position of the first trading day of every month
+    months = index.to_period('M')
+    return np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+
+
+def window_ends(index, starts, months):
+    """Exclusive end position of each `months`-long window and whether it is complete.
+
+    A window ends before the first trading day of the month `months` after the
+    start month. It counts as complete if the data reach that boundary (the
+    last date may be the business day just before it).
+    """
+    boundary = (index[starts].to_period('M') + months).to_timestamp()
+    ends = index.searchsorted(boundary)
+    complete = (ends < len(index)) | (boundary <= index[-1] + pd.offsets.BDay(1))
+    return ends, np.asarray(complete)
+
+
+def _window_std(prefix, prefix_sq, starts, ends):
+    n = ends - starts
+    s1 = prefix[ends] - prefix[starts]
+    s2 = prefix_sq[ends] - prefix_sq[starts]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return s1 / n, np.sqrt(np.maximum(s2 - s1 * s1 / n, 0) / (n - 1))
+
+
+def _prefix(x):
+    # Centred running sums: the mean of a window is shifted back, its variance is unchanged
+    centre = np.nanmean(x)
+    d = x - centre
+    return centre, np.r_[0.0, np.cumsum(d)], np.r_[0.0, np.cumsum(d * d)]
+
+
+def drawdowns(returns, starts, longest):
+    """Running worst drawdown (in log terms) of every start's path, `longest` days out.
+
+    Row i, column k is the max drawdown of the window starting at starts[i]
+    and k + 1 days long, so one pass serves every horizon up to `longest`.
+    """
+    log_eq = np.r_[0.0, np.cumsum(np.log1p(np.asarray(returns, dtype=float)))]
+    padded = np.r_[log_eq[1:], np.full(longest, log_eq[-1])]
+    paths = sliding_window_view(padded, longest)[starts]
+    return np.minimum.accumulate(paths - np.maximum.accumulate(paths, axis=1), axis=1)
+
+
+def evaluate(returns, rf, starts, ends, periods=252, worst=None):
+    """CAGR / Volatility / Sharpe / Max DD of one return series for every window.
+
+    `starts` and `ends` are position arrays (end exclusive); the result is
+    (windows x 4) in METRICS order. Drawdowns are measured from the first
+    day's close, as in 08_performance_metrics.py. `worst` is drawdowns() for
+    these starts, when the caller already has it for a longer horizon.
+    """
+    returns = np.asarray(returns, dtype=float)
+    excess = returns - np.asarray(rf, dtype=float)
+    n = (ends - starts).astype(float)
+
+    log_eq = np.r_[0.0, np.cumsum(np.log1p(returns))]
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        cagr = np.expm1((log_eq[ends] - log_eq[starts]) * periods / n)
+
+    centre, p1, p2 = _prefix(returns)
+    _, std = _window_std(p1, p2, starts, ends)
+    vol = std * np.sqrt(periods)
+
+    centre, p1, p2 = _prefix(excess)
+    mean, std = _window_std(p1, p2, starts, ends)
+    sharpe = ((mean + centre) * periods) / (std * np.sqrt(periods) + 1e-9)
+
+    if worst is None:
+        worst = drawdowns(returns, starts, int((ends - starts).max()) if len(starts) else 1)
+    max_dd = np.expm1(worst[np.arange(len(starts)), np.maximum(ends - starts, 1) - 1])
+
+    return np.column_stack([cagr, vol, sharpe, max_dd])
+
+
+def grid(returns, rf, horizons=HORIZONS, periods=252):
+    """Every (start month, horizon) window for every strategy column of `returns`.
+
+    Returns a long table: Strategy, Horizon, Start, End (last day) and the
+    metrics; incomplete windows at the end of the sample are left out.
+    """
+    index = returns.index
+    starts_all = month_starts(index)
+    rf = np.asarray(rf, dtype=float)
+
+    windows = {}
+    for label, months in horizons.items():
+        ends, complete = window_ends(index, starts_all, months)
+        windows[label] = complete, starts_all[complete], ends[complete]
+
+    # One drawdown pass per strategy over the longest horizon; shorter ones read from it
+    lengths = [ends - starts for _, starts, ends in windows.values() if len(starts)]
+    longest = int(max(n.max() for n in lengths)) if lengths else 1
+    worst = {name: drawdowns(returns[name].to_numpy(), starts_all, longest)
+             for name in returns.columns}
+
+    frames = []
+    for label, (complete, starts, ends) in windows.items():
+        for name in returns.columns:
+            values = evaluate(returns[name].to_numpy(), rf, starts, ends, periods,
+                              worst=worst[name][complete])
+            frame = pd.DataFrame(values, columns=METRICS)
+            frame.insert(0, 'Strategy', name)
+            frame.insert(1, 'Horizon', label)
+            frame.insert(2, 'Start', index[starts])
+            frame.insert(3, 'End', index[ends - 1])
+            frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
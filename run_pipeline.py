@@ -0,0 +1,41 @@
+import argparse
+import os
+import sys
+
+from portfolio import pipeline
+
+# Incremental runner for the numbered stages.
+# Each stage is re-run only when its code (including the portfolio modules it
+# imports) or one of its declared input files changed since the last successful
+# run; independent stages run side by side in separate worker processes.
+#
+#   python run_pipeline.py                 # run whatever is stale
+#   python run_pipeline.py --dry-run       # show what would run
+#   python run_pipeline.py --force 00      # pull new WRDS/FRED observations
+#   python run_pipeline.py --no-plots      # data and results only, no figures
+
+base_dir = os.environ.get('DP_BASE_DIR', '/Users/pustak/Desktop/Dynamic Portfolio')
+code_dir = os.path.dirname(os.path.abspath(__file__))
+
+parser = argparse.ArgumentParser(description='Run the numbered pipeline stages incrementally.')
+parser.add_argument('--force', nargs='*', default=[], metavar='STAGE', help='always re-run these stages')
+parser.add_argument('--workers', type=int, default=None, help='max parallel stages (default: CPU count)')
+parser.add_argument('--dry-run', action='store_true', help='report stale stages without running them')
+parser.add_argument('--base-dir', default=base_dir,
+                    help='project folder holding the data directories (passed to the stages as DP_BASE_DIR)')
+parser.add_argument('--no-plots', action='store_true', help='compute only: skip every figure (no matplotlib import)')
+args = parser.parse_args()
+
+unknown = set(args.force) - set(pipeline.STAGES)
+if unknown:
+    parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+
+status = pipeline.run(args.base_dir, code_dir, workers=args.workers, force=args.force, dry_run=args.dry_run,
+                      plots=not args.no_plots)
+
+print("\n--- Pipeline Summary ---")
+for name in sorted(status):
+    print(f"{name}  {pipeline.STAGES[name]['script']:<35} {status[name]}")
+
+if any(s in ('failed', 'blocked') for s in status.values()):
+    sys.exit(1)
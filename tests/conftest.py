@@ -0,0 +1,39 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Offline checks of the portfolio/ engines against the pandas code they
+# replaced, on small synthetic data. Nothing here reads base_dir or the network.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from portfolio.regimes import REGIMES  # noqa: E402
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(7)
+
+
+@pytest.fixture
+def days():
+    return pd.bdate_range('2001-01-01', '2006-12-31', name='date')
+
+
+@pytest.fixture
+def returns(rng, days):
+    # Daily returns of three strategies, with a few missing days
+    values = rng.normal(0.0004, 0.01, (len(days), 3))
+    values[rng.random(values.shape) < 0.01] = np.nan
+    return pd.DataFrame(values, index=days, columns=['Dynamic', '60/40', 'Stocks'])
+
+
+@pytest.fixture
+def regime(rng, days):
+    # Daily regime labels in multi-week spells, missing at the start
+    spells = np.repeat(rng.integers(0, len(REGIMES), len(days) // 20 + 1), 20)[:len(days)]
+    labels = pd.Series(np.array(REGIMES)[spells], index=days, dtype=object)
+    labels.iloc[:5] = np.nan
+    return labels
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from portfolio import bonds
+
+
+def cash_flow_price(coupon, yld, maturity, freq=2):
+    # Sum of discounted coupons and face, whole coupon periods only
+    t = np.arange(1, int(round(maturity * freq)) + 1)
+    return (coupon / freq * (1 + yld / freq) ** -t).sum() + (1 + yld / freq) ** -t[-1]
+
+
+def test_price_matches_cash_flows():
+    for coupon, yld, maturity in [(0.05, 0.07, 10), (0.08, 0.03, 30), (0.02, 0.02, 2), (0.04, 0.0, 5)]:
+        assert np.isclose(bonds.price(coupon, yld, maturity), cash_flow_price(coupon, yld, maturity), rtol=1e-12)
+    assert np.isclose(bonds.price(0.06, 0.06, 10), 1.0)
+
+
+def test_sensitivities_match_finite_differences():
+    for yld in [0.0, 1e-9, 0.01, 0.05, 0.15]:
+        for maturity in [2, 10, 30]:
+            h = 1e-5
+            p = [bonds.price(yld, yld + d, maturity) for d in (-h, 0, h)]
+            duration, convexity = bonds.sensitivities(yld, maturity)
+            assert np.isclose(duration, -(p[2] - p[0]) / (2 * h * p[1]), rtol=1e-6)
+            assert np.isclose(convexity, (p[2] - 2 * p[1] + p[0]) / (h * h * p[1]), rtol=1e-3)
+
+
+def test_par_returns_close_to_linear_model(rng):
+    # The repricing is the old income - duration x change at the bond's own duration, plus convexity
+    days = pd.bdate_range('2020-01-01', periods=300)
+    yields = pd.DataFrame({'10Y': 4 + np.cumsum(rng.normal(0, 0.02, len(days)))}, index=days)
+    par = bonds.par_returns(yields)['10Y']
+    duration, convexity = bonds.sensitivities(yields['10Y'].shift() / 100, 10)
+    change = yields['10Y'].diff() / 100
+    expected = bonds.linear_returns(yields['10Y'], duration) + 0.5 * convexity * change ** 2
+    assert np.isnan(par.iloc[0])
+    assert np.abs(par - expected).iloc[1:].max() < 1e-6
+
+    gap = yields.copy()
+    gap.iloc[100] = np.nan
+    assert bonds.par_returns(gap)['10Y'].iloc[100:102].isna().all()
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from portfolio import bootstrap
+
+
+def test_paths_match_pandas_and_ignore_workers(rng):
+    sleeves = rng.normal(0.0003, 0.01, (500, 3))
+    held = rng.integers(-1, 2, 500)
+    rf = rng.uniform(0, 0.0002, 500)
+
+    one = bootstrap.run(sleeves, held, 2, rf, n_paths=40, block_size=20, seed=3, workers=1, chunk_size=15)
+    two = bootstrap.run(sleeves, held, 2, rf, n_paths=40, block_size=20, seed=3, workers=2, chunk_size=15)
+    pd.testing.assert_frame_equal(one, two)
+
+    # Path 16 is the first of the second chunk: rebuild its days and evaluate with pandas
+    seeds = np.random.SeedSequence(3).spawn(3)
+    idx = bootstrap.block_indices(np.random.default_rng(seeds[1]), 15, 500, 20)[0]
+    dynamic = pd.Series(np.where(held[idx] < 0, 0.0, sleeves[idx, np.maximum(held[idx], 0)]))
+    equity = (1 + dynamic).cumprod()
+    excess = dynamic - rf[idx]
+    expected = [equity.iloc[-1] ** (252 / 500) - 1, dynamic.std() * np.sqrt(252),
+                (excess.mean() * 252) / (excess.std() * np.sqrt(252) + 1e-9), (equity / equity.cummax() - 1).min()]
+    np.testing.assert_allclose(one.loc[15, [f'Dynamic_{s}' for s in bootstrap.STATS]], expected, rtol=1e-10)
+    np.testing.assert_allclose(one['Spread_CAGR'], one['Dynamic_CAGR'] - one['60_40_CAGR'])
+
+
+def test_block_indices(rng):
+    idx = bootstrap.block_indices(rng, 5, 100, 10, 'circular')
+    # Fixed blocks of 10 consecutive (wrapping) days
+    steps = (np.diff(idx, axis=1) % 100).reshape(5, -1)
+    assert np.all(np.delete(steps, np.s_[9::10], axis=1) == 1)
+
+    stationary = bootstrap.block_indices(rng, 200, 1000, 25)
+    breaks = (np.diff(stationary, axis=1) % 1000) != 1
+    assert abs(breaks.mean() - 1 / 25) < 0.01
+
+
+def test_summarize():
+    paths = pd.DataFrame({'a': np.arange(-50, 51, dtype=float)})
+    table = bootstrap.summarize(paths)
+    assert table.loc['a', 'P50'] == 0 and table.loc['a', 'Mean'] == 0
+    assert np.isclose(table.loc['a', 'P(>0)'], 50 / 101)
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from portfolio import density
+
+
+def test_kde_matches_gaussian_kde(rng):
+    # seaborn's kdeplot evaluates scipy's gaussian_kde (Scott's rule) on its grid
+    stats = pytest.importorskip('scipy.stats')
+    values = np.r_[rng.normal(0, 0.01, 3000), rng.standard_t(3, 500) * 0.02, [np.nan]]
+    grid, dens = density.kde(values)
+
+    clean = values[~np.isnan(values)]
+    exact = stats.gaussian_kde(clean, bw_method='scott')(grid)
+    assert np.isclose(density.scott_bandwidth(clean), clean.std(ddof=1) * stats.gaussian_kde(clean).factor)
+    assert np.abs(dens - exact).max() < 1e-3 * exact.max()
+    assert np.isclose(np.trapezoid(dens, grid), 1, atol=1e-3)
+
+    assert density.kde(values)[1] is dens
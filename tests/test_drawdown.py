@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from portfolio import drawdown
+
+
+def baseline_stats(series):
+    # get_dd_stats() of the original 10_drawdown_analysis.py
+    is_dd = series < 0
+    starts = (~is_dd).shift(1, fill_value=False) & is_dd
+    ends = is_dd.shift(1, fill_value=False) & (~is_dd)
+    start_dates, end_dates = series.index[starts], series.index[ends]
+    if len(start_dates) > len(end_dates):
+        end_dates = end_dates.append(pd.Index([series.index[-1]]))
+
+    rows = []
+    for s, e in zip(start_dates, end_dates):
+        window = series.loc[s:e]
+        rows.append({'depth': window.min(), 'duration': (e - s).days, 'recovery': (e - window.idxmin()).days})
+    if not rows:
+        return None
+    df = pd.DataFrame(rows)
+    return {'avg_dd': df['depth'].mean(), 'med_dd': df['depth'].median(), 'max_dd': df['depth'].min(),
+            'avg_rec': df['recovery'].mean(), 'med_rec': df['recovery'].median(),
+            'avg_dur': df['duration'].mean(), 'med_dur': df['duration'].median(), 'count': len(df)}
+
+
+def test_episode_stats_match_baseline(returns):
+    equity = (1 + returns.fillna(0)).cumprod()
+    dd = drawdown.underwater(equity)
+    pd.testing.assert_frame_equal(dd, equity / equity.cummax() - 1)
+
+    table = drawdown.stats_frame(dd)
+    for col in dd.columns:
+        expected = baseline_stats(dd[col])
+        for stat, value in expected.items():
+            assert np.isclose(table.loc[col, stat], value, rtol=1e-12), (col, stat)
+
+    # Second call comes from the cache
+    pd.testing.assert_frame_equal(drawdown.stats_frame(dd), table)
+
+
+def test_open_episode_and_no_drawdown(days):
+    equity = pd.Series(np.r_[np.linspace(1, 2, 100), np.linspace(1.9, 1.5, len(days) - 100)], index=days)
+    dd = drawdown.underwater(equity)
+    table = drawdown.episodes(dd)
+    assert len(table) == 1 and table['open'].iloc[0]
+    assert table['end'].iloc[0] == days[-1]
+    assert drawdown.stats(dd)['count'] == baseline_stats(dd)['count'] == 1
+
+    rising = pd.Series(np.linspace(1, 2, len(days)), index=days)
+    assert drawdown.stats(drawdown.underwater(rising)) is None
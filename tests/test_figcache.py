@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pytest
+
+from portfolio import figcache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(figcache, 'ENABLED', True)
+    monkeypatch.setattr(figcache, 'CACHE_DIR', str(tmp_path / 'cache'))
+    return tmp_path / 'cache'
+
+
+def png(path, size):
+    path.write_bytes(os.urandom(size))
+    return str(path)
+
+
+def test_store_then_fetch(tmp_path, cache):
+    src = png(tmp_path / 'a.png', 1000)
+    figcache.store('k1', src)
+    out = str(tmp_path / 'out.png')
+    assert figcache.fetch('k1', out)
+    assert open(out, 'rb').read() == open(src, 'rb').read()
+    assert not figcache.fetch('missing', out)
+    assert not [name for name in os.listdir(cache) if name.endswith('.tmp')]
+
+
+def test_evicted_entry_is_a_miss(tmp_path, cache):
+    figcache.store('k1', png(tmp_path / 'a.png', 1000))
+    os.remove(cache / 'k1.png')
+    assert not figcache.fetch('k1', str(tmp_path / 'out.png'))
+    figcache.evict(str(cache), 0)
+
+
+def test_evict_least_recently_used(tmp_path, cache):
+    for i in range(4):
+        figcache.store(f'k{i}', png(tmp_path / f'{i}.png', 1000))
+        os.utime(cache / f'k{i}.png', (i, i))
+    os.utime(cache / 'k0.png')   # just fetched
+
+    figcache.evict(str(cache), 2500)
+    assert sorted(os.listdir(cache)) == ['k0.png', 'k3.png']
+
+
+def test_key_follows_content():
+    pytest.importorskip('matplotlib')
+    from portfolio import figures
+
+    data = {'dates': np.arange(5), 'corr': np.linspace(-1, 1, 5)}
+    k = figcache.key(figures.correlation_timeline, data, 150)
+    assert k == figcache.key(figures.correlation_timeline, {'corr': data['corr'].copy(), 'dates': np.arange(5)}, 150)
+    assert k != figcache.key(figures.correlation_timeline, dict(data, corr=data['corr'] * 0.5), 150)
+    assert k != figcache.key(figures.correlation_timeline, data, 300)
+    assert k != figcache.key(figures.correlation_timeline, dict(data, title='other'), 150)
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from portfolio import periodic
+
+
+def test_yearly_from_rebased_equity(returns):
+    # The original 12: year-end equity, pct_change, first year End / 1.0 - 1
+    equity = (1 + returns.fillna(0)).cumprod()
+    equity = equity / equity.iloc[0]
+    yearly = equity.resample('YE').last()
+    expected = yearly.pct_change()
+    expected.iloc[0] = yearly.iloc[0] - 1
+    expected.index = expected.index.year
+
+    got = periodic.table(periodic.from_equity(equity), 'Y')
+    np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), atol=1e-12)
+    assert list(got.index) == list(expected.index)
+
+
+def test_nested_frequencies_match_resample(returns):
+    out = periodic.tables(returns)
+    for freq, rule in [('M', 'ME'), ('Q', 'QE'), ('Y', 'YE')]:
+        expected = (1 + returns.fillna(0)).resample(rule).prod() - 1
+        np.testing.assert_allclose(out[freq].to_numpy(), expected.to_numpy(), atol=1e-12)
+        np.testing.assert_allclose(periodic.table(returns, freq).to_numpy(), expected.to_numpy(), atol=1e-12)
+
+
+def test_regime_spells(returns, regime):
+    table = periodic.spells(returns, regime)
+    run = (regime.fillna('') != regime.fillna('').shift()).cumsum()
+    for i, (_, days) in enumerate(returns.groupby(run)):
+        row = table.iloc[i]
+        assert row['Start'] == days.index[0] and row['End'] == days.index[-1] and row['Days'] == len(days)
+        np.testing.assert_allclose(row[returns.columns].astype(float), (1 + days.fillna(0)).prod() - 1, atol=1e-12)
+    assert len(table) == run.iloc[-1]
+
+
+def test_month_grid(returns):
+    grid = periodic.month_grid(returns['Dynamic'])
+    monthly = (1 + returns['Dynamic'].fillna(0)).resample('ME').prod() - 1
+    assert np.isclose(grid.loc[2003, 'Mar'], monthly.loc['2003-03'].iloc[0], rtol=1e-12)
+    assert grid.shape == (6, 12)
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from portfolio import rolling
+
+
+def test_batch_and_online_match_pandas(returns):
+    x, y = returns['Dynamic'], returns['Stocks']
+    expected = x.rolling(60, min_periods=20).corr(y)
+
+    batch = rolling.rolling_corr(x, y, window=60, min_periods=20)
+    np.testing.assert_allclose(batch, expected, atol=1e-12, equal_nan=True)
+
+    kernel = rolling.RollingCorrelation(window=60, min_periods=20)
+    np.testing.assert_allclose(kernel.extend(x, y), expected, atol=1e-12, equal_nan=True)
+
+
+def test_seeded_kernel_continues_the_series(returns):
+    x, y = returns['Dynamic'], returns['60/40']
+    full = rolling.rolling_corr(x, y, window=120, min_periods=30)
+
+    kernel = rolling.RollingCorrelation.from_history(x[:1000], y[:1000], window=120, min_periods=30)
+    np.testing.assert_allclose(kernel.extend(x[1000:], y[1000:]), full[1000:], atol=1e-12, equal_nan=True)
+
+
+def test_correlation_frame(returns):
+    frame = rolling.correlation_frame(returns.set_axis(['Stock_Returns', 'Bond_Returns', 'Other'], axis=1))
+    expected = returns['Dynamic'].rolling(504, min_periods=100).corr(returns['60/40']).dropna()
+    pd.testing.assert_series_equal(frame['Correlation'], expected, check_names=False, atol=1e-12, rtol=0)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from portfolio import backtest, streaming, universe
+
+MAPPINGS = [backtest.MAPPING, dict(backtest.MAPPING, Stagflation={'Oil': 0.5, 'Bonds': 0.3}, Deflation='60/40')]
+
+
+@pytest.fixture(scope='module')
+def data():
+    return universe.synthetic('stream', 11, start='1996-01-01', end='2004-12-31')['data']
+
+
+def rebuild(data, commodities, oil, mapping):
+    # 01 -> 06 on the same data: the consolidated dataset a full run would write
+    bench = universe.benchmark(data)
+    alts = universe.alternatives({'commodities': commodities, 'oil': oil})
+    macro = universe.macro_regimes(data)
+    final = universe.backtest_results(universe.strategy(bench, alts, macro, mapping))
+    return universe.consolidate(final, bench), macro['Regime']
+
+
+@pytest.mark.parametrize('mapping', MAPPINGS)
+@pytest.mark.parametrize('last_print', [None, '2004-03-01'])
+def test_append_matches_rebuild(data, mapping, last_print):
+    # With last_print the commodity / oil prints stop early: the days after drop out of both
+    commodities, oil = data['commodities'][:last_print], data['oil'][:last_print]
+    master, regime = rebuild(data, commodities, oil, mapping)
+    cut = '2003-06-13'
+
+    state = streaming.init_state(master[:cut], regime)
+    rows, drawdowns, state = streaming.extend(state, data['stocks'], data['yields'], commodities, oil, regime, mapping)
+    tail = master[master.index > cut]
+
+    pd.testing.assert_index_equal(rows.index, tail.index, check_names=False)
+    numeric = [col for col in streaming.COLUMNS if col != 'Regime']
+    np.testing.assert_allclose(rows[numeric].to_numpy(dtype=float), tail[numeric].to_numpy(dtype=float), rtol=1e-10)
+    assert (rows['Regime'].astype(str) == tail['Regime'].astype(str)).all()
+
+    equity = master['Dynamic_Equity']
+    np.testing.assert_allclose(drawdowns['Dynamic_Equity'], (equity / equity.cummax() - 1)[tail.index], atol=1e-12)
+    assert state['last_date'] <= str(data['stocks'].index[-1].date())
+
+
+def test_extend_in_steps(data):
+    master, regime = rebuild(data, data['commodities'], data['oil'], backtest.MAPPING)
+    state = streaming.init_state(master[:'2004-01-09'], regime)
+    once, _, _ = streaming.extend(state, data['stocks'], data['yields'], data['commodities'], data['oil'], regime)
+
+    parts = []
+    for end in ['2004-02-20', '2004-07-02', None]:
+        stocks = data['stocks'][:end]
+        rows, _, state = streaming.extend(state, stocks, data['yields'], data['commodities'], data['oil'], regime)
+        parts.append(rows)
+    pd.testing.assert_frame_equal(pd.concat(parts), once, rtol=1e-12)
+
+    empty, _, same = streaming.extend(state, data['stocks'], data['yields'], data['commodities'], data['oil'], regime)
+    assert empty.empty and same is state
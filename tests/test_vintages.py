@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from portfolio import universe, vintages
+
+
+def release_table(rng, months, lag, revisions=10):
+    # One first print per month `lag` days after it, plus a few later revisions
+    level = 100 * np.exp(np.cumsum(rng.normal(0.002, 0.005, len(months))))
+    df = pd.DataFrame({'date': months, 'release': months + pd.Timedelta(days=lag), 'value': level})
+    picked = rng.choice(len(months) - 3, revisions, replace=False)
+    revised = pd.DataFrame({'date': months[picked], 'release': months[picked] + pd.Timedelta(days=lag + 45),
+                            'value': level[picked] * (1 + rng.normal(0, 0.01, revisions))})
+    return vintages.table(pd.concat([df, revised]))
+
+
+def known(df, day):
+    # The naive point-in-time view: filter the table to day, latest print per month
+    return df[df['release'] <= day].groupby('date')['value'].last()
+
+
+def test_asof_matches_reindex_ffill(rng):
+    keys = pd.DatetimeIndex(np.sort(rng.choice(pd.date_range('2000-01-01', periods=400).values, 50, replace=False)))
+    days = pd.date_range('1999-12-01', periods=500)
+    rows = vintages.asof(keys.values, days.values)
+    expected = pd.Series(np.arange(len(keys)), index=keys).reindex(days, method='ffill').fillna(-1)
+    np.testing.assert_array_equal(rows, expected.to_numpy())
+
+
+def test_snapshots_match_filtering(rng):
+    months = pd.date_range('2000-01-01', periods=48, freq='MS')
+    df = release_table(rng, months, 14)
+    days = pd.date_range('2000-01-20', '2004-06-01', freq='7D')
+    snap = vintages.snapshots(df, days)
+    for day in days[::9]:
+        expected = known(df, day)
+        got = snap.loc[day].dropna()
+        pd.testing.assert_series_equal(got, expected, check_names=False, check_index_type=False)
+
+
+def test_regime_history_matches_per_release_classification(rng):
+    months = pd.date_range('2000-01-01', periods=60, freq='MS')
+    cpi, indpro = release_table(rng, months, 14), release_table(rng, months, 17)
+    history = vintages.regime_history(cpi, indpro)
+    assert history.index.is_monotonic_increasing
+
+    for day, row in history.iloc[::7].iterrows():
+        macro = universe.macro_regimes({'cpi': known(cpi, day), 'indpro': known(indpro, day)})
+        assert row['Month'] == macro.index[-1].strftime('%Y-%m')
+        assert row['Regime'] == macro['Regime'].iloc[-1]
+
+
+def test_first_release_cap(rng):
+    months = pd.date_range('2000-01-01', periods=12, freq='MS')
+    late = vintages.table({'date': months, 'release': months + pd.Timedelta(days=400), 'value': np.arange(12.0)})
+    capped = vintages.cap_first_release(late)
+    assert (capped['release'] == capped['date'] + pd.Timedelta(days=vintages.RELEASE_LAG_DAYS)).all()
+
+    nominal = vintages.first_release(pd.Series(np.arange(12.0), index=months))
+    pd.testing.assert_frame_equal(nominal, capped.assign(value=np.arange(12.0)))
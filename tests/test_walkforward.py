@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from portfolio import walkforward
+
+
+def naive(r, rf):
+    # 08's definitions on one re-sliced window
+    equity = (1 + r).cumprod()
+    excess = r - rf
+    return [equity.iloc[-1] ** (252 / len(r)) - 1,
+            r.std() * np.sqrt(252),
+            (excess.mean() * 252) / (excess.std() * np.sqrt(252) + 1e-9),
+            (equity / equity.cummax() - 1).min()]
+
+
+def test_grid_matches_slicing(returns, rng):
+    returns = returns.fillna(0)
+    rf = pd.Series(rng.uniform(0, 0.0002, len(returns)), index=returns.index)
+    grid = walkforward.grid(returns, rf, horizons={'1Y': 12, '3Y': 36})
+
+    for horizon, months in [('1Y', 12), ('3Y', 36)]:
+        starts = returns.index[walkforward.month_starts(returns.index)]
+        rows = grid[(grid['Horizon'] == horizon) & (grid['Strategy'] == 'Dynamic')]
+        # Every start month whose window (up to the first of the month `months` later) the data cover
+        boundary = [(s.to_period('M') + months).to_timestamp() for s in starts]
+        assert len(rows) == sum(b <= returns.index[-1] + pd.offsets.BDay(1) for b in boundary)
+        for _, row in rows.iloc[::5].iterrows():
+            window = slice(row['Start'], row['End'])
+            assert row['End'] < (row['Start'].to_period('M') + months).to_timestamp()
+            np.testing.assert_allclose(row[walkforward.METRICS].astype(float),
+                                       naive(returns.loc[window, 'Dynamic'], rf.loc[window]), rtol=1e-9)
+
+
+def test_shared_drawdown_pass_matches_per_horizon(returns):
+    r = returns['Stocks'].fillna(0).to_numpy()
+    starts = walkforward.month_starts(returns.index)[:40]
+    ends = np.minimum(starts + 300, len(r))
+    own = walkforward.evaluate(r, 0, starts, ends)
+    shared = walkforward.evaluate(r, 0, starts, ends, worst=walkforward.drawdowns(r, starts, 600))
+    np.testing.assert_allclose(shared, own, rtol=1e-12)